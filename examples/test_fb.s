@@ -0,0 +1,46 @@
+; Kyler Olsen - Oct 2026
+; Example 3 - ytd 12-bit Computer
+; Framebuffer Gradient (Machine `fb`)
+
+.0x0
+main:
+    ; Pixel window base - 1 (0x6FF)
+    liu 0x1B
+    lil 0x3F
+    or D3 MP ZR
+
+    ; Color and bank
+    or D0 ZR ZR
+    or D2 ZR ZR
+
+bank:
+    ; Select bank
+    liu 0x1E
+    str D2
+
+    ; 128 pixels per bank (0x80)
+    ldi 0x20
+    lsh D1 MP
+    lsh D1 D1
+
+pixel:
+    add MP D3 D1
+    str D0
+    inc D0 D0
+    dec D1 D1
+    ldi :pixel
+    bna
+
+    ; Next bank until all 24 are filled
+    inc D2 D2
+    ldi 24
+    xor MP D2 MP
+    ldi :bank
+    bna
+
+    ; Present frame
+    liu 0x1E
+    lil 0x01
+    str D0
+
+    hlt
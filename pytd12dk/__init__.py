@@ -1,10 +1,18 @@
 # Kyler Olsen
 # Feb 2024
 
-from . import assembler, emulator, compiler
+from importlib import import_module
 
 __all__ = [
     'emulator',
     'assembler',
     'compiler',
+    'disassembler',
+    'benchmark',
+    'pipeline',
 ]
+
+def __getattr__(name: str):
+    if name in __all__:
+        return import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
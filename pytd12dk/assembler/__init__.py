@@ -1,8 +1,15 @@
 # Kyler Olsen
 # Feb 2024
 
-from .assembler import Program
+from .assembler import Program, encode, listing
+from .linker import ObjectFile, assemble_object, link, strip
 
 __all__ = [
     'Program',
+    'encode',
+    'listing',
+    'ObjectFile',
+    'assemble_object',
+    'link',
+    'strip',
 ]
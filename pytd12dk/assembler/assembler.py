@@ -2,97 +2,80 @@
 # Feb 2024
 
 from collections import namedtuple
-from typing import TypeVar, Generic, Iterable, Sequence
+from typing import Callable, Iterable
 
 INSTRUCTIONS_COUNT = 0x700
 MAX_IMMEDIATE = 0x40
+MAX_WORD = 0xFFF
+MAX_MACRO_DEPTH = 16
 
 class AssemblerError(Exception): pass
 class LinkerError(Exception): pass
 
-KEY = TypeVar("KEY")
-ANTIKEY = TypeVar("ANTIKEY")
-
-
-class TwoWayDictionary(Generic[KEY, ANTIKEY]):
-
-    _dict: dict[KEY, ANTIKEY]
-    _antidict: dict[ANTIKEY, KEY]
-
-    def __init__(
-        self,
-        keys: Iterable[KEY] | None = None,
-        antikeys: Iterable[ANTIKEY] | None = None,
-    ):
-        if (keys is None) and (antikeys is None):
-            self._dict = {}
-            self._antidict = {}
-        elif (
-            (keys is None) or
-            (antikeys is None) or
-            len(keys) != len(antikeys) # type: ignore
-        ):
-            raise ValueError
-        else:
-            self._dict = dict(zip(keys, antikeys)) # type: ignore
-            self._antidict = dict(zip(antikeys, keys)) # type: ignore
-
-    def get_forwards(self, key: KEY, default: None | ANTIKEY = None) -> ANTIKEY:
-        if key not in self._dict:
-            if default is None: raise KeyError("Key not in dictionary")
-            else: return default
-        else: return self._dict[key]
-
-    def get_backwards(
-        self,
-        antikey: ANTIKEY,
-        default: None | KEY = None,
-    ) -> KEY:
-        if antikey not in self._antidict:
-            if default is None: raise KeyError("Anti-Key not in dictionary")
-            else: return default
-        else: return self._antidict[antikey]
-
-    def set_forwards(self, key: KEY, antikey: ANTIKEY):
-        if antikey in self._antidict:
-            raise KeyError("Anti-Key already in dictionary.")
-        if key in self._dict:
-            del self._antidict[self._dict[key]]
-        self._dict[key] = antikey
-        self._antidict[antikey] = key
-
-    def set_backwards(self, antikey: ANTIKEY, key: KEY):
-        if key in self._dict:
-            raise KeyError("Key already in dictionary.")
-        if antikey in self._antidict:
-            del self._dict[self._antidict[antikey]]
-        self._antidict[antikey] = key
-        self._dict[key] = antikey
-
-    def del_forwards(self, key: KEY):
-        if key not in self._dict:
-            raise KeyError("Key not in dictionary.")
-        del self._antidict[self._dict[key]]
-        del self._dict[key]
-
-    def del_backwards(self, antikey: ANTIKEY):
-        if antikey not in self._antidict:
-            raise KeyError("Anti-Key not in dictionary.")
-        del self._dict[self._antidict[antikey]]
-        del self._antidict[antikey]
-
-    def keys(self) -> Iterable[KEY]:
-        return self._dict.keys()
-
-    def antikeys(self) -> Iterable[ANTIKEY]:
-        return self._antidict.keys()
-
-    def items(self) -> Iterable[tuple[KEY, ANTIKEY]]:
-        return self._dict.items()
-
-    def antiitems(self) -> Iterable[tuple[ANTIKEY, KEY]]:
-        return self._antidict.items()
-
+REGISTERS = ("ZR", "PC", "SP", "MP", "D0", "D1", "D2", "D3")
+
+_REGISTER_NUMBERS = {name: i for i, name in enumerate(REGISTERS)} | {
+    str(i): i for i in range(len(REGISTERS))}
+
+OPCODES: dict[str, tuple[int, int, int, int]] = {
+    "NOP": (0, 0, 0, 0),
+    "HLT": (0, 0, 0, 1),
+    "BNZ": (0, 0, 0, 2),
+    "BNA": (0, 0, 0, 3),
+    "BNP": (0, 0, 0, 4),
+    "BNN": (0, 0, 0, 5),
+
+    "GLA": (0, 0, 2, 0),
+    "GET": (0, 0, 3, 0),
+    "LOD": (0, 0, 4, 0),
+    "STR": (0, 0, 5, 0),
+    "POP": (0, 0, 6, 0),
+    "PSH": (0, 0, 7, 0),
+
+    "LIU": (0, 1, 0, 0),
+    "LDI": (0, 2, 0, 0),
+    "LIL": (0, 3, 0, 0),
+
+    "LSH": (0, 4, 0, 0),
+    "RSH": (0, 5, 0, 0),
+    "INC": (0, 6, 0, 0),
+    "DEC": (0, 7, 0, 0),
+
+    "AND": (1, 0, 0, 0),
+    "OR":  (2, 0, 0, 0),
+    "SUB": (3, 0, 0, 0),
+    "XOR": (4, 0, 0, 0),
+    "NOR": (5, 0, 0, 0),
+    "NAD": (6, 0, 0, 0),
+    "ADD": (7, 0, 0, 0),
+}
+
+# Operands of each mnemonic: r = register, i = immediate
+FORMATS: dict[str, str] = {
+    "NOP": "", "HLT": "", "BNZ": "", "BNA": "", "BNP": "", "BNN": "",
+    "GLA": "r", "GET": "r", "LOD": "r", "STR": "r", "POP": "r", "PSH": "r",
+    "LIU": "i", "LDI": "i", "LIL": "i",
+    "LSH": "rr", "RSH": "rr", "INC": "rr", "DEC": "rr",
+    "AND": "rrr", "OR": "rrr", "SUB": "rrr", "XOR": "rrr",
+    "NOR": "rrr", "NAD": "rrr", "ADD": "rrr",
+}
+
+ALU_MNEMONICS = {
+    bb: name for name, (bb, _, _, _) in OPCODES.items() if bb}
+SHIFT_MNEMONICS = {
+    bl: name for name, (bb, bl, _, _) in OPCODES.items() if not bb and bl >= 4}
+IMMEDIATE_MNEMONICS = {
+    bl: name for name, (bb, bl, _, _) in OPCODES.items()
+    if not bb and 1 <= bl <= 3
+}
+REGISTER_MNEMONICS = {
+    lb: name for name, (bb, bl, lb, _) in OPCODES.items()
+    if not bb and not bl and lb
+}
+BARE_MNEMONICS = {
+    ll: name for name, (bb, bl, lb, ll) in OPCODES.items()
+    if not bb and not bl and not lb
+}
 
 class Instruction(namedtuple('Instruction', ['bb', 'bl', 'lb', 'll'])):
 
@@ -125,6 +108,23 @@ class Instruction(namedtuple('Instruction', ['bb', 'bl', 'lb', 'll'])):
             str(self.ll)
         )
 
+    def __str__(self) -> str:
+        bb, bl, lb, ll = self
+        if bb:
+            mnemonic = ALU_MNEMONICS[bb].lower()
+            return f"{mnemonic} {REGISTERS[ll]} {REGISTERS[bl]} {REGISTERS[lb]}"
+        elif bl >= 4:
+            mnemonic = SHIFT_MNEMONICS[bl].lower()
+            return f"{mnemonic} {REGISTERS[ll]} {REGISTERS[lb]}"
+        elif bl:
+            return f"{IMMEDIATE_MNEMONICS[bl].lower()} {(lb << 3) | ll}"
+        elif lb >= 2:
+            return f"{REGISTER_MNEMONICS[lb].lower()} {REGISTERS[ll]}"
+        elif lb == 0 and ll in BARE_MNEMONICS:
+            return BARE_MNEMONICS[ll].lower()
+        else:
+            raise AssemblerError(f"Invalid instruction: {hex(int(self))}")
+
 
 class Directive:
 
@@ -145,6 +145,9 @@ class MemoryLocation(Directive):
     def value(self) -> int:
         return self._value
 
+    def __str__(self) -> str:
+        return f".{hex(self._value)}"
+
 
 class Label(Directive):
 
@@ -157,6 +160,9 @@ class Label(Directive):
     def value(self) -> str:
         return self._value
 
+    def __str__(self) -> str:
+        return f"{self._value}:"
+
 
 class Immediate(Directive):
 
@@ -169,6 +175,24 @@ class Immediate(Directive):
     def value(self) -> str:
         return self._value
 
+    def __str__(self) -> str:
+        return f"ldi :{self._value}"
+
+
+class Comment(Directive):
+
+    _value: str
+
+    def __init__(self, value: str = ""):
+        self._value = value
+
+    @property
+    def value(self) -> str:
+        return self._value
+
+    def __str__(self) -> str:
+        return f"; {self._value}" if self._value else ""
+
 
 class Program:
 
@@ -205,67 +229,136 @@ class Program:
         "ADD": lambda l, i: Instruction(7, *reg3(l, i)),
     }
 
-    _program: str
+    _program: str | None
     _instructions: list[tuple[int, Instruction | Directive]]
-    _immediate: list[tuple[int, Immediate]]
 
-    _instruction_map: TwoWayDictionary[int, int]
+    _words: list[int]
+    _lines: list[int]
+    _addresses: list[int]
     _label_map: dict[str, int]
+    _binary: bytes | None
 
-    def __init__(self, program: str):
-        self._program = program
-
-        self._instructions = self.parse(self._program)
-        self._immediate = []
+    def __init__(self, program: str | Iterable[Instruction | Directive]):
+        if isinstance(program, str):
+            self._program = program
+            instructions = self.parse(program)
+        else:
+            self._program = None
+            instructions = [
+                (index + 1, item) for index, item in enumerate(program)
+                if not isinstance(item, Comment)
+            ]
+        self._setup(instructions)
+
+    def _setup(self, instructions: list[tuple[int, Instruction | Directive]]):
+        self._instructions = instructions
+        self._words = [0] * INSTRUCTIONS_COUNT
+        self._lines = [0] * INSTRUCTIONS_COUNT
+        self._addresses = [0] * len(instructions)
         self._label_map = {}
-        self._instruction_map = TwoWayDictionary()
+        self._binary = None
 
         self._link()
 
+    @classmethod
+    def from_parsed(
+        cls,
+        instructions: list[tuple[int, Instruction | Directive]],
+    ) -> "Program":
+        program = cls.__new__(cls)
+        program._program = None
+        program._setup(instructions)
+        return program
+
     def __bytes__(self) -> bytes:
-        output = bytearray()
-        for i in range(0, INSTRUCTIONS_COUNT, 2):
-            instruction = self._get_instruction(i)
-            u1, m1, l1 = instruction.hex_tuple()
-            output += bytes(((u1 << 4) | m1, ))
-            if i + 1 < INSTRUCTIONS_COUNT:
-                instruction = self._get_instruction(i + 1)
-                u2, m2, l2 = instruction.hex_tuple()
-                output += bytes(((l1 << 4) | u2, ))
-                output += bytes(((m2 << 4) | l2, ))
-            else:
-                output += bytes((l1 << 4, ))
-        return bytes(output)
+        if self._binary is None:
+            words = self._words
+            output = bytearray()
+            for i in range(0, INSTRUCTIONS_COUNT - 1, 2):
+                first, second = words[i], words[i + 1]
+                output += bytes((
+                    first >> 4,
+                    ((first & 0xf) << 4) | (second >> 8),
+                    second & 0xff,
+                ))
+            if INSTRUCTIONS_COUNT % 2:
+                last = words[-1]
+                output += bytes((last >> 4, (last & 0xf) << 4))
+            self._binary = bytes(output)
+        return self._binary
 
     def hex_str(self) -> str:
-        output = ""
-        for i in range(INSTRUCTIONS_COUNT):
-            instruction = self._get_instruction(i)
-            output += f"{hex(int(instruction))}\n"
-        return output
+        return "".join(f"{hex(word)}\n" for word in self._words)
+
+    def words(self) -> list[int]:
+        return self._words.copy()
 
     def labels(self) -> dict[str, int]:
         return self._label_map.copy()
 
+    def lines(self) -> list[int]:
+        return self._lines.copy()
+
     def _get_instruction(self, index: int) -> Instruction:
-        new_index = self._instruction_map.get_forwards(index, -1)
-        if new_index == -1: value = self.instruction_set["NOP"]("NOP", -1)
-        else: _, value = self._instructions[new_index]
-        if isinstance(value, Immediate):
-            return self.instruction_set["LDI"](
-                f"LDI {self._label_map[value.value] -1}", -1)
-        elif isinstance(value, Directive):
-            raise LinkerError("Unexpected directive!")
-        else:
-            return value
+        word = self._words[index]
+        return Instruction(
+            (word >> 9) & 0x7, (word >> 6) & 0x7, (word >> 3) & 0x7, word & 0x7)
 
     def _get_instruction_line(self, index: int) -> int:
-        return self._instruction_map.get_backwards(index)
+        return self._lines[index]
 
     def _link(self):
+        long: set[int] = set()
+        while True:
+            grown: set[int] = set()
+            for index, line_number, item in self._layout(long):
+                if index in long: continue
+                if item.value not in self._label_map:
+                    raise LinkerError(
+                        f"Unknown label on line {line_number}: {item.value}")
+                if not (0 <= self._label_map[item.value] - 1 < MAX_IMMEDIATE):
+                    grown.add(index)
+            if not grown: break
+            long |= grown
+
+        words = self._words
+        lines = self._lines
+        addresses = self._addresses
+        instruction_line = 0
+        for index, (line_number, item) in enumerate(self._instructions):
+            addresses[index] = instruction_line
+            if isinstance(item, Instruction):
+                self._check_line(instruction_line, line_number)
+                words[instruction_line] = int(item)
+                lines[instruction_line] = line_number
+                instruction_line += 1
+            elif isinstance(item, Immediate):
+                target = (self._label_map[item.value] - 1) & 0xFFF
+                if index in long: encoded = (
+                    encode("LIU", target >> 6),
+                    encode("LIL", target & 0x3F),
+                )
+                else: encoded = (encode("LDI", target), )
+                for instruction in encoded:
+                    self._check_line(instruction_line, line_number)
+                    words[instruction_line] = int(instruction)
+                    lines[instruction_line] = line_number
+                    instruction_line += 1
+            elif isinstance(item, MemoryLocation):
+                instruction_line = item.value
+
+    def _layout(self, long: set[int]) -> list[tuple[int, int, Immediate]]:
+        self._label_map = {}
+        immediates: list[tuple[int, int, Immediate]] = []
+
         instruction_line = 0
         for index, (line_number, item) in enumerate(self._instructions):
-            if isinstance(item, MemoryLocation):
+            if isinstance(item, Instruction):
+                instruction_line += 1
+            elif isinstance(item, Immediate):
+                immediates.append((index, line_number, item))
+                instruction_line += 2 if index in long else 1
+            elif isinstance(item, MemoryLocation):
                 instruction_line = item.value
             elif isinstance(item, Label):
                 if item.value in self._label_map:
@@ -274,90 +367,254 @@ class Program:
                         f" {line_number}: {item.value}"
                     )
                 self._label_map[item.value] = instruction_line
-            elif isinstance(item, Immediate):
-                self._immediate.append((index, item))
-                self._instruction_map.set_forwards(instruction_line, index)
-                instruction_line += 1
-            elif isinstance(item, Directive):
+            else:
                 raise LinkerError(
                     f"Unknown or Invalid Directive! on line {line_number}.")
-            else:
-                self._instruction_map.set_forwards(instruction_line, index)
-                instruction_line += 1
+
+        return immediates
+
+    @staticmethod
+    def _check_line(instruction_line: int, line_number: int):
+        if not (0 <= instruction_line < INSTRUCTIONS_COUNT):
+            raise LinkerError(
+                f"Program does not fit in ROM on line {line_number}: "
+                f"{hex(instruction_line)}"
+            )
 
     @classmethod
     def parse(cls, s: str) -> list[tuple[int, Instruction | Directive]]:
         instructions: list[tuple[int, Instruction | Directive]] = []
+        macros = Macros()
 
         last_error = None
 
         for raw_line_number, raw_line in enumerate(s.splitlines(False)):
             try:
                 line_number = raw_line_number + 1
-                line = raw_line.strip().upper()
-                if len(line) == 0 or line[0] == ";":
-                    pass
-                elif line[:3] in cls.instruction_set:
-                    instructions.append((
-                        line_number,
-                        cls.instruction_set[line[:3]](line, line_number),
-                    ))
-                elif line[:2] in cls.instruction_set:
-                    instructions.append((
-                        line_number,
-                        cls.instruction_set[line[:2]](line, line_number),
-                    ))
-                elif line[-1] == ":":
-                    instructions.append((
-                        line_number,
-                        Label(line[:-1]),
-                    ))
-                elif line[0] == ".":
-                    instructions.append((
-                        line_number,
-                        Directive.directive(line, line_number),
-                    ))
-                elif line:
-                    raise AssemblerError(
-                        f"Invalid Instruction on line {line_number}: '{line}'")
+                for item in macros.parse_line(raw_line, line_number):
+                    instructions.append((line_number, item))
             except (AssemblerError, LinkerError) as e:
                 last_error = e
                 print(f"Error:\n\t{e}")
+        try: macros.close()
+        except AssemblerError as e:
+            last_error = e
+            print(f"Error:\n\t{e}")
         if last_error is not None:
             # raise last_error
             exit()
 
         return instructions
 
+    @classmethod
+    def parse_line(
+        cls,
+        raw_line: str,
+        line_number: int,
+    ) -> Instruction | Directive | None:
+        line = raw_line.strip().upper()
+        if len(line) == 0 or line[0] == ";":
+            return None
+        elif line[:3] in cls.instruction_set:
+            return cls.instruction_set[line[:3]](line, line_number)
+        elif line[:2] in cls.instruction_set:
+            return cls.instruction_set[line[:2]](line, line_number)
+        elif line[-1] == ":":
+            return Label(line[:-1])
+        elif line.startswith(".WORD "):
+            value = int(line[6:], base=0)
+            if not (0 <= value <= 0xFFF):
+                raise AssemblerError(
+                    f"Word value too large on line {line_number}: {hex(value)}")
+            return Instruction(
+                value >> 9, (value >> 6) & 0x7, (value >> 3) & 0x7, value & 0x7)
+        elif line[0] == ".":
+            return Directive.directive(line, line_number)
+        else:
+            raise AssemblerError(
+                f"Invalid Instruction on line {line_number}: '{line}'")
+
+
+class Macro:
+
+    _name: str
+    _parameters: list[str]
+    _body: list[str]
+
+    def __init__(self, name: str, parameters: list[str]):
+        self._name = name
+        self._parameters = parameters
+        self._body = []
+
+    @property
+    def name(self) -> str: return self._name
+    @property
+    def parameters(self) -> list[str]: return self._parameters
+    @property
+    def body(self) -> list[str]: return self._body
+
+    def expand(
+        self,
+        arguments: list[str],
+        expansion: int,
+        line_number: int,
+    ) -> list[str]:
+        if len(arguments) != len(self._parameters):
+            raise AssemblerError(
+                f"Invalid number of arguments on line {line_number}: "
+                f"{self._name}"
+            )
+        substitutions = sorted(
+            zip(self._parameters, arguments),
+            key=lambda pair: len(pair[0]),
+            reverse=True,
+        )
+        lines: list[str] = []
+        for line in self._body:
+            line = line.upper()
+            for parameter, argument in substitutions:
+                line = line.replace(f"\\{parameter}", argument)
+            lines.append(line.replace("\\@", str(expansion)))
+        return lines
+
+
+class Macros:
+
+    _macros: dict[str, Macro]
+    _definition: Macro | None
+    _expansions: int
+    _depth: int
+
+    def __init__(self):
+        self._macros = {}
+        self._definition = None
+        self._expansions = 0
+        self._depth = 0
+
+    @property
+    def macros(self) -> dict[str, Macro]: return self._macros
+
+    def cacheable(self, raw_line: str) -> bool:
+        words = _words(raw_line.strip().upper())
+        return self._definition is None and not (words and (
+            words[0] in (".MACRO", ".ENDM") or words[0] in self._macros))
+
+    def close(self):
+        if self._definition is not None:
+            raise AssemblerError(
+                f"Macro is missing .endm: {self._definition.name}")
+
+    def parse_line(
+        self,
+        raw_line: str,
+        line_number: int,
+    ) -> list[Instruction | Directive]:
+        line = raw_line.strip().upper()
+        words = _words(line)
+
+        if self._definition is not None:
+            if words[:1] == [".ENDM"]:
+                self._macros[self._definition.name] = self._definition
+                self._definition = None
+            elif words[:1] == [".MACRO"]:
+                raise AssemblerError(
+                    f"Macro definitions can not be nested on line "
+                    f"{line_number}"
+                )
+            else: self._definition.body.append(line)
+            return []
+
+        if not words or line[0] == ";": return []
+        elif words[0] == ".MACRO":
+            if len(words) < 2 or (
+                words[1] in OPCODES or
+                words[1] in PSEUDO_INSTRUCTIONS or
+                words[1][0] == "."
+            ):
+                raise AssemblerError(
+                    f"Invalid macro name on line {line_number}: "
+                    f"{' '.join(words[1:2])}"
+                )
+            self._definition = Macro(words[1], words[2:])
+            return []
+        elif words[0] == ".ENDM":
+            raise AssemblerError(
+                f".endm without .macro on line {line_number}")
+        elif words[0] in self._macros:
+            if self._depth >= MAX_MACRO_DEPTH:
+                raise AssemblerError(
+                    f"Macros nested too deeply on line {line_number}: "
+                    f"{words[0]}"
+                )
+            self._expansions += 1
+            lines = self._macros[words[0]].expand(
+                words[1:], self._expansions, line_number)
+            items: list[Instruction | Directive] = []
+            self._depth += 1
+            try:
+                for body_line in lines:
+                    items += self.parse_line(body_line, line_number)
+            finally: self._depth -= 1
+            return items
+        elif words[0] in PSEUDO_INSTRUCTIONS:
+            return PSEUDO_INSTRUCTIONS[words[0]](words[1:], line_number)
+
+        item = Program.parse_line(raw_line, line_number)
+        return [] if item is None else [item]
+
+
+def listing(code: Iterable[Instruction | Directive]) -> str:
+    return "".join(f"{item}\n" for item in code)
+
+def encode(
+    mnemonic: str,
+    *operands: str | int,
+    line_number: int = -1,
+) -> Instruction | Immediate:
+    name = mnemonic.upper()
+    if name not in OPCODES:
+        raise AssemblerError(
+            f"Invalid Instruction on line {line_number}: '{mnemonic}'")
+    form = FORMATS[name]
+    if len(operands) != len(form):
+        raise AssemblerError(
+            f"Invalid number of arguments on line {line_number}: {name}")
+
+    bb, bl, lb, ll = OPCODES[name]
+    if form == "r":
+        ll = _operand_reg(operands[0], line_number)
+    elif form == "rr":
+        ll = _operand_reg(operands[0], line_number)
+        lb = _operand_reg(operands[1], line_number)
+    elif form == "rrr":
+        ll = _operand_reg(operands[0], line_number)
+        bl = _operand_reg(operands[1], line_number)
+        lb = _operand_reg(operands[2], line_number)
+    elif form == "i":
+        value = operands[0]
+        if isinstance(value, str):
+            if value.startswith(':') and name == "LDI":
+                return Immediate(value[1:])
+            value = int(value, base=0)
+        if not (0 <= value < MAX_IMMEDIATE):
+            raise AssemblerError(
+                f"Immediate value too large {line_number}: {value}")
+        lb, ll = (value & 0x038) >> 3, value & 0x007
+    return Instruction(bb, bl, lb, ll)
+
+def _operand_reg(value: str | int, line_number: int) -> int:
+    if isinstance(value, int):
+        if 0 <= value < len(REGISTERS): return value
+        raise AssemblerError(
+            f"Invalid Register on line {line_number}: {value}")
+    return reg(value, line_number)
 
 def reg(reg: str, line_number: int) -> int:
-    register_names = [
-        "ZR",
-        "PC",
-        "SP",
-        "MP",
-        "D0",
-        "D1",
-        "D2",
-        "D3",
-    ]
-    register_numbers = [
-        "0",
-        "1",
-        "2",
-        "3",
-        "4",
-        "5",
-        "6",
-        "7",
-    ]
-    if reg.upper() in register_names:
-        return register_names.index(reg.upper())
-    elif reg in register_numbers:
-        return register_numbers.index(reg)
-    else:
+    number = _REGISTER_NUMBERS.get(reg.upper())
+    if number is None:
         raise AssemblerError(
             f"Invalid Register on line {line_number}: {reg}")
+    return number
 
 def reg1(line: str, line_number: int) -> int:
     args = line.split(' ')
@@ -420,3 +677,146 @@ def immediate(line: str, line_number: int) -> Instruction | Immediate:
     else:
         raise AssemblerError(
             f"Invalid number of arguments on line {line_number}: {args[0]}")
+
+def _words(line: str) -> list[str]:
+    return line.replace(',', ' ').split()
+
+def _pseudo_arguments(
+    name: str,
+    operands: list[str],
+    count: int,
+    line_number: int,
+):
+    if len(operands) != count:
+        raise AssemblerError(
+            f"Invalid number of arguments on line {line_number}: {name}")
+
+def _constant(value: str, line_number: int) -> int:
+    try: number = int(value, base=0)
+    except ValueError:
+        raise AssemblerError(
+            f"Invalid constant on line {line_number}: {value}") from None
+    if not (-(MAX_WORD + 1) // 2 <= number <= MAX_WORD):
+        raise AssemblerError(
+            f"Constant value too large on line {line_number}: {value}")
+    return number & MAX_WORD
+
+def _target(value: str, line_number: int) -> list[Instruction | Directive]:
+    if value[0] == ':': value = value[1:]
+    if value[0].isdigit() or value[0] == '-':
+        return load_constant(
+            "MP", (_constant(value, line_number) - 1) & MAX_WORD)
+    return [Immediate(value)]
+
+# Register only sequences, with R as the destination: (operands, uses R, value)
+_CONSTANT_STEPS: tuple[tuple[
+    tuple[str, ...], bool, Callable[[int], int]], ...] = (
+    (("OR", "R", "ZR", "ZR"), False, lambda _: 0),
+    (("INC", "R", "ZR"), False, lambda _: 1),
+    (("DEC", "R", "ZR"), False, lambda _: MAX_WORD),
+    (("INC", "R", "R"), True, lambda value: value + 1),
+    (("DEC", "R", "R"), True, lambda value: value - 1),
+    (("LSH", "R", "R"), True, lambda value: value << 1),
+    (("RSH", "R", "R"), True, lambda value: value >> 1),
+    (("NOR", "R", "R", "ZR"), True, lambda value: ~value),
+    (("SUB", "R", "R", "ZR"), True, lambda value: -value),
+)
+
+_constants: dict[int, tuple[tuple[str, ...], ...]] | None = None
+
+def _constant_table() -> dict[int, tuple[tuple[str, ...], ...]]:
+    global _constants
+    if _constants is None:
+        _constants = {}
+        frontier: list[tuple[int | None, tuple[tuple[str, ...], ...]]] = [
+            (None, ())]
+        for _ in range(2):
+            following: list[tuple[
+                int | None, tuple[tuple[str, ...], ...]]] = []
+            for value, sequence in frontier:
+                for operands, uses, step in _CONSTANT_STEPS:
+                    if uses and value is None: continue
+                    result = step(value or 0) & MAX_WORD
+                    if result in _constants: continue
+                    _constants[result] = sequence + (operands, )
+                    following.append((result, _constants[result]))
+            frontier = following
+    return _constants
+
+def load_constant(register: str, value: int) -> list[Instruction | Directive]:
+    value &= MAX_WORD
+    if register == "MP":
+        if value < MAX_IMMEDIATE: return [encode("LDI", value)]
+        upper = encode("LIU", value >> 6)
+        if value & 0x3F: return [upper, encode("LIL", value & 0x3F)]
+        return [upper]
+
+    code = load_constant("MP", value) + [encode("OR", register, "MP", "ZR")]
+    sequence = _constant_table().get(value)
+    if sequence is not None and len(sequence) <= len(code):
+        return [
+            encode(operands[0], *(
+                register if operand == "R" else operand
+                for operand in operands[1:]
+            ))
+            for operands in sequence
+        ]
+    return code
+
+def jmp(operands: list[str], line_number: int) -> list[Instruction | Directive]:
+    _pseudo_arguments("JMP", operands, 1, line_number)
+    return _target(operands[0], line_number) + [encode("OR", "PC", "MP", "ZR")]
+
+def call(
+    operands: list[str],
+    line_number: int,
+) -> list[Instruction | Directive]:
+    _pseudo_arguments("CALL", operands, 1, line_number)
+    return _target(operands[0], line_number) + [
+        encode("PSH", "PC"), encode("OR", "PC", "MP", "ZR")]
+
+def ret(operands: list[str], line_number: int) -> list[Instruction | Directive]:
+    _pseudo_arguments("RET", operands, 0, line_number)
+    return [encode("POP", "MP"), encode("INC", "PC", "MP")]
+
+def ldk(operands: list[str], line_number: int) -> list[Instruction | Directive]:
+    _pseudo_arguments("LDK", operands, 2, line_number)
+    register = REGISTERS[reg(operands[0], line_number)]
+    if register == "PC":
+        raise AssemblerError(
+            f"Invalid Register on line {line_number}: {operands[0]}")
+    return load_constant(register, _constant(operands[1], line_number))
+
+def mov(operands: list[str], line_number: int) -> list[Instruction | Directive]:
+    _pseudo_arguments("MOV", operands, 2, line_number)
+    destination = reg(operands[0], line_number)
+    source = reg(operands[1], line_number)
+    if destination == source: return []
+    return [encode("OR", destination, source, "ZR")]
+
+def clr(operands: list[str], line_number: int) -> list[Instruction | Directive]:
+    _pseudo_arguments("CLR", operands, 1, line_number)
+    register = reg(operands[0], line_number)
+    if REGISTERS[register] == "MP": return [encode("LDI", 0)]
+    return [encode("OR", register, "ZR", "ZR")]
+
+def neg(operands: list[str], line_number: int) -> list[Instruction | Directive]:
+    if len(operands) == 1: operands = operands * 2
+    _pseudo_arguments("NEG", operands, 2, line_number)
+    return [encode(
+        "SUB",
+        reg(operands[0], line_number),
+        reg(operands[1], line_number),
+        "ZR",
+    )]
+
+PSEUDO_INSTRUCTIONS: dict[
+    str, Callable[[list[str], int], list[Instruction | Directive]]] = {
+    "JMP": jmp,
+    "CALL": call,
+    "RET": ret,
+    "LDK": ldk,
+    "MOV": mov,
+    "CLR": clr,
+    "NEG": neg,
+}
@@ -0,0 +1,140 @@
+# Kyler Olsen
+# Oct 2026
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+import os
+
+from .assembler import Program, AssemblerError, LinkerError
+
+SOURCE_SUFFIX = ".s"
+
+
+class BatchResult:
+
+    _source: str
+    _time: float
+    _lines: int
+    _error: str | None
+
+    def __init__(
+        self,
+        source: str,
+        time: float,
+        lines: int,
+        error: str | None = None,
+    ):
+        self._source = source
+        self._time = time
+        self._lines = lines
+        self._error = error
+
+    @property
+    def source(self) -> str: return self._source
+    @property
+    def time(self) -> float: return self._time
+    @property
+    def lines(self) -> int: return self._lines
+    @property
+    def error(self) -> str | None: return self._error
+
+
+def sources(path: str | Path) -> list[tuple[Path, Path]]:
+    path = Path(path)
+    if path.is_dir():
+        return [
+            (source, source.relative_to(path))
+            for source in sorted(path.rglob(f"*{SOURCE_SUFFIX}"))
+        ]
+
+    files: list[tuple[Path, Path]] = []
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'): continue
+        source = path.parent / line
+        files.append((source, Path(line)))
+    return files
+
+def _assemble(
+    source: Path,
+    name: Path,
+    output_dir: Path,
+) -> BatchResult:
+    start = perf_counter()
+    lines = 0
+    # Program.parse reports errors by printing them and exiting
+    messages = StringIO()
+    try:
+        text = source.read_text()
+        lines = text.count('\n') + 1
+        with redirect_stdout(messages): program = Program(text)
+
+        output = output_dir / name.with_suffix('.bin')
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(bytes(program))
+        output.with_suffix('.hex').write_text(program.hex_str())
+        output.with_suffix('.labels').write_text("".join(
+            f"{hex(location)}, {label}\n"
+            for label, location in program.labels().items()
+        ))
+    except (AssemblerError, LinkerError, OSError) as e:
+        return BatchResult(str(name), perf_counter() - start, lines, str(e))
+    except SystemExit:
+        error = " ".join(
+            line.strip() for line in messages.getvalue().splitlines()
+            if line.strip() and line.strip() != "Error:"
+        )
+        return BatchResult(
+            str(name),
+            perf_counter() - start,
+            lines,
+            error or "Invalid assembly",
+        )
+    except Exception as e:
+        return BatchResult(
+            str(name),
+            perf_counter() - start,
+            lines,
+            f"{type(e).__name__}: {e}",
+        )
+    return BatchResult(str(name), perf_counter() - start, lines)
+
+def batch(
+    files: list[tuple[Path, Path]],
+    output_dir: str | Path,
+    jobs: int | None = None,
+) -> list[BatchResult]:
+    output_dir = Path(output_dir)
+    if jobs == 1:
+        return [_assemble(source, name, output_dir) for source, name in files]
+
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(
+            _assemble,
+            [source for source, _ in files],
+            [name for _, name in files],
+            [output_dir] * len(files),
+            chunksize=max(len(files) // (workers * 4), 1),
+        ))
+
+def report(results: list[BatchResult], elapsed: float) -> str:
+    output = f"{'File':<40} {'ms':>10}\n"
+    for result in results:
+        output += f"{result.source:<40} {result.time * 1000:>10.2f}"
+        if result.error is not None: output += f"  Error: {result.error}"
+        output += "\n"
+
+    failed = sum(result.error is not None for result in results)
+    lines = sum(result.lines for result in results)
+    elapsed = max(elapsed, 1e-9)
+    output += (
+        f"\n{len(results) - failed} assembled, {failed} failed in "
+        f"{elapsed:.3f} s\n"
+        f"{len(results) / elapsed:,.1f} files/s, "
+        f"{lines / elapsed:,.0f} lines/s\n"
+    )
+    return output
@@ -0,0 +1,306 @@
+# Kyler Olsen
+# Oct 2026
+
+from hashlib import sha256
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterable
+import json
+
+from .assembler import (
+    Program,
+    Instruction,
+    Directive,
+    MemoryLocation,
+    Label,
+    Immediate,
+    Comment,
+    LinkerError,
+)
+
+OBJECT_FORMAT = "ytd12-object"
+OBJECT_VERSION = 1
+OBJECT_SUFFIX = ".o"
+
+PC = 1
+MP = 3
+HLT = Instruction(0, 0, 0, 1)
+POP_PC = Instruction(0, 0, 6, PC)
+PSH_PC = Instruction(0, 0, 7, PC)
+RET = Instruction(0, 6, MP, PC)
+
+
+class Section:
+
+    _origin: int | None
+    _code: list[int]
+    _symbols: dict[str, int]
+    _relocations: dict[int, str]
+
+    def __init__(
+        self,
+        origin: int | None = None,
+        code: list[int] | None = None,
+        symbols: dict[str, int] | None = None,
+        relocations: dict[int, str] | None = None,
+    ):
+        self._origin = origin
+        self._code = code or []
+        self._symbols = symbols or {}
+        self._relocations = relocations or {}
+
+    @property
+    def origin(self) -> int | None: return self._origin
+    @property
+    def code(self) -> list[int]: return self._code
+    @property
+    def symbols(self) -> dict[str, int]: return self._symbols
+    @property
+    def relocations(self) -> dict[int, str]: return self._relocations
+
+    def items(self) -> list[Instruction | Directive]:
+        labels: dict[int, list[str]] = {}
+        for name, offset in self._symbols.items():
+            labels.setdefault(offset, []).append(name)
+
+        items: list[Instruction | Directive] = []
+        if self._origin is not None:
+            items.append(MemoryLocation(self._origin))
+        for offset, word in enumerate(self._code):
+            items += [Label(name) for name in labels.get(offset, [])]
+            if offset in self._relocations:
+                items.append(Immediate(self._relocations[offset]))
+            else:
+                items.append(Instruction(
+                    (word >> 9) & 0x7,
+                    (word >> 6) & 0x7,
+                    (word >> 3) & 0x7,
+                    word & 0x7,
+                ))
+        items += [Label(name) for name in labels.get(len(self._code), [])]
+        return items
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "origin": self._origin,
+            "code": self._code,
+            "symbols": self._symbols,
+            "relocations": [
+                [offset, name] for offset, name in self._relocations.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Section":
+        return cls(
+            data["origin"],
+            list(data["code"]),
+            dict(data["symbols"]),
+            {offset: name for offset, name in data["relocations"]},
+        )
+
+
+class ObjectFile:
+
+    _sections: list[Section]
+    _source_hash: str
+
+    def __init__(self, sections: list[Section], source_hash: str = ""):
+        self._sections = sections
+        self._source_hash = source_hash
+
+    @property
+    def sections(self) -> list[Section]: return self._sections
+    @property
+    def source_hash(self) -> str: return self._source_hash
+
+    @property
+    def hash(self) -> str:
+        return sha256(json.dumps(
+            [section.to_dict() for section in self._sections],
+            separators=(',', ':'),
+        ).encode('utf-8')).hexdigest()
+
+    def symbols(self) -> set[str]:
+        return set(chain.from_iterable(
+            section.symbols for section in self._sections))
+
+    def references(self) -> set[str]:
+        return set(chain.from_iterable(
+            section.relocations.values() for section in self._sections))
+
+    def items(self) -> list[Instruction | Directive]:
+        return list(chain.from_iterable(
+            section.items() for section in self._sections))
+
+    def __bytes__(self) -> bytes:
+        return json.dumps({
+            "format": OBJECT_FORMAT,
+            "version": OBJECT_VERSION,
+            "source": self._source_hash,
+            "hash": self.hash,
+            "sections": [section.to_dict() for section in self._sections],
+        }, separators=(',', ':')).encode('utf-8')
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ObjectFile":
+        try: obj = json.loads(data)
+        except ValueError as e:
+            raise LinkerError(f"Invalid object file: {e}") from e
+        if (
+            not isinstance(obj, dict) or
+            obj.get("format") != OBJECT_FORMAT or
+            obj.get("version") != OBJECT_VERSION
+        ):
+            raise LinkerError("Invalid object file format or version")
+        objectfile = cls(
+            [Section.from_dict(section) for section in obj["sections"]],
+            obj["source"],
+        )
+        if objectfile.hash != obj["hash"]:
+            raise LinkerError("Object file hash does not match its content")
+        return objectfile
+
+    @classmethod
+    def from_items(
+        cls,
+        items: Iterable[Instruction | Directive],
+        source_hash: str = "",
+    ) -> "ObjectFile":
+        sections: list[Section] = []
+        section = Section()
+        for item in items:
+            if isinstance(item, MemoryLocation):
+                if section.code or section.symbols or sections:
+                    sections.append(section)
+                section = Section(item.value)
+            elif isinstance(item, Label):
+                if item.value in section.symbols or any(
+                    item.value in other.symbols for other in sections
+                ):
+                    raise LinkerError(
+                        f"Label already declared: {item.value}")
+                section.symbols[item.value] = len(section.code)
+            elif isinstance(item, Immediate):
+                section.relocations[len(section.code)] = item.value
+                section.code.append(0)
+            elif isinstance(item, Instruction):
+                section.code.append(int(item))
+            elif not isinstance(item, Comment):
+                raise LinkerError("Unknown or Invalid Directive!")
+        if section.code or section.symbols or not sections:
+            sections.append(section)
+        return cls(sections, source_hash)
+
+    @classmethod
+    def from_source(cls, source: str) -> "ObjectFile":
+        return cls.from_items(
+            (item for _, item in Program.parse(source)), source_hash(source))
+
+
+def source_hash(source: str) -> str:
+    return sha256(
+        f"{OBJECT_FORMAT}:{OBJECT_VERSION}\n{source}".encode('utf-8')
+    ).hexdigest()
+
+def assemble_object(
+    source: str,
+    cache_dir: str | Path | None = None,
+) -> ObjectFile:
+    if cache_dir is None: return ObjectFile.from_source(source)
+
+    path = Path(cache_dir) / f"{source_hash(source)}{OBJECT_SUFFIX}"
+    if path.exists():
+        try: return ObjectFile.from_bytes(path.read_bytes())
+        except LinkerError: pass
+
+    objectfile = ObjectFile.from_source(source)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(objectfile))
+    return objectfile
+
+def _pointer(item: Instruction, mp: str | None) -> str | None:
+    bb, bl, lb, ll = item
+    if not bb and 1 <= bl <= 3: return "const" if bl != 3 or mp else None
+    elif (bb or bl >= 4 or lb in (2, 3, 4, 6)) and ll == MP: return None
+    else: return mp
+
+def _walk(
+    items: list[Instruction | Directive],
+    index: int,
+    reached: set[int],
+    roots: list[str],
+) -> bool:
+    mp: str | None = None
+    last: Instruction | Directive | None = None
+    for index in range(index, len(items)):
+        item = items[index]
+        if isinstance(item, MemoryLocation) or index in reached: return True
+        elif not isinstance(item, (Instruction, Immediate)): continue
+        reached.add(index)
+
+        if isinstance(item, Immediate):
+            roots.append(item.value)
+            mp = "label"
+            last = item
+            continue
+
+        bb, bl, lb, ll = item
+        writes_pc = ll == PC and (bb or bl >= 4 or (
+            not bl and lb in (2, 3, 4, 6)))
+        if item == HLT: return True
+        elif not bb and not bl and not lb and 2 <= ll <= 5:
+            if mp != "label": return False
+        elif item in (RET, POP_PC) and mp is None: return True
+        elif writes_pc:
+            if not (
+                bb in (2, 4, 7) and {bl, lb} == {MP, 0} and mp == "label"
+            ): return False
+            if last != PSH_PC: return True
+            mp = None
+        else: mp = _pointer(item, mp)
+        last = item
+    return True
+
+def reachable(items: list[Instruction | Directive]) -> list[bool] | None:
+    labels = {
+        item.value: index for index, item in enumerate(items)
+        if isinstance(item, Label)
+    }
+    reached: set[int] = set()
+    roots: list[str] = []
+    starts = [0] + [
+        index + 1 for index, item in enumerate(items)
+        if isinstance(item, MemoryLocation)
+    ]
+    for start in starts:
+        if not _walk(items, start, reached, roots): return None
+    done: set[str] = set()
+    while roots:
+        label = roots.pop()
+        if label in done or label not in labels: continue
+        done.add(label)
+        if not _walk(items, labels[label], reached, roots): return None
+
+    kept = [True] * len(items)
+    following: bool | None = None
+    for index in range(len(items) - 1, -1, -1):
+        item = items[index]
+        if isinstance(item, (Instruction, Immediate)):
+            kept[index] = following = index in reached
+        elif isinstance(item, MemoryLocation): following = None
+        elif isinstance(item, Label): kept[index] = item.value in done
+        elif isinstance(item, Comment):
+            kept[index] = following is not False
+    return kept
+
+def strip(
+    items: Iterable[Instruction | Directive],
+) -> list[Instruction | Directive]:
+    items = list(items)
+    kept = reachable(items)
+    if kept is None: return items
+    return [item for item, keep in zip(items, kept) if keep]
+
+def link(objects: Iterable[ObjectFile], stripped: bool = False) -> Program:
+    items = chain.from_iterable(obj.items() for obj in objects)
+    return Program(strip(items) if stripped else items)
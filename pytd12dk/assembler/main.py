@@ -1,25 +1,94 @@
 # Kyler Olsen
 # Feb 2024
 
-from typing import Sequence
+from typing import Sequence, TextIO
 import argparse
 
-from .assembler import Program, INSTRUCTIONS_COUNT
+from .assembler import Program, AssemblerError, LinkerError
+from .linker import (
+    ObjectFile,
+    OBJECT_SUFFIX,
+    assemble_object,
+    link,
+    reachable,
+)
+
+def _object(file: TextIO, cache_dir: str | None) -> ObjectFile:
+    if file.name.endswith(OBJECT_SUFFIX):
+        return ObjectFile.from_bytes(file.read().encode('utf-8'))
+    else:
+        return assemble_object(file.read(), cache_dir)
+
+def _program(args: argparse.Namespace) -> Program:
+    if len(args.input_file) == 1 and not args.input_file[0].name.endswith(
+        OBJECT_SUFFIX
+    ) and args.cache_dir is None:
+        text = args.input_file[0].read()
+        if not args.strip: return Program(text)
+        instructions = Program.parse(text)
+        kept = reachable([item for _, item in instructions])
+        if kept is None: return Program.from_parsed(instructions)
+        return Program.from_parsed([
+            instruction for instruction, keep in zip(instructions, kept)
+            if keep
+        ])
+    return link(
+        (_object(file, args.cache_dir) for file in args.input_file),
+        args.strip,
+    )
+
+def _batch(args: argparse.Namespace):
+    from time import perf_counter
+    from .batch import sources, batch, report
+
+    if args.output_dir is None:
+        print("Error:\n\tAn output directory is required with --batch")
+        exit(1)
+
+    files = [file for path in args.batch for file in sources(path)]
+    start = perf_counter()
+    results = batch(files, args.output_dir, args.jobs)
+    print(report(results, perf_counter() - start), end='')
+
+    if any(result.error is not None for result in results):
+        exit(1)
 
 def assemble(args: argparse.Namespace):
 
-    program = Program(args.input_file.read())
+    if args.batch:
+        return _batch(args)
+
+    if not args.input_file:
+        print("Error:\n\tNo input files")
+        exit(1)
 
-    try: assert len(bytes(program)) <= INSTRUCTIONS_COUNT * 1.5
-    except AssertionError:
-        print(
-            hex(int(len(bytes(program)) / 1.5)),
-            '>',
-            hex(INSTRUCTIONS_COUNT),
-            ':',
-            hex(int(len(bytes(program)) / 1.5) - INSTRUCTIONS_COUNT),
+    if args.watch:
+        from .watch import watch
+        try: watch(
+            args.input_file[0].name,
+            args.output_file,
+            args.labels_file,
+            args.hex_file,
         )
-        raise
+        except KeyboardInterrupt: pass
+        return
+
+    if args.object:
+        if len(args.input_file) != 1:
+            print("Error:\n\tOnly one input file can be assembled with -c")
+            exit(1)
+        try: objectfile = _object(args.input_file[0], args.cache_dir)
+        except (AssemblerError, LinkerError) as e:
+            print(f"Error:\n\t{e}")
+            exit(1)
+        if args.output_file:
+            args.output_file.write(bytes(objectfile))
+        return
+
+    try: program = _program(args)
+    except (AssemblerError, LinkerError) as e:
+        print(f"Error:\n\t{e}")
+        exit(1)
 
     if args.output_file:
         args.output_file.write(bytes(program))
@@ -31,11 +100,27 @@ def assemble(args: argparse.Namespace):
     if args.hex_file:
         args.hex_file.write(program.hex_str())
 
+    if args.rom_file:
+        from ..emulator.rom import pack, RomError
+        try: args.rom_file.write(
+            pack(program.words(), program.labels(), program.lines()))
+        except RomError as e:
+            print(f"Error:\n\t{e}")
+            exit(1)
+
 def parser(parser: argparse.ArgumentParser):
-    parser.add_argument('input_file', type=argparse.FileType('r'))
+    parser.add_argument('input_file', type=argparse.FileType('r'), nargs='*')
     parser.add_argument('-o', '--output_file', type=argparse.FileType('wb'))
     parser.add_argument('-l', '--labels_file', type=argparse.FileType('w'))
     parser.add_argument('-x', '--hex_file', type=argparse.FileType('w'))
+    parser.add_argument('-r', '--rom_file', type=argparse.FileType('wb'))
+    parser.add_argument('-c', '--object', action='store_true')
+    parser.add_argument('--cache_dir')
+    parser.add_argument('-b', '--batch', action='append')
+    parser.add_argument('-d', '--output_dir')
+    parser.add_argument('-j', '--jobs', type=int)
+    parser.add_argument('-w', '--watch', action='store_true')
+    parser.add_argument('-s', '--strip', action='store_true')
     parser.set_defaults(func=assemble)
 
 def main(argv: Sequence[str] | None = None):
@@ -0,0 +1,202 @@
+# Kyler Olsen
+# Oct 2026
+
+from pathlib import Path
+from time import perf_counter, sleep
+from typing import BinaryIO, Callable, TextIO
+
+from .assembler import (
+    Program,
+    Macros,
+    Instruction,
+    Directive,
+    MemoryLocation,
+    Label,
+    Immediate,
+    AssemblerError,
+    LinkerError,
+    INSTRUCTIONS_COUNT,
+)
+
+POLL_INTERVAL = 0.05
+
+
+def _shape(item: Instruction | Directive) -> object:
+    if isinstance(item, Instruction): return Instruction
+    elif isinstance(item, (MemoryLocation, Label, Immediate)):
+        return (type(item), item.value)
+    else: return type(item)
+
+def _overlaps(program: Program) -> bool:
+    # Each item records the address it starts at, so the next item's address
+    # gives its size. A trailing immediate may be two words long.
+    instructions = program._instructions
+    addresses = program._addresses
+    used: set[int] = set()
+    for index, (_, item) in enumerate(instructions):
+        if not isinstance(item, (Instruction, Immediate)): continue
+        elif index + 1 < len(instructions):
+            end = addresses[index + 1]
+        else: end = addresses[index] + (
+            1 if isinstance(item, Instruction) else 2)
+        for address in range(addresses[index], end):
+            if address in used: return True
+            used.add(address)
+    return False
+
+def pack(words: list[int], group: int) -> bytes:
+    first = words[group * 2]
+    if group * 2 + 1 < len(words):
+        second = words[group * 2 + 1]
+        return bytes((
+            first >> 4,
+            ((first & 0xf) << 4) | (second >> 8),
+            second & 0xff,
+        ))
+    else:
+        return bytes((first >> 4, (first & 0xf) << 4))
+
+
+class IncrementalProgram:
+
+    _cache: dict[str, list[Instruction | Directive]]
+    _instructions: list[tuple[int, Instruction | Directive]]
+    _shapes: list[object]
+    _program: Program | None
+    _overlapping: bool
+
+    def __init__(self):
+        self._cache = {}
+        self._instructions = []
+        self._shapes = []
+        self._program = None
+        self._overlapping = False
+
+    @property
+    def program(self) -> Program | None: return self._program
+
+    def update(self, source: str) -> list[int]:
+        cache = self._cache
+        macros = Macros()
+        parsed: dict[str, list[Instruction | Directive]] = {}
+        instructions: list[tuple[int, Instruction | Directive]] = []
+        for line_number, raw_line in enumerate(source.splitlines(), 1):
+            key = raw_line.strip()
+            if not macros.cacheable(raw_line):
+                items = macros.parse_line(raw_line, line_number)
+            else:
+                if key in parsed: items = parsed[key]
+                elif key in cache: items = cache[key]
+                else: items = macros.parse_line(raw_line, line_number)
+                parsed[key] = items
+            instructions += [(line_number, item) for item in items]
+        macros.close()
+        self._cache = parsed
+
+        shapes = [_shape(item) for _, item in instructions]
+        program = self._program
+        if (
+            program is not None and
+            shapes == self._shapes and
+            not self._overlapping
+        ): changed = self._patch(program, instructions)
+        else:
+            new = Program.from_parsed(instructions)
+            if program is None: old = [0] * INSTRUCTIONS_COUNT
+            else: old = program._words
+            changed = [
+                address for address, (a, b) in enumerate(zip(old, new._words))
+                if a != b
+            ]
+            self._program = new
+            self._overlapping = _overlaps(new)
+
+        self._instructions = instructions
+        self._shapes = shapes
+        return changed
+
+    def _patch(
+        self,
+        program: Program,
+        instructions: list[tuple[int, Instruction | Directive]],
+    ) -> list[int]:
+        changed: list[int] = []
+        words = program._words
+        for index, ((_, old), (line_number, new)) in enumerate(
+            zip(self._instructions, instructions)
+        ):
+            address = program._addresses[index]
+            if isinstance(new, Instruction):
+                program._lines[address] = line_number
+                if old is not new and int(old) != int(new): # type: ignore
+                    words[address] = int(new)
+                    changed.append(address)
+        program._instructions = instructions
+        if changed: program._binary = None
+        return changed
+
+
+def write_changes(
+    output: BinaryIO,
+    words: list[int],
+    changed: list[int],
+):
+    for group in sorted({address >> 1 for address in changed}):
+        output.seek(group * 3)
+        output.write(pack(words, group))
+    output.flush()
+
+def _rewrite(file: TextIO, text: str):
+    file.seek(0)
+    file.truncate()
+    file.write(text)
+    file.flush()
+
+def watch(
+    path: str,
+    output_file: BinaryIO | None = None,
+    labels_file: TextIO | None = None,
+    hex_file: TextIO | None = None,
+    interval: float = POLL_INTERVAL,
+    log: Callable[[str], None] = print,
+):
+    source = Path(path)
+    incremental = IncrementalProgram()
+    labels: dict[str, int] | None = None
+    mtime = None
+    first = True
+
+    while True:
+        try: current = source.stat().st_mtime_ns
+        except FileNotFoundError: current = None
+        if current is None or current == mtime:
+            sleep(interval)
+            continue
+        mtime = current
+
+        start = perf_counter()
+        try: changed = incremental.update(source.read_text())
+        except (AssemblerError, LinkerError, ValueError) as e:
+            log(f"Error:\n\t{e}")
+            continue
+        program = incremental.program
+        assert program is not None
+
+        if output_file:
+            if first: output_file.write(bytes(program))
+            else: write_changes(output_file, program._words, changed)
+            output_file.flush()
+        if hex_file and (first or changed):
+            _rewrite(hex_file, program.hex_str())
+        if labels_file and (first or labels != program.labels()):
+            _rewrite(labels_file, "".join(
+                f"{hex(location)}, {label}\n"
+                for label, location in program.labels().items()
+            ))
+        labels = program.labels()
+        first = False
+
+        log(
+            f"Assembled {path} in {(perf_counter() - start) * 1000:.3f} ms, "
+            f"{len(changed)} words changed"
+        )
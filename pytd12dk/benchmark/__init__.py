@@ -0,0 +1,11 @@
+# Kyler Olsen
+# Oct 2026
+
+from .runner import run, report
+from .workloads import workloads
+
+__all__ = [
+    'run',
+    'report',
+    'workloads',
+]
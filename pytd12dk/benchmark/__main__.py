@@ -0,0 +1,6 @@
+# Kyler Olsen
+# Oct 2026
+
+if __name__ == '__main__':
+    from .main import main
+    main()
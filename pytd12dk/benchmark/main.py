@@ -0,0 +1,67 @@
+# Kyler Olsen
+# Oct 2026
+
+from typing import Sequence
+import argparse
+import json
+
+from .runner import run, report
+from .startup import startup, startup_report, over_budget
+from ..emulator.machines import ENGINES
+
+def benchmark(args: argparse.Namespace):
+    if args.startup:
+        return startup_benchmark(args)
+
+    results = run(args.cycles, args.repeat, args.workload, args.engine)
+
+    baseline = None
+    if args.compare:
+        baseline = json.load(args.compare)
+
+    print(report(results, baseline), end='')
+
+    if args.output_file:
+        json.dump(results, args.output_file, indent=4)
+        args.output_file.write("\n")
+
+def startup_benchmark(args: argparse.Namespace):
+    results = startup(args.repeat)
+    print(startup_report(results, args.budget), end='')
+
+    if args.output_file:
+        json.dump({"startup": results}, args.output_file, indent=4)
+        args.output_file.write("\n")
+
+    if args.budget is not None and over_budget(results, args.budget):
+        exit(1)
+
+def _arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('-o', '--output_file', type=argparse.FileType('w'))
+    parser.add_argument('-b', '--compare', type=argparse.FileType('r'))
+    parser.add_argument('-c', '--cycles', type=int, default=100_000)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('-w', '--workload', action='append')
+    parser.add_argument(
+        '-e', '--engine', choices=ENGINES.keys(), default='interpreter')
+    parser.add_argument('-s', '--startup', action='store_true')
+    parser.add_argument('--budget', type=float)
+
+def parser(parser: argparse.ArgumentParser):
+    _arguments(parser)
+    parser.set_defaults(func=benchmark)
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description='ytd 12-bit Computer Emulator Benchmark',
+        epilog='https://github.com/KylerOlsen/ytd_12-bit_computer',
+    )
+    _arguments(parser)
+    parser.set_defaults(func=benchmark)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+# Kyler Olsen
+# Oct 2026
+
+from time import perf_counter
+import platform
+import subprocess
+import tracemalloc
+
+from ..assembler import Program
+from ..emulator import Computer, Memory
+from ..emulator.devices import tty
+from ..emulator.machines import ENGINES
+from .workloads import workloads
+
+OPCODES = {
+    "NOP": "NOP",
+    "HLT": "HLT",
+    "BNZ": "BNZ",
+    "BNA": "BNA",
+    "BNP": "BNP",
+    "BNN": "BNN",
+    "LOD": "LOD D0",
+    "STR": "STR D0",
+    "POP": "POP D0",
+    "PSH": "PSH D0",
+    "LIU": "LIU 1",
+    "LDI": "LDI 1",
+    "LIL": "LIL 1",
+    "LSH": "LSH D0 D1",
+    "RSH": "RSH D0 D1",
+    "INC": "INC D0 D1",
+    "DEC": "DEC D0 D1",
+    "AND": "AND D0 D1 D2",
+    "OR":  "OR D0 D1 D2",
+    "SUB": "SUB D0 D1 D2",
+    "XOR": "XOR D0 D1 D2",
+    "NOR": "NOR D0 D1 D2",
+    "NAD": "NAD D0 D1 D2",
+    "ADD": "ADD D0 D1 D2",
+}
+
+_OPCODE_BATCH = 0x600
+
+
+def machine(rom: list[int], engine: str = 'interpreter') -> Computer:
+    device = tty(0x7FD, 0x7FF)
+    device.output_limit = 0
+    return ENGINES[engine](Memory(rom, [device]))
+
+def _run(rom: list[int], cycles: int, engine: str) -> float:
+    computer = machine(rom, engine)
+    step = computer.step
+    start = perf_counter()
+    remaining = cycles
+    while remaining:
+        if not computer.active:
+            computer = machine(rom, engine)
+            step = computer.step
+        step()
+        remaining -= 1
+    return perf_counter() - start
+
+def run_workload(
+    rom: list[int],
+    cycles: int,
+    repeat: int,
+    engine: str = 'interpreter',
+) -> dict:
+    seconds = min(_run(rom, cycles, engine) for _ in range(repeat))
+    return {
+        'cycles': cycles,
+        'seconds': seconds,
+        'instructions_per_second': cycles / seconds,
+    }
+
+def _run_opcode(instruction: int, cycles: int, engine: str) -> float:
+    computer = machine([instruction] * _OPCODE_BATCH, engine)
+    step = computer.step
+    start = perf_counter()
+    for _ in range(cycles // _OPCODE_BATCH):
+        computer.program_counter = 0
+        for _ in range(_OPCODE_BATCH):
+            step()
+    return perf_counter() - start
+
+def opcode_costs(
+    cycles: int,
+    repeat: int,
+    engine: str = 'interpreter',
+) -> dict[str, float]:
+    costs: dict[str, float] = {}
+    cycles = max(cycles // _OPCODE_BATCH, 1) * _OPCODE_BATCH
+    for name, line in OPCODES.items():
+        _, instruction = Program.parse(line)[0]
+        seconds = min(
+            _run_opcode(int(instruction), cycles, engine) # type: ignore
+            for _ in range(repeat)
+        )
+        costs[name] = seconds / cycles * 1e9
+    return costs
+
+def computer_memory(
+    rom: list[int],
+    count: int = 100,
+    engine: str = 'interpreter',
+) -> float:
+    machine([0], engine)
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        computers = [machine(rom, engine) for _ in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del computers
+    return (after - before) / count
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(
+    cycles: int = 100_000,
+    repeat: int = 3,
+    include: list[str] | None = None,
+    engine: str = 'interpreter',
+) -> dict:
+    roms = workloads()
+    if include: roms = {k: v for k, v in roms.items() if k in include}
+
+    return {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'engine': engine,
+        'workloads': {
+            name: run_workload(rom, cycles, repeat, engine)
+            for name, rom in roms.items()
+        },
+        'opcodes_ns': opcode_costs(cycles, repeat, engine),
+        'computer_bytes': computer_memory([0], engine=engine),
+    }
+
+def report(results: dict, baseline: dict | None = None) -> str:
+    def ratio(new: float, old: float | None) -> str:
+        if not old: return ""
+        return f"{new / old:8.3f}x"
+
+    output = f"Commit: {results['commit']}\n"
+    output += f"Python: {results['python']}\n"
+    output += f"Engine: {results.get('engine', 'interpreter')}\n\n"
+    output += "Workload             Instructions/s\n"
+    for name, result in results['workloads'].items():
+        old = None
+        if baseline is not None and name in baseline['workloads']:
+            old = baseline['workloads'][name]['instructions_per_second']
+        new = result['instructions_per_second']
+        output += f"{name:<20} {new:14,.0f} {ratio(new, old)}\n"
+    output += "\nOpcode     ns/instruction\n"
+    for name, cost in results['opcodes_ns'].items():
+        old = None
+        if baseline is not None:
+            old = baseline['opcodes_ns'].get(name)
+        output += f"{name:<10} {cost:14.1f} {ratio(cost, old)}\n"
+    old = None
+    if baseline is not None: old = baseline['computer_bytes']
+    output += (
+        f"\nMemory per Computer: {results['computer_bytes']:,.0f} bytes "
+        f"{ratio(results['computer_bytes'], old)}\n"
+    )
+    return output
@@ -0,0 +1,59 @@
+# Kyler Olsen
+# Oct 2026
+
+from time import perf_counter
+import subprocess
+import sys
+
+COMMANDS = {
+    "python": ["-c", "pass"],
+    "help": ["-m", "pytd12dk", "--help"],
+    "em": ["-m", "pytd12dk", "em", "--help"],
+    "am": ["-m", "pytd12dk", "am", "--help"],
+    "cm": ["-m", "pytd12dk", "cm", "--help"],
+    "dm": ["-m", "pytd12dk", "dm", "--help"],
+    "so": ["-m", "pytd12dk", "so", "--help"],
+    "bm": ["-m", "pytd12dk", "bm", "--help"],
+}
+
+def _time(args: list[str], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        times.append(perf_counter() - start)
+    return min(times)
+
+def startup(repeat: int = 10) -> dict[str, float]:
+    results = {
+        name: _time(args, repeat) * 1000
+        for name, args in COMMANDS.items()
+    }
+    base = results["python"]
+    return {
+        name: time if name == "python" else time - base
+        for name, time in results.items()
+    }
+
+def startup_report(
+    results: dict[str, float],
+    budget: float | None = None,
+) -> str:
+    lines = [f"{'Command':<8} {'ms':>8}"]
+    for name, time in results.items():
+        line = f"{name:<8} {time:>8.1f}"
+        if name != "python" and budget is not None and time > budget:
+            line += "  over budget"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+def over_budget(results: dict[str, float], budget: float) -> list[str]:
+    return [
+        name for name, time in results.items()
+        if name != "python" and time > budget
+    ]
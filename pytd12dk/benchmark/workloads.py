@@ -0,0 +1,95 @@
+# Kyler Olsen
+# Oct 2026
+
+from pathlib import Path
+
+from ..pipeline import assemble, build
+
+EXAMPLES = Path(__file__).resolve().parents[2] / 'examples'
+
+ALU_HEAVY = """
+.0x0
+main:
+    ldi 1
+    or D0 MP ZR
+    or D1 ZR ZR
+loop:
+    add D1 D1 D0
+    xor D2 D1 D0
+    and D3 D2 D1
+    sub D0 D3 D2
+    nor D2 D0 D1
+    nad D3 D2 D0
+    lsh D1 D1
+    rsh D2 D3
+    inc D0 D0
+    dec D3 D3
+    or D1 D1 D2
+    ldi :loop
+    or PC MP ZR
+"""
+
+MEMORY_HEAVY = """
+.0x0
+main:
+    liu 0x3F
+    lil 0x3F
+    or SP MP ZR
+loop:
+    liu 0x20
+    lil 0x00
+    str D0
+    lod D1
+    inc D0 D1
+    dec SP SP
+    psh D0
+    pop D2
+    inc SP SP
+    liu 0x20
+    lil 0x01
+    str D2
+    lod D3
+    ldi :loop
+    or PC MP ZR
+"""
+
+BRANCH_HEAVY = """
+.0x0
+main:
+    ldi 1
+    or D2 MP ZR
+reset:
+    ldi 0x3F
+    or D0 MP ZR
+loop:
+    dec D0 D0
+    ldi :reset
+    bnz
+    and D1 D0 D2
+    ldi :loop
+    bna
+    ldi :loop
+    or PC MP ZR
+"""
+
+SYNTHETIC = {
+    'alu_heavy': ALU_HEAVY,
+    'memory_heavy': MEMORY_HEAVY,
+    'branch_heavy': BRANCH_HEAVY,
+}
+
+
+def workloads() -> dict[str, list[int]]:
+    roms: dict[str, list[int]] = {}
+
+    test2 = EXAMPLES / 'test2.s'
+    if test2.exists():
+        roms['test2'] = assemble(test2.read_text())
+
+    for path in sorted(EXAMPLES.glob('*.duox')):
+        roms[path.stem] = build(path.read_text(), str(path))
+
+    for name, source in SYNTHETIC.items():
+        roms[name] = assemble(source)
+
+    return roms
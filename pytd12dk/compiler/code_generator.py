@@ -6,6 +6,17 @@ from datetime import datetime
 from .compiler_types import CompilerError
 from . import syntactical_analyzer as sya
 from . import semantical_analyzer as sma
+from ..assembler.assembler import (
+    Instruction,
+    Directive,
+    MemoryLocation,
+    Label,
+    Comment,
+    encode,
+)
+from ..superoptimizer.rules import rules
+
+type Code = list[Instruction | Directive]
 
 CODE = (0x000, 0x6ff)
 IO = (0x700, 0x7ff)
@@ -57,42 +68,42 @@ class _State:
         self._loop_index += 1
         return f"`loop{self._loop_index - 1}"
 
-    def store_symbol(self, reg: str) -> str:
-        code = ""
+    def store_symbol(self, reg: str) -> Code:
+        code: Code = []
         if isinstance(self.registers[reg], sma.Symbol):
             symbol = self.registers[reg]
             if symbol in self.local:
-                code += f"ldi {self.local[symbol]}\n"
-                code += "add MP SP MP\n"
-                code += f"str {reg}\n"
+                code.append(encode("ldi", self.local[symbol]))
+                code.append(encode("add", "MP", "SP", "MP"))
+                code.append(encode("str", reg))
             elif symbol in self.memory:
-                code += f"ldi {self.memory[symbol]}\n"
-                code += f"str {reg}\n"
+                code.append(encode("ldi", self.memory[symbol]))
+                code.append(encode("str", reg))
         self.registers[reg] = False
         return code
 
-    def load_symbol(self, symbol: sma.Symbol, reg: str | None = None) -> str:
-        code = ""
+    def load_symbol(self, symbol: sma.Symbol, reg: str | None = None) -> Code:
+        code: Code = []
         if reg is None:
             reg = self.register_rotation
         if isinstance(self.registers[reg], sma.Symbol):
             self.store_symbol(reg)
         self.registers[reg] = symbol
         if symbol in self.local:
-            code += f"ldi {self.local[symbol]}\n"
-            code += "add MP SP MP\n"
-            code += f"lod {reg}\n"
+            code.append(encode("ldi", self.local[symbol]))
+            code.append(encode("add", "MP", "SP", "MP"))
+            code.append(encode("lod", reg))
         elif symbol in self.memory:
-            code += f"ldi {self.memory[symbol]}\n"
-            code += f"lod {reg}\n"
+            code.append(encode("ldi", self.memory[symbol]))
+            code.append(encode("lod", reg))
         else: raise CodeGenerationError(
             f"Can not find memory of symbol: {symbol.name} ({hash(symbol)})")
         return code
 
-    def get_symbol(self, symbol: sma.Symbol) -> str:
+    def get_symbol(self, symbol: sma.Symbol) -> Code:
         for sym in self.registers.values():
             if sym == symbol:
-                return ""
+                return []
         else:
             return self.load_symbol(symbol)
 
@@ -102,21 +113,21 @@ class _State:
                 return reg
         return "NN"
 
-    def load_immediate(self, value: int) -> str:
+    def load_immediate(self, value: int) -> Code:
         if value >= 64:
             valuea = value // 64
             valueb = value % 64
-            return f"liu {valuea}\nlil {valueb}\n"
+            return [encode("liu", valuea), encode("lil", valueb)]
         else:
-            return f"ldi {value}\n"
+            return [encode("ldi", value)]
 
     def gen_binary_exprs(
         self,
         expression: sya.BinaryExpression,
         symbols: sma.SymbolTable,
         reg: str | None = None,
-    ) -> str:
-        code = ""
+    ) -> Code:
+        code: Code = []
         if expression.operator == sya.BinaryOperatorEnum.Addition:
             if reg:
                 if isinstance(expression.operand1, sya.Identifier):
@@ -130,8 +141,8 @@ class _State:
                     sya.NumberLiteral,
                 )):
                     rega = self.register_rotation
-                    code += f"ldi {expression.operand1.value}\n"
-                    code += f"or {rega} MP ZR\n"
+                    code.append(encode("ldi", expression.operand1.value))
+                    code.append(encode("or", rega, "MP", "ZR"))
 
                 if isinstance(expression.operand2, sya.Identifier):
                     code += self.get_symbol(
@@ -145,19 +156,35 @@ class _State:
                 )):
                     regb = self.register_rotation
                     code += self.load_immediate(expression.operand2.value)
-                    code += f"or {regb} MP ZR\n"
+                    code.append(encode("or", regb, "MP", "ZR"))
 
-                code += f"add {reg} {rega} {regb}\n"
+                code.append(encode("add", reg, rega, regb))
         elif expression.operator == sya.BinaryOperatorEnum.Subtraction:
             raise CodeGenerationNotImplemented(
                 "Code Generation not implemented for Subtraction",
                 expression.file_info
             )
         elif expression.operator == sya.BinaryOperatorEnum.Multiplication:
-            raise CodeGenerationNotImplemented(
-                "Code Generation not implemented for Multiplication",
-                expression.file_info
-            )
+            operand, constant = expression.operand1, expression.operand2
+            if isinstance(operand, sya.NumberLiteral):
+                operand, constant = constant, operand
+            rule = None
+            if isinstance(constant, sya.NumberLiteral):
+                rule = rules().get(f"mul{constant.value}")
+            if rule is None or not isinstance(operand, sya.Identifier):
+                raise CodeGenerationNotImplemented(
+                    "Code Generation not implemented for Multiplication",
+                    expression.file_info
+                )
+            if reg:
+                code += self.get_symbol(symbols.get(operand.content))
+                rega = self.get_register(symbols.get(operand.content))
+                if rega == reg and not rule.in_place:
+                    raise CodeGenerationNotImplemented(
+                        "Code Generation not implemented for Multiplication",
+                        expression.file_info
+                    )
+                code += rule.instructions(A=rega, R=reg)
         elif expression.operator == sya.BinaryOperatorEnum.Division:
             raise CodeGenerationNotImplemented(
                 "Code Generation not implemented for Division",
@@ -210,7 +237,7 @@ class _State:
                     symbols.get(expression.operand2.content))
                 rega = self.get_register(
                     symbols.get(expression.operand2.content))
-                code += f"or {reg} {rega} ZR\n"
+                code.append(encode("or", reg, rega, "ZR"))
             elif isinstance(expression.operand2, (
                 sya.BuiltInConst,
                 sya.CharLiteral,
@@ -218,7 +245,7 @@ class _State:
             )):
                 regb = self.register_rotation
                 code += self.load_immediate(expression.operand2.value)
-                code += f"or {reg} MP ZR\n"
+                code.append(encode("or", reg, "MP", "ZR"))
         elif expression.operator == sya.BinaryOperatorEnum.AdditionAssignment:
             raise CodeGenerationNotImplemented(
                 "Code Generation not implemented for AdditionAssignment",
@@ -322,8 +349,8 @@ class _State:
             )
         return code
 
-    def gen_block(self, block: sma.CodeBlock, symbols: sma.SymbolTable) -> str:
-        code = ""
+    def gen_block(self, block: sma.CodeBlock, symbols: sma.SymbolTable) -> Code:
+        code: Code = []
         for statement in block.code:
             if isinstance(statement, sya.LetStatement): pass
             elif isinstance(statement, sya.BinaryExpression):
@@ -338,11 +365,11 @@ class _State:
                 )
         return code
 
-    def gen_while(self, loop: sma.WhileBlock, symbols: sma.SymbolTable) -> str:
+    def gen_while(self, loop: sma.WhileBlock, symbols: sma.SymbolTable) -> Code:
         start_label = self.loop_index
         end_label = self.loop_index
         break_label = self.loop_index
-        code = f"{start_label}:\n"
+        code: Code = [Label(start_label)]
         if not (
             loop.condition.code and
             isinstance(loop.condition.code[0], sya.BuiltInConst) and
@@ -354,23 +381,30 @@ class _State:
                 loop.file_info,
             )
         code += self.gen_block(loop.code, symbols)
-        code += f"ldi :{start_label}\nor PC MP ZR\n{end_label}:\n"
+        code.append(encode("ldi", f":{start_label}"))
+        code.append(encode("or", "PC", "MP", "ZR"))
+        code.append(Label(end_label))
         if loop.else_block is not None:
             code += self.gen_block(loop.else_block.code, symbols)
-        code += f"{break_label}:\n"
+        code.append(Label(break_label))
 
         return code
 
-    def gen_func(self, func: sma.FunctionBlock) -> str:
+    def gen_func(self, func: sma.FunctionBlock) -> Code:
         self.local = dict()
         memory = 0
         for symbol in func.symbol_table.symbols:
             self.local[symbol] = memory
             memory += 1
-        code = f"{func.identifier.content}:\n"
-        code += f"\n; Initializing stack for function:"
-        code += f" {func.identifier.content}\nldi {memory}\n"
-        code += "sub SP SP MP\n\n"
+        code: Code = [
+            Label(func.identifier.content),
+            Comment(),
+            Comment(
+                f"Initializing stack for function: {func.identifier.content}"),
+            encode("ldi", memory),
+            encode("sub", "SP", "SP", "MP"),
+            Comment(),
+        ]
 
         for symbol in func.symbol_table.symbols:
             if (
@@ -384,40 +418,52 @@ class _State:
                         symbol.definition.assignment.file_info,
                     )
                 else:
-                    code += f"; Loading initial value for {symbol.name}\n"
+                    code.append(
+                        Comment(f"Loading initial value for {symbol.name}"))
                     code += self.load_immediate(
                         symbol.definition.assignment.value)
-                    code += "or D0 MP ZR\n"
-                    code += f"ldi {self.local[symbol]}\n"
-                    code += "add MP SP MP\n"
-                    code += "str D0\n"
+                    code.append(encode("or", "D0", "MP", "ZR"))
+                    code.append(encode("ldi", self.local[symbol]))
+                    code.append(encode("add", "MP", "SP", "MP"))
+                    code.append(encode("str", "D0"))
 
         code += self.gen_block(func.code, func.symbol_table)
 
-        code += "\n; Uninitializing stack for function:"
-        code += f" {func.identifier.content}\nldi {memory}\n"
-        code += "add SP SP MP\n"
+        code.append(Comment())
+        code.append(Comment(
+            f"Uninitializing stack for function: {func.identifier.content}"))
+        code.append(encode("ldi", memory))
+        code.append(encode("add", "SP", "SP", "MP"))
 
         return code
 
-    def code_generator(self, syntax_tree: sma.File, entry_name: str) -> str:
+    def code_generator(self, syntax_tree: sma.File, entry_name: str) -> Code:
         memory = RAM[0]
         for symbol in syntax_tree.symbol_table.symbols:
             if symbol.symbol_type == sma.SymbolType.variable:
                 self.memory[symbol] = memory
                 memory += 1 #symbol.definition.size
 
-        code = "; Generated by `pytd12dk` compiler\n"
-        code += f"; {datetime.now().isoformat()}\n"
-        code += "; Global variables use "
-        code += f"{memory - RAM[0]}/{RAM[1] - RAM[0]} bytes\n"
-        code += "\n.0x0\n"
+        code: Code = [
+            Comment("Generated by `pytd12dk` compiler"),
+            Comment(datetime.now().isoformat()),
+            Comment(
+                "Global variables use "
+                f"{memory - RAM[0]}/{RAM[1] - RAM[0]} bytes"
+            ),
+            Comment(),
+            MemoryLocation(CODE[0]),
+        ]
         code += self.load_immediate(RAM[1])
-        code += f"or SP MP ZR\nldi :{entry_name}\nor PC MP ZR\n"
+        code.append(encode("or", "SP", "MP", "ZR"))
+        code.append(encode("ldi", f":{entry_name}"))
+        code.append(encode("or", "PC", "MP", "ZR"))
 
         for child in syntax_tree.children:
             if isinstance(child, sma.FunctionBlock):
-                code += f"\n{self.gen_func(child)}\n"
+                code.append(Comment())
+                code += self.gen_func(child)
+                code.append(Comment())
             else:
                 raise CodeGenerationNotImplemented(
                     "Code Generation not yet implemented for: "
@@ -427,5 +473,5 @@ class _State:
 
         return code
 
-def code_generator(syntax_tree: sma.File, entry_name: str = 'main') -> str:
+def code_generator(syntax_tree: sma.File, entry_name: str = 'main') -> Code:
     return _State().code_generator(syntax_tree, entry_name)
\ No newline at end of file
@@ -1,8 +1,8 @@
 # Kyler Olsen
 # Feb 2024
 
-from enum import Enum
-from typing import ClassVar, Sequence
+import re
+from typing import ClassVar, Iterable, Iterator
 
 from .compiler_types import CompilerError, FileInfo
 
@@ -12,111 +12,27 @@ class LexerError(CompilerError):
     _compiler_error_type = "Lexical"
 
 
-class _InterTokenType(Enum):
-    Generic = 'Generic'
-    Directive = 'Directive'
-    SingleLineComment = 'SingleLineComment'
-    MultiLineComment = 'MultiLineComment'
-    Word = 'Word'
-    NumberLiteral = 'NumberLiteral'
-    CharLiteral = 'CharLiteral'
-    StringLiteral = 'StringLiteral'
-    Punctuation = 'Punctuation'
-
-
-class _NumberLiteralType(Enum):
-    Number = 'Number'
-    Real = 'Real'
-    Exp = 'Exp'
-    Base = 'Base'
-    Binary = 'Binary'
-    Octal = 'Octal'
-    Hex = 'Hex'
-
-
-_OnlyNewLineTerminatedTokens = (
-    _InterTokenType.Directive,
-    _InterTokenType.SingleLineComment,
-)
-
-_NewLineTerminatedTokens = _OnlyNewLineTerminatedTokens + (
-    _InterTokenType.Word,
-    _InterTokenType.NumberLiteral,
-    _InterTokenType.Punctuation,
-)
-
-_NewLineErrorTokens = (
-    _InterTokenType.CharLiteral,
-    _InterTokenType.StringLiteral,
-)
-
 _ID_Start = "ABCDEFGHIJKLMNOPQRSTUVWXYZ" "abcdefghijklmnopqrstuvwxyz" "_"
 
 _ID_Continue = _ID_Start + "0123456789"
 
-_Keywords = (
+_Keywords = frozenset((
     'struct',   'fn',    'enum',  'static',
     'if',       'else',  'do',    'while',
     'for',      'let',   'break', 'continue',
     'unsigned', 'int',   'fixed', 'float',
     'True',     'False', 'None',
-)
+))
 
 _Num_Start = "0123456789"
 
-_Num_Start_Next = {
-    _NumberLiteralType.Number: {
-        '.': _NumberLiteralType.Real,
-        '0': _NumberLiteralType.Base,
-    }
-}
-
-_Num_Second = {
-    _NumberLiteralType.Number: _Num_Start + ".eE_",
-    _NumberLiteralType.Real: _Num_Start + "eE_",
-    _NumberLiteralType.Base: "bBoOxX",
-}
-
-_Num_Second_Next = {
-    _NumberLiteralType.Number: {
-        '.': _NumberLiteralType.Real,
-        'e': _NumberLiteralType.Exp,
-        'E': _NumberLiteralType.Exp,
-    },
-    _NumberLiteralType.Real: {
-        'e': _NumberLiteralType.Exp,
-        'E': _NumberLiteralType.Exp,
-    },
-    _NumberLiteralType.Base: {
-        'b': _NumberLiteralType.Binary,
-        'B': _NumberLiteralType.Binary,
-        'o': _NumberLiteralType.Octal,
-        'O': _NumberLiteralType.Octal,
-        'x': _NumberLiteralType.Hex,
-        'X': _NumberLiteralType.Hex,
-    }
-}
-
-_Num_Continue = {
-    _NumberLiteralType.Number: _Num_Start + ".eE_",
-    _NumberLiteralType.Real: _Num_Start + "eE_",
-    _NumberLiteralType.Exp: _Num_Start + "_",
-    _NumberLiteralType.Binary: "01_",
-    _NumberLiteralType.Octal: "01234567_",
-    _NumberLiteralType.Hex: _Num_Start + "abcdefABCDEF_",
-}
-
-_Num_Continue_Next = {
-    _NumberLiteralType.Number: {
-        '.': _NumberLiteralType.Real,
-        'e': _NumberLiteralType.Exp,
-        'E': _NumberLiteralType.Exp,
-    },
-    _NumberLiteralType.Real: {
-        'e': _NumberLiteralType.Exp,
-        'E': _NumberLiteralType.Exp,
-    }
-}
+# Decimal, real and exponent forms share one digit run; a leading zero starts
+# a based literal, or stands alone when no base letter follows it.
+_Number = (
+    r"\.(?=[0-9eE_])[0-9_]*(?:[eE][0-9_]*)?"
+    r"|0(?:[bB][01_]*|[oO][0-7_]*|[xX][0-9a-fA-F_]*)?"
+    r"|[1-9][0-9_]*(?:\.[0-9_]*)?(?:[eE][0-9_]*)?"
+)
 
 _Punctuation_Any = "@$+-*/%~&|^<>=!?{[(}]).->,;:"
 
@@ -131,6 +47,27 @@ _Punctuation = (
     "?",   ".",   "->", ",",  ";",  ":",
 )
 
+_Token_Start = "#/.'\"" + _ID_Start + _Num_Start + _Punctuation_Any
+
+# Each match skips anything that cannot start a token, then tries the
+# alternatives in order, so comments win over '/' and a '.' that starts a real
+# number wins over member access. A block comment closes at the first '*/',
+# and its own opening '*' counts, so '/*/' is a whole comment. Longer
+# punctuation is listed first to keep the longest match.
+_Master = re.compile(f"[^{re.escape(_Token_Start)}]*(?:" + "|".join((
+    r"(?P<Directive>#.*)",
+    r"(?P<Comment>//.*|/\*(?:/|.*?\*/))",
+    r"(?P<OpenComment>/\*.*)",
+    f"(?P<Word>[{_ID_Start}][{_ID_Continue}]*)",
+    f"(?P<NumberLiteral>{_Number})",
+    r"(?P<CharLiteral>'(?:\\.|[^'\\])*')",
+    r'(?P<StringLiteral>"(?:\\.|[^"\\])*")',
+    r"(?P<Unterminated>['\"].*)",
+    "(?P<Punctuation>" + "|".join(
+        re.escape(i) for i in sorted(_Punctuation, key=len, reverse=True)
+    ) + ")",
+)) + ")?")
+
 
 class Token:
 
@@ -160,179 +97,52 @@ class StringLiteral(Token): _type = 'StringLiteral'
 class Punctuation(Token): _type = 'Punctuation'
 
 
-def lexer(file: str, filename: str) -> Sequence[Token]:
-    tokens: list[Token] = []
-    current: str = ""
-    current_line: int = 0
-    current_col: int = 0
-    escaped: bool = False
-    number_type: _NumberLiteralType = _NumberLiteralType.Number
-    token_type: _InterTokenType = _InterTokenType.Generic
-
-    for line, line_str in enumerate(file.splitlines()):
-        fi = FileInfo(filename, current_line, current_col, len(current))
-        if token_type in _NewLineErrorTokens:
-            raise LexerError("Unexpected Newline", fi)
-        if token_type in _NewLineTerminatedTokens:
-            if token_type is _InterTokenType.Directive:
-                tokens.append(Directive(current, fi))
-            elif token_type is _InterTokenType.Word:
-                if len(current) > 15:
+def _comment_end(line_str: str, previous: str) -> int:
+    if previous == '*' and line_str.startswith('/'): return 1
+    end = line_str.find("*/")
+    return -1 if end == -1 else end + 2
+
+def _lines(file: str | Iterable[str]) -> Iterable[str]:
+    if isinstance(file, str): return file.splitlines()
+    return (line for chunk in file for line in chunk.splitlines())
+
+def lexer(file: str | Iterable[str], filename: str) -> Iterator[Token]:
+    # Last character seen inside an open multi-line comment, empty otherwise
+    comment: str = ""
+
+    for line, line_str in enumerate(_lines(file), 1):
+        col = 0
+        if comment:
+            col = _comment_end(line_str, comment)
+            if col == -1:
+                if line_str: comment = line_str[-1]
+                continue
+            comment = ""
+
+        for match in _Master.finditer(line_str, col):
+            kind = match.lastgroup
+            if kind is None or kind == 'Comment': continue
+            elif kind == 'OpenComment':
+                comment = line_str[-1]
+                continue
+            start, end = match.span(kind)
+            value = line_str[start:end]
+            fi = FileInfo(filename, line, start + 1, end - start)
+            if kind == 'Word':
+                if end - start > 15:
                     raise LexerError("Identifier Too Long", fi)
-                if current in _Keywords:
-                    tokens.append(Keyword(current, fi))
-                else:
-                    tokens.append(Identifier(current, fi))
-            elif token_type is _InterTokenType.NumberLiteral:
-                tokens.append(NumberLiteral(current, fi))
-                number_type = _NumberLiteralType.Number
-            elif token_type is _InterTokenType.Punctuation:
-                if current not in _Punctuation:
-                    raise LexerError("Invalid Punctuation", fi)
-                tokens.append(Punctuation(current, fi))
-            token_type = _InterTokenType.Generic
-
-        for col, char in enumerate(line_str):
-            if token_type in _OnlyNewLineTerminatedTokens:
-                current += char
-            elif token_type is _InterTokenType.MultiLineComment:
-                if len(current) >= 2 and current[-1] == '*' and char == '/':
-                    token_type = _InterTokenType.Generic
-                    continue
-                current += char
-            elif token_type is _InterTokenType.Word:
-                if char in _ID_Continue:
-                    current += char
-                else:
-                    fi = FileInfo(
-                        filename, current_line, current_col, len(current))
-                    if len(current) > 15:
-                        raise LexerError("Identifier Too Long", fi)
-                    if current in _Keywords:
-                        tokens.append(Keyword(current, fi))
-                    else:
-                        tokens.append(Identifier(current, fi))
-                    token_type = _InterTokenType.Generic
-            elif token_type is _InterTokenType.NumberLiteral:
-                if (
-                        len(current) == 1 and
-                        number_type in _Num_Second and
-                        char in _Num_Second[number_type]
-                    ):
-                    current += char
-                    if (
-                        number_type in _Num_Second_Next and
-                        char in _Num_Second_Next[number_type]
-                    ):
-                        number_type = _Num_Second_Next[number_type][char]
-                elif (
-                        number_type in _Num_Continue and
-                        char in _Num_Continue[number_type]
-                    ):
-                    current += char
-                    if (
-                        number_type in _Num_Continue_Next and
-                        char in _Num_Continue_Next[number_type]
-                    ):
-                        number_type = _Num_Continue_Next[number_type][char]
-                else:
-                    fi = FileInfo(
-                        filename, current_line, current_col, len(current))
-                    tokens.append(NumberLiteral(current, fi))
-                    number_type = _NumberLiteralType.Number
-                    token_type = _InterTokenType.Generic
-            elif token_type is _InterTokenType.CharLiteral:
-                if escaped:
-                    escaped = False
-                elif char == '\\':
-                    escaped = True
-                elif char == "'":
-                    current += char
-                    fi = FileInfo(
-                        filename, current_line, current_col, len(current))
-                    if (
-                        (current[1] != '\\' and len(current) > 3) or
-                        len(current) > 4
-                    ):
-                        raise LexerError("Character Literal Too Long", fi)
-                    tokens.append(CharLiteral(current, fi))
-                    token_type = _InterTokenType.Generic
-                    continue
-                current += char
-            elif token_type is _InterTokenType.StringLiteral:
-                if escaped:
-                    escaped = False
-                elif char == '\\':
-                    escaped = True
-                elif char == '"':
-                    current += char
-                    fi = FileInfo(
-                        filename, current_line, current_col, len(current))
-                    tokens.append(StringLiteral(current, fi))
-                    token_type = _InterTokenType.Generic
-                    continue
-                current += char
-            elif token_type is _InterTokenType.Punctuation:
-                if char in _Punctuation_Any and current + char in _Punctuation:
-                    current += char
-                else:
-                    fi = FileInfo(
-                        filename, current_line, current_col, len(current))
-                    if current not in _Punctuation:
-                        raise LexerError("Invalid Punctuation", fi)
-                    tokens.append(Punctuation(current, fi))
-                    token_type = _InterTokenType.Generic
-
-            if token_type is _InterTokenType.Generic:
-                current = char
-                current_line = line + 1
-                current_col = col + 1
-                escaped = False
-                if char == '#': token_type = _InterTokenType.Directive
-                elif char == '/' and line_str[col+1] == '/':
-                    token_type = _InterTokenType.SingleLineComment
-                elif char == '/' and line_str[col+1] == '*':
-                    token_type = _InterTokenType.MultiLineComment
-                elif char in _ID_Start:
-                    token_type = _InterTokenType.Word
-                elif (
-                    char == '.' and
-                    line_str[col+1] in _Num_Second[_NumberLiteralType.Real]
-                ):
-                    token_type = _InterTokenType.NumberLiteral
-                    if char in _Num_Start_Next[number_type]:
-                        number_type = _Num_Start_Next[number_type][char]
-                elif char in _Num_Start:
-                    token_type = _InterTokenType.NumberLiteral
-                    if char in _Num_Start_Next[number_type]:
-                        number_type = _Num_Start_Next[number_type][char]
-                elif char == "'":
-                    token_type = _InterTokenType.CharLiteral
-                elif char == '"':
-                    token_type = _InterTokenType.StringLiteral
-                elif char in _Punctuation_Any:
-                    token_type = _InterTokenType.Punctuation
-
-    fi = FileInfo(filename, current_line, current_col, len(current))
-    if token_type in _NewLineErrorTokens:
-        raise LexerError("Unexpected Newline", fi)
-    if token_type in _NewLineTerminatedTokens:
-        if token_type is _InterTokenType.Directive:
-            tokens.append(Directive(current, fi))
-        elif token_type is _InterTokenType.Word:
-            if len(current) > 15:
-                raise LexerError("Identifier Too Long", fi)
-            if current in _Keywords:
-                tokens.append(Keyword(current, fi))
-            else:
-                tokens.append(Identifier(current, fi))
-        elif token_type is _InterTokenType.NumberLiteral:
-            tokens.append(NumberLiteral(current, fi))
-            number_type = _NumberLiteralType.Number
-        elif token_type is _InterTokenType.Punctuation:
-            if current not in _Punctuation:
-                raise LexerError("Invalid Punctuation", fi)
-            tokens.append(Punctuation(current, fi))
-        token_type = _InterTokenType.Generic
-
-    return tokens
+                if value in _Keywords: yield Keyword(value, fi)
+                else: yield Identifier(value, fi)
+            elif kind == 'Punctuation':
+                yield Punctuation(value, fi)
+            elif kind == 'NumberLiteral':
+                yield NumberLiteral(value, fi)
+            elif kind == 'CharLiteral':
+                if (value[1] != '\\' and len(value) > 3) or len(value) > 4:
+                    raise LexerError("Character Literal Too Long", fi)
+                yield CharLiteral(value, fi)
+            elif kind == 'StringLiteral':
+                yield StringLiteral(value, fi)
+            elif kind == 'Directive':
+                yield Directive(value, fi)
+            else: raise LexerError("Unexpected Newline", fi)
@@ -9,12 +9,14 @@ from .lexer import lexer
 from .syntactical_analyzer import syntactical_analyzer
 from .semantical_analyzer import semantical_analyzer
 from .code_generator import code_generator
-from ..assembler import Program
+from .optimizer import optimizer
+from ..assembler import Program, listing, strip
 
 def _compile(args: argparse.Namespace):
-    tokens = lexer(args.input_file.read(), args.input_file.name)
+    tokens = lexer(args.input_file, args.input_file.name)
 
     if args.token_file:
+        tokens = list(tokens)
         for token in tokens:
             args.token_file.write(str(token) + "\n")
 
@@ -28,13 +30,17 @@ def _compile(args: argparse.Namespace):
     if args.annotated_file:
         args.annotated_file.write(annotated_syntax_tree.tree_str())
 
-    assembly_code = code_generator(annotated_syntax_tree)
+    code = code_generator(annotated_syntax_tree)
+    if not args.no_strip:
+        code = strip(code)
+    if not args.no_optimize:
+        code = optimizer(code)
 
     if args.assembly_file:
-        args.assembly_file.write(assembly_code)
+        args.assembly_file.write(listing(code))
 
     if args.output_file:
-        machine_code = Program(assembly_code)
+        machine_code = Program(code)
         args.output_file.write(bytes(machine_code))
 
 def compile(args: argparse.Namespace):
@@ -59,6 +65,8 @@ def parser(parser: argparse.ArgumentParser):
         '-n', '--annotated_file', type=argparse.FileType('w', encoding='utf-8'))
     parser.add_argument(
         '-a', '--assembly_file', type=argparse.FileType('w', encoding='utf-8'))
+    parser.add_argument('--no_optimize', action='store_true')
+    parser.add_argument('--no_strip', action='store_true')
     parser.set_defaults(func=compile)
 
 def main(argv: Sequence[str] | None = None):
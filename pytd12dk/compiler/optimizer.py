@@ -0,0 +1,304 @@
+# Kyler Olsen
+# Oct 2026
+
+from itertools import count
+
+from .code_generator import Code, RAM
+from ..assembler.assembler import (
+    Instruction,
+    Directive,
+    MemoryLocation,
+    Label,
+    Immediate,
+    Comment,
+)
+from ..superoptimizer.rules import peephole_rules
+
+type Value = tuple[str, int | str]
+
+ZR = 0
+PC = 1
+SP = 2
+MP = 3
+FLAGS = 8
+
+MAX_INT = 0x1000
+WINDOW = 3
+
+ZERO: Value = ('const', 0)
+HLT = Instruction(0, 0, 0, 1)
+BRANCHES = tuple(Instruction(0, 0, 0, ll) for ll in range(2, 6))
+PSH_PC = Instruction(0, 0, 7, PC)
+
+_unknown = count()
+
+
+def _fresh() -> Value:
+    return ('?', next(_unknown))
+
+def _compute(bb: int, x: int, y: int) -> int:
+    if bb == 1: return x & y
+    elif bb == 2: return x | y
+    elif bb == 3: return x - y
+    elif bb == 4: return x ^ y
+    elif bb == 5: return ~(x | y)
+    elif bb == 6: return ~(x & y)
+    else: return x + y
+
+def _alu(bb: int, a: Value, b: Value) -> Value:
+    if a[0] == b[0] == 'const':
+        return ('const', _compute(bb, a[1], b[1]) % MAX_INT) # type: ignore
+    elif bb in (1, 2) and a == b: return a
+    elif bb == 1 and ZERO in (a, b): return ZERO
+    elif bb in (2, 4, 7) and a == ZERO: return b
+    elif bb in (2, 3, 4, 7) and b == ZERO: return a
+    elif bb in (3, 4) and a == b: return ZERO
+    elif bb == 3 and a[0] == 'sp' and b[0] == 'const':
+        return ('sp', (a[1] - b[1]) % MAX_INT) # type: ignore
+    elif bb == 3 and a[0] == b[0] == 'sp':
+        return ('const', (a[1] - b[1]) % MAX_INT) # type: ignore
+    elif bb == 7 and {a[0], b[0]} == {'sp', 'const'}:
+        return ('sp', (a[1] + b[1]) % MAX_INT) # type: ignore
+    else: return _fresh()
+
+def _shift(bl: int, a: Value) -> Value:
+    if a[0] == 'const':
+        x: int = a[1] # type: ignore
+        result = {4: x << 1, 5: x >> 1, 6: x + 1, 7: x - 1}[bl]
+        return ('const', result % MAX_INT)
+    elif a[0] == 'sp' and bl in (6, 7):
+        return ('sp', (a[1] + (1 if bl == 6 else -1)) % MAX_INT) # type: ignore
+    else: return _fresh()
+
+def _ram(address: Value) -> bool:
+    return address[0] == 'sp' or (
+        address[0] == 'const' and address[1] >= RAM[0]) # type: ignore
+
+def _alias(a: Value, b: Value) -> bool:
+    return a == b or a[0] != b[0] or a[0] not in ('const', 'sp')
+
+def _effects(item: Instruction | Directive) -> tuple[set[int], set[int]]:
+    if isinstance(item, Immediate): return set(), {MP}
+    elif not isinstance(item, Instruction): return set(), set()
+    bb, bl, lb, ll = item
+    if bb: return {bl, lb}, {ll, FLAGS}
+    elif bl >= 4: return {lb}, {ll, FLAGS}
+    elif bl == 3: return {MP}, {MP}
+    elif bl: return set(), {MP}
+    elif lb in (2, 3): return set(range(FLAGS + 1)), {ll}
+    elif lb == 4: return {MP}, {ll}
+    elif lb == 5: return {MP, ll}, set()
+    elif lb == 6: return {SP}, {ll}
+    elif lb == 7: return {SP, ll}, set()
+    elif 2 <= ll <= 5: return {MP, FLAGS}, set()
+    else: return set(), set()
+
+def _jumps(item: Instruction | Directive) -> bool:
+    return PC in _effects(item)[1]
+
+def _live(code: Code, index: int, register: int) -> bool:
+    for item in code[index:]:
+        if isinstance(item, (Label, Comment)): continue
+        elif isinstance(item, MemoryLocation): return True
+        reads, writes = _effects(item)
+        if register in reads: return True
+        elif item == HLT: return False
+        elif register in writes: return False
+        elif PC in writes or item in BRANCHES: return True
+    return True
+
+
+class _State:
+
+    registers: dict[int, Value]
+    memory: dict[Value, Value]
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.registers = {
+            register: _fresh() for register in range(MP, FLAGS)}
+        self.registers[SP] = ('sp', 0)
+        self.memory = {}
+
+    def copy(self) -> "_State":
+        state = _State.__new__(_State)
+        state.registers = self.registers.copy()
+        state.memory = self.memory.copy()
+        return state
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _State) and (
+            self.registers == other.registers and
+            self.memory == other.memory
+        )
+
+    def get(self, register: int) -> Value:
+        if register == ZR: return ZERO
+        elif register == PC: return _fresh()
+        else: return self.registers[register]
+
+    def set(self, register: int, value: Value):
+        if register not in (ZR, PC): self.registers[register] = value
+
+    def load(self, address: Value) -> tuple[Value, bool]:
+        if not _ram(address): return _fresh(), False
+        elif address not in self.memory: self.memory[address] = _fresh()
+        return self.memory[address], True
+
+    def store(self, address: Value, value: Value) -> bool:
+        # Only a store that rewrites a known value and forgets nothing is a
+        # no-op; anything else must end a redundant window.
+        unchanged = _ram(address) and self.memory.get(address) == value
+        forgotten = {
+            key for key in self.memory
+            if key != address and _alias(key, address)
+        }
+        for key in forgotten: del self.memory[key]
+        if not _ram(address): return False
+        self.memory[address] = value
+        return unchanged and not forgotten
+
+    def step(self, item: Instruction | Directive) -> bool:
+        if isinstance(item, Immediate):
+            self.registers[MP] = ('label', item.value)
+            return True
+        elif not isinstance(item, Instruction): return True
+
+        bb, bl, lb, ll = item
+        if bb:
+            if ll == PC: return False
+            self.set(ll, _alu(bb, self.get(lb), self.get(bl)))
+        elif bl >= 4:
+            if ll == PC: return False
+            self.set(ll, _shift(bl, self.get(lb)))
+        elif bl == 1: self.registers[MP] = ('const', ((lb << 3) | ll) << 6)
+        elif bl == 2: self.registers[MP] = ('const', (lb << 3) | ll)
+        elif bl == 3:
+            mp = self.registers[MP]
+            if mp[0] == 'const':
+                self.registers[MP] = (
+                    'const', mp[1] | (lb << 3) | ll) # type: ignore
+            else: self.registers[MP] = _fresh()
+        elif lb in (4, 6):
+            if ll == PC: return False
+            address = self.get(MP) if lb == 4 else self.get(SP)
+            value, pure = self.load(address)
+            self.set(ll, value)
+            return pure
+        elif lb in (5, 7):
+            address = self.get(MP) if lb == 5 else self.get(SP)
+            return self.store(address, self.get(ll))
+        elif lb in (2, 3):
+            self.set(ll, _fresh())
+            return False
+        elif ll != 0: return False
+        return True
+
+
+def _window(code: Code, index: int, size: int = WINDOW) -> list[int]:
+    window: list[int] = []
+    while index < len(code) and len(window) < size:
+        item = code[index]
+        if isinstance(item, (Label, MemoryLocation)): break
+        elif not isinstance(item, Comment): window.append(index)
+        index += 1
+    return window
+
+def _redundant(code: Code, index: int, state: _State) -> list[int]:
+    window = _window(code, index)
+    after = state.copy()
+    for size, position in enumerate(window, 1):
+        if not after.step(code[position]): break
+        if after == state and not (
+            any(FLAGS in _effects(code[i])[1] for i in window[:size]) and
+            _live(code, position + 1, FLAGS)
+        ):
+            return window[:size]
+    return []
+
+def _dead(code: Code, index: int, state: _State) -> bool:
+    item = code[index]
+    if not isinstance(item, (Instruction, Immediate)): return False
+    writes = _effects(item)[1] - {ZR}
+    if not writes or PC in writes: return False
+    elif not state.copy().step(item): return False
+    return not any(_live(code, index + 1, register) for register in writes)
+
+def _jump_to_next(code: Code, index: int, state: _State, last: int) -> bool:
+    item = code[index]
+    if not (
+        isinstance(item, Instruction) and
+        item.ll == PC and
+        item.bb in (2, 4, 7) and
+        {item.bl, item.lb} == {MP, ZR} and
+        state.get(MP)[0] == 'label' and
+        (last < 0 or code[last] != PSH_PC)
+    ): return False
+
+    target = state.get(MP)[1]
+    for following in code[index + 1:]:
+        if isinstance(following, Label) and following.value == target:
+            return not _live(code, index + 1, FLAGS)
+        elif not isinstance(following, (Label, Comment)): return False
+    return False
+
+def _rewrite(code: Code, index: int) -> tuple[list[int], Code]:
+    for rule in peephole_rules():
+        window = _window(code, index, len(rule.pattern or []))
+        items = [code[i] for i in window]
+        if not all(isinstance(item, Instruction) for item in items): continue
+        registers = rule.match(items) # type: ignore
+        if registers is None: continue
+        end = window[-1] + 1
+        if rule.clobbers_mp and _live(code, end, MP): continue
+        elif not rule.flags and _live(code, end, FLAGS): continue
+        return window, list(rule.instructions(**registers))
+    return [], []
+
+def _pass(code: Code) -> tuple[Code, bool]:
+    output: Code = []
+    dropped: set[int] = set()
+    state = _State()
+    last = -1
+    for index, item in enumerate(code):
+        if index in dropped: continue
+        elif isinstance(item, Comment):
+            output.append(item)
+            continue
+        elif isinstance(item, (Label, MemoryLocation)):
+            output.append(item)
+            state.reset()
+            last = -1
+            continue
+
+        redundant = _redundant(code, index, state)
+        if redundant:
+            dropped.update(redundant)
+            continue
+        window, replacement = _rewrite(code, index)
+        if window:
+            dropped.update(window)
+            output += replacement
+            for item in replacement: state.step(item)
+            last = window[-1]
+            continue
+        elif (
+            _dead(code, index, state) or
+            _jump_to_next(code, index, state, last)
+        ):
+            dropped.add(index)
+            continue
+
+        output.append(item)
+        state.step(item)
+        if _jumps(item): state.reset()
+        last = index
+    return output, bool(dropped)
+
+def optimizer(code: Code) -> Code:
+    changed = True
+    while changed:
+        code, changed = _pass(code)
+    return code
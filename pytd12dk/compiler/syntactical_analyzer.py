@@ -1,8 +1,9 @@
 # Kyler Olsen
 # Feb 2024
 
+from collections import deque
 from enum import Enum
-from typing import Sequence
+from typing import Iterable, Iterator, Sequence
 
 from .compiler_types import CompilerError, FileInfo
 from . import lexer
@@ -33,6 +34,8 @@ type DataType = BuiltInDataType | Identifier
 
 type Operator = UnaryOperator | BinaryOperator | TernaryOperator
 
+type Tokens = list[lexer.Token] | TokenStream
+
 
 class SyntaxError(CompilerError):
 
@@ -155,6 +158,42 @@ class UnexpectedPunctuation(_UnexpectedTokenBase):
 class ExpressionError(Exception): pass
 
 
+class TokenStream:
+
+    _tokens: Iterator[lexer.Token]
+    _buffer: deque[lexer.Token]
+    _last: lexer.Token | None
+
+    def __init__(self, tokens: Iterable[lexer.Token]):
+        self._tokens = iter(tokens)
+        self._buffer = deque()
+        self._last = None
+
+    def __bool__(self) -> bool: return self._fill(1)
+
+    def __getitem__(self, index: int) -> lexer.Token:
+        if index < 0 or not self._fill(index + 1):
+            raise IndexError("token stream index out of range")
+        return self._buffer[index]
+
+    @property
+    def last(self) -> lexer.Token | None: return self._last
+
+    def pop(self, index: int = 0) -> lexer.Token:
+        if index != 0:
+            raise IndexError("token stream can only pop the next token")
+        elif not self._fill(1): raise IndexError("pop from empty token stream")
+        self._last = self._buffer.popleft()
+        return self._last
+
+    def _fill(self, size: int) -> bool:
+        while len(self._buffer) < size:
+            token = next(self._tokens, None)
+            if token is None: return False
+            self._buffer.append(token)
+        return True
+
+
 class BuiltInConstEnum(Enum):
     ConstTrue = "True"
     ConstFalse = "False"
@@ -795,7 +834,7 @@ class LetStatement:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token], token: lexer.Token) -> "LetStatement":
+    def _sa(tokens: TokenStream, token: lexer.Token) -> "LetStatement":
         start_fi: FileInfo = token.file_info
         static = token.value == 'static'
         if static:
@@ -858,7 +897,7 @@ class ElseBlock:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token]) -> "ElseBlock | None":
+    def _sa(tokens: TokenStream) -> "ElseBlock | None":
         if tokens and tokens[0].value == 'else':
             else_token = tokens.pop(0)
             if tokens[0].value == '{':
@@ -993,7 +1032,7 @@ class ForBlock:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token], stoken: lexer.Token) -> "ForBlock":
+    def _sa(tokens: TokenStream, stoken: lexer.Token) -> "ForBlock":
         _, three_expressions, closing_parentheses = _get_nested_group(tokens)
         pre_loop_tokens, semicolon = _get_to_symbol(three_expressions)
         if (
@@ -1106,7 +1145,7 @@ class WhileBlock:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token], token: lexer.Token) -> "WhileBlock":
+    def _sa(tokens: TokenStream, token: lexer.Token) -> "WhileBlock":
         _, condition_tokens, closing_parentheses = _get_nested_group(tokens)
         if not condition_tokens:
             fi = closing_parentheses.file_info
@@ -1199,7 +1238,7 @@ class DoBlock:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token], stoken: lexer.Token) -> "DoBlock":
+    def _sa(tokens: TokenStream, stoken: lexer.Token) -> "DoBlock":
         if tokens[0].value == '{':
             code1_tokens = _get_nested_group(tokens, ('{','}'))[1]
             code1 = _code_block_sa(code1_tokens)
@@ -1287,7 +1326,7 @@ class IfBlock:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token], token: lexer.Token) -> "IfBlock":
+    def _sa(tokens: TokenStream, token: lexer.Token) -> "IfBlock":
         _, condition_tokens, closing_parentheses = _get_nested_group(tokens)
         if not condition_tokens:
             fi = closing_parentheses.file_info
@@ -1414,7 +1453,7 @@ class FunctionBlock:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token], stoken: lexer.Token) -> "FunctionBlock":
+    def _sa(tokens: TokenStream, stoken: lexer.Token) -> "FunctionBlock":
         identifier = tokens.pop(0)
         _assert_token(ExpectedIdentifier, identifier)
         token = tokens.pop(0)
@@ -1532,7 +1571,7 @@ class EnumBlock:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token], stoken: lexer.Token) -> "EnumBlock":
+    def _sa(tokens: TokenStream, stoken: lexer.Token) -> "EnumBlock":
         identifier = tokens.pop(0)
         _assert_token(ExpectedIdentifier, identifier)
         token = tokens.pop(0)
@@ -1642,7 +1681,7 @@ class StructBlock:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token], stoken: lexer.Token) -> "StructBlock":
+    def _sa(tokens: TokenStream, stoken: lexer.Token) -> "StructBlock":
         identifier = tokens.pop(0)
         _assert_token(ExpectedIdentifier, identifier)
         token = tokens.pop(0)
@@ -1751,9 +1790,9 @@ class File:
         return s
 
     @staticmethod
-    def _sa(tokens: list[lexer.Token]) -> "File":
+    def _sa(tokens: TokenStream) -> "File":
         children: list[Directive | StructBlock | FunctionBlock | EnumBlock] = []
-        file_fi: FileInfo = tokens[0].file_info + tokens[-1].file_info
+        first_token = tokens[0]
 
         while tokens:
             token = tokens.pop(0)
@@ -1773,7 +1812,8 @@ class File:
             else:
                 raise UnexpectedToken(token, "directive' or 'keyword")
 
-        return File(children, file_fi)
+        assert tokens.last is not None
+        return File(children, first_token.file_info + tokens.last.file_info)
 
 
 def _assert_token(
@@ -1875,47 +1915,37 @@ def _value_map(literal: (
         return StringLiteral(literal.value, literal.file_info)
 
 def _get_nested_group(
-    tokens: list[lexer.Token],
+    tokens: Tokens,
     encloses: tuple[str, str] = ('(',')'),
 ) -> tuple[lexer.Token, list[lexer.Token], lexer.Token]:
     first_token = tokens.pop(0)
     _assert_token(ExpectedPunctuation, first_token, encloses[0])
     nested = 1
-    expr_len = -1
-    for i in range(len(tokens)):
-        if tokens[i].value == encloses[0]: nested += 1
-        elif tokens[i].value == encloses[1]: nested -= 1
-        if nested == 0:
-            expr_len = i
-            break
-    else:
-        raise UnexpectedEndOfTokenStream(
-            f"Expected '{encloses[1]}' but found '{tokens[-1].value}'.",
-            tokens[-1].file_info,
-        )
-    expr_tokens = tokens[:expr_len]
-    last_token = tokens[expr_len]
-    del tokens[:expr_len+1]
-    return first_token, expr_tokens, last_token
+    expr_tokens: list[lexer.Token] = []
+    while tokens:
+        token = tokens.pop(0)
+        if token.value == encloses[0]: nested += 1
+        elif token.value == encloses[1]: nested -= 1
+        if nested == 0: return first_token, expr_tokens, token
+        expr_tokens.append(token)
+    raise UnexpectedEndOfTokenStream(
+        f"Expected '{encloses[1]}' but found '{expr_tokens[-1].value}'.",
+        expr_tokens[-1].file_info,
+    )
 
 def _get_to_symbol(
-    tokens: list[lexer.Token],
+    tokens: Tokens,
     symbols: str | Sequence[str] = ';',
 ) -> tuple[list[lexer.Token], lexer.Token]:
-    expr_len = -1
-    for i in range(len(tokens)):
-        if tokens[i].value in symbols:
-            expr_len = i
-            break
-    else:
-        raise UnexpectedEndOfTokenStream(
-            "Unexpected End of Token Stream.", tokens[-1].file_info)
-    expr_tokens = tokens[:expr_len]
-    last_token = tokens[expr_len]
-    del tokens[:expr_len+1]
-    return expr_tokens, last_token
-
-def _data_type_sa(tokens: list[lexer.Token]) -> tuple[bool, DataType]:
+    expr_tokens: list[lexer.Token] = []
+    while tokens:
+        token = tokens.pop(0)
+        if token.value in symbols: return expr_tokens, token
+        expr_tokens.append(token)
+    raise UnexpectedEndOfTokenStream(
+        "Unexpected End of Token Stream.", expr_tokens[-1].file_info)
+
+def _data_type_sa(tokens: Tokens) -> tuple[bool, DataType]:
     token = tokens.pop(0)
     _assert_token_mult(token, (
         lexer.Keyword,
@@ -1942,8 +1972,9 @@ def _data_type_sa(tokens: list[lexer.Token]) -> tuple[bool, DataType]:
 
 def _code_block_sa(tokens: list[lexer.Token]) -> list[Statement]:
     code: list[Statement] = []
-    while tokens:
-        code.append(_statement_sa(tokens))
+    stream = TokenStream(tokens)
+    while stream:
+        code.append(_statement_sa(stream))
     return code
 
 def _expression_sa(tokens: list[lexer.Token]) -> Expression:
@@ -2103,7 +2134,7 @@ def _expression_sa(tokens: list[lexer.Token]) -> Expression:
     else: raise SyntaxError(
             "Expression Error", tokens[max_operator].file_info)
 
-def _statement_sa(tokens: list[lexer.Token]) -> Statement:
+def _statement_sa(tokens: TokenStream) -> Statement:
     token = tokens.pop(0)
     if isinstance(token, lexer.Keyword):
         match token.value:
@@ -2139,5 +2170,5 @@ def _statement_sa(tokens: list[lexer.Token]) -> Statement:
     expr_tokens: list[lexer.Token] = [token] + _get_to_symbol(tokens)[0]
     return _expression_sa(expr_tokens)
 
-def syntactical_analyzer(tokens: Sequence[lexer.Token]) -> File:
-    return File._sa(list(tokens))
+def syntactical_analyzer(tokens: Iterable[lexer.Token]) -> File:
+    return File._sa(TokenStream(tokens))
@@ -0,0 +1,12 @@
+# Kyler Olsen
+# Oct 2026
+
+from .disassembler import disassemble, disassemble_word, read_labels
+from .timing import TimingAnalysis
+
+__all__ = [
+    'disassemble',
+    'disassemble_word',
+    'read_labels',
+    'TimingAnalysis',
+]
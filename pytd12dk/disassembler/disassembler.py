@@ -0,0 +1,119 @@
+# Kyler Olsen
+# Oct 2026
+
+from typing import TextIO
+
+from ..assembler.assembler import (
+    Instruction,
+    AssemblerError,
+    INSTRUCTIONS_COUNT,
+    MAX_IMMEDIATE,
+)
+
+MAX_INT = 0x1000
+
+LIU = 0x40
+LDI = 0x80
+LIL = 0xC0
+PSH_PC = 0x39
+
+_table: list[str] | None = None
+
+
+def table() -> list[str]:
+    global _table
+    if _table is None:
+        _table = [_decode(word) for word in range(MAX_INT)]
+    return _table
+
+def _decode(word: int) -> str:
+    try: return str(Instruction(
+        word >> 9, (word >> 6) & 0x7, (word >> 3) & 0x7, word & 0x7))
+    except AssemblerError: return f".word {hex(word)}"
+
+def _jump(word: int) -> bool:
+    return 2 <= word <= 5 or (word & 0xE00 != 0 and word & 0x7 == 1)
+
+def _jumps(rom: list[int], address: int, size: int) -> bool:
+    if address < size and rom[address] == PSH_PC: address += 1
+    return address < size and _jump(rom[address])
+
+def disassemble_word(word: int) -> str:
+    return table()[word % MAX_INT]
+
+def read_labels(file: TextIO) -> dict[int, list[str]]:
+    labels: dict[int, list[str]] = {}
+    for line in file:
+        if not line.strip(): continue
+        address, _, name = line.partition(',')
+        labels.setdefault(int(address, base=0), []).append(name.strip())
+    return labels
+
+def disassemble(
+    rom: list[int],
+    labels: dict[int, list[str]] | None = None,
+) -> str:
+    mnemonics = table()
+    labels = labels or {}
+    targets = {
+        (address - 1) % MAX_INT: names[0] for address, names in labels.items()}
+    size = min(len(rom), INSTRUCTIONS_COUNT)
+
+    lines = [".0x0"]
+    origin = True
+    address = 0
+    while address < size:
+        word = rom[address]
+
+        if word == 0 and address not in labels:
+            end = address
+            while end < size and rom[end] == 0 and end not in labels:
+                end += 1
+            if end - address > 1:
+                address = end
+                origin = False
+                continue
+
+        if not origin:
+            lines.append(f".{hex(address)}")
+            origin = True
+        for name in labels.get(address, []):
+            lines.append(f"{name}:")
+
+        opcode = word & 0xFC0
+        if (
+            opcode == LIU and
+            address + 1 < size and
+            rom[address + 1] & 0xFC0 == LIL and
+            address + 1 not in labels
+        ):
+            value = ((word & 0x3F) << 6) | (rom[address + 1] & 0x3F)
+            if (
+                value in targets and
+                value >= MAX_IMMEDIATE and
+                _jumps(rom, address + 2, size)
+            ):
+                lines.append(f"    ldi :{targets[value]}")
+            else:
+                lines.append(f"    ; MP = {hex(value)}")
+                lines.append(f"    {mnemonics[word]}")
+                lines.append(f"    {mnemonics[rom[address + 1]]}")
+            address += 2
+            continue
+
+        if (
+            opcode == LDI and
+            word & 0x3F in targets and
+            _jumps(rom, address + 1, size)
+        ):
+            lines.append(f"    ldi :{targets[word & 0x3F]}")
+        else:
+            lines.append(f"    {mnemonics[word]}")
+        address += 1
+
+    for name in labels.get(size, []):
+        if not origin: lines.append(f".{hex(size)}")
+        origin = True
+        lines.append(f"{name}:")
+
+    return "\n".join(lines) + "\n"
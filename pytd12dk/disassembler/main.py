@@ -0,0 +1,72 @@
+# Kyler Olsen
+# Oct 2026
+
+from typing import Sequence
+import argparse
+
+from ..emulator.emulator import Memory
+from ..emulator.rom import RomImage, RomError, is_rom
+from .disassembler import disassemble, read_labels
+from .timing import TimingAnalysis, TimingError, parse_bound, resolve_bounds
+
+def _timing(
+    rom: list[int],
+    labels: dict[int, list[str]] | None,
+    args: argparse.Namespace,
+) -> str:
+    try: bounds = resolve_bounds(args.bound or [], labels)
+    except TimingError as e:
+        print(f"Error:\n\t{e}")
+        exit(1)
+    return TimingAnalysis(rom, labels, bounds).report()
+
+def _symbols(image: RomImage) -> dict[int, list[str]] | None:
+    labels: dict[int, list[str]] = {}
+    for name, address in image.symbols().items():
+        labels.setdefault(address, []).append(name)
+    return labels or None
+
+def disassemble_rom(args: argparse.Namespace):
+    labels = read_labels(args.labels_file) if args.labels_file else None
+    if is_rom(args.rom_file):
+        try:
+            with RomImage.open(args.rom_file) as image:
+                rom = image.words()
+                if labels is None: labels = _symbols(image)
+        except RomError as e:
+            print(f"Error:\n\t{e}")
+            exit(1)
+    else: rom = Memory.load_rom_file(args.rom_file)
+    if args.timing: listing = _timing(rom, labels, args)
+    else: listing = disassemble(rom, labels)
+
+    if args.output_file:
+        args.output_file.write(listing)
+    else:
+        print(listing, end='')
+
+def _arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('rom_file', type=argparse.FileType('rb'))
+    parser.add_argument('-l', '--labels_file', type=argparse.FileType('r'))
+    parser.add_argument('-o', '--output_file', type=argparse.FileType('w'))
+    parser.add_argument('-t', '--timing', action='store_true')
+    parser.add_argument('--bound', type=parse_bound, action='append')
+
+def parser(parser: argparse.ArgumentParser):
+    _arguments(parser)
+    parser.set_defaults(func=disassemble_rom)
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description='ytd 12-bit Computer Disassembler',
+        epilog='https://github.com/KylerOlsen/ytd_12-bit_computer',
+    )
+    _arguments(parser)
+    parser.set_defaults(func=disassemble_rom)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,423 @@
+# Kyler Olsen
+# Oct 2026
+
+from .disassembler import MAX_INT, LIU, LDI, LIL, PSH_PC, INSTRUCTIONS_COUNT
+
+MP = 3
+PC = 1
+
+FALL = 'fall'
+BRANCH = 'branch'
+JUMP = 'jump'
+CALL = 'call'
+RETURN = 'return'
+HALT = 'halt'
+INDIRECT = 'indirect'
+
+
+class TimingError(Exception): pass
+
+
+def _destination(word: int) -> int | None:
+    if word & 0xE00 or 0x100 <= word <= 0x1FF: return word & 0x7
+    elif word & 0xFC0 == 0 and (word >> 3) & 0x7 in (2, 3, 4, 6):
+        return word & 0x7
+    else: return None
+
+def _pointer(word: int, mp: int | None) -> int | None:
+    opcode = word & 0xFC0
+    if opcode == LDI: return word & 0x3F
+    elif opcode == LIU: return (word & 0x3F) << 6
+    elif opcode == LIL:
+        return None if mp is None else mp | (word & 0x3F)
+    elif _destination(word) == MP: return None
+    else: return mp
+
+def _transfer(
+    rom: list[int],
+    address: int,
+    mp: int | None,
+) -> tuple[str, int | None]:
+    word = rom[address]
+    if word == 1: return HALT, None
+    elif 2 <= word <= 5:
+        if mp is None: return INDIRECT, None
+        return BRANCH, (mp + 1) % MAX_INT
+    elif _destination(word) != PC: return FALL, None
+
+    bb = word >> 9
+    operands = {(word >> 6) & 0x7, (word >> 3) & 0x7}
+    if bb in (2, 4, 7) and operands == {MP, 0} and mp is not None:
+        call = address > 0 and rom[address - 1] == PSH_PC
+        return (CALL if call else JUMP), (mp + 1) % MAX_INT
+    elif word & 0xFF8 == 0x180 | (MP << 3):
+        if mp is None: return RETURN, None
+        return JUMP, (mp + 2) % MAX_INT
+    elif word == 0x30 | PC:
+        return RETURN, None
+    return INDIRECT, None
+
+
+class Block:
+
+    _start: int
+    _end: int
+    _kind: str
+    _successors: list[int]
+    _call: int | None
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        kind: str,
+        successors: list[int],
+        call: int | None = None,
+    ):
+        self._start = start
+        self._end = end
+        self._kind = kind
+        self._successors = successors
+        self._call = call
+
+    @property
+    def start(self) -> int: return self._start
+    @property
+    def end(self) -> int: return self._end
+    @property
+    def kind(self) -> str: return self._kind
+    @property
+    def successors(self) -> list[int]: return self._successors
+    @property
+    def call(self) -> int | None: return self._call
+    @property
+    def cycles(self) -> int: return self._end - self._start
+
+
+class Function:
+
+    _entry: int
+    _name: str
+    _blocks: list[int]
+    _loops: dict[int, set[int]]
+    _wcet: int | None
+    _path: list[int]
+    _problems: list[str]
+
+    def __init__(self, entry: int, name: str):
+        self._entry = entry
+        self._name = name
+        self._blocks = []
+        self._loops = {}
+        self._wcet = None
+        self._path = []
+        self._problems = []
+
+    @property
+    def entry(self) -> int: return self._entry
+    @property
+    def name(self) -> str: return self._name
+    @property
+    def blocks(self) -> list[int]: return self._blocks
+    @property
+    def loops(self) -> dict[int, set[int]]: return self._loops
+    @property
+    def wcet(self) -> int | None: return self._wcet
+    @property
+    def path(self) -> list[int]: return self._path
+    @property
+    def problems(self) -> list[str]: return self._problems
+
+
+class TimingAnalysis:
+
+    _rom: list[int]
+    _size: int
+    _names: dict[int, str]
+    _bounds: dict[int, int]
+    _blocks: dict[int, Block]
+    _functions: dict[int, Function]
+
+    def __init__(
+        self,
+        rom: list[int],
+        labels: dict[int, list[str]] | None = None,
+        bounds: dict[int, int] | None = None,
+    ):
+        self._rom = rom
+        self._size = min(len(rom), INSTRUCTIONS_COUNT)
+        self._names = {
+            address: names[0] for address, names in (labels or {}).items()}
+        self._bounds = bounds or {}
+        self._blocks = {}
+        self._functions = {}
+
+        self._build()
+        for function in self._functions.values():
+            self._function(function)
+        for entry in self._functions:
+            self._wcet(entry, [])
+
+    @property
+    def blocks(self) -> dict[int, Block]: return self._blocks
+    @property
+    def functions(self) -> dict[int, Function]: return self._functions
+
+    def name(self, address: int) -> str:
+        if address in self._names:
+            return f"{self._names[address]} ({hex(address)})"
+        return hex(address)
+
+    def _build(self):
+        rom, size = self._rom, self._size
+        transfers: dict[int, tuple[str, int | None]] = {}
+        leaders = {0}
+        entries = [0]
+        work = [0]
+        while work:
+            address = work.pop()
+            mp = None
+            while 0 <= address < size and address not in transfers:
+                kind, target = _transfer(rom, address, mp)
+                transfers[address] = kind, target
+                mp = _pointer(rom[address], mp)
+                if kind == FALL:
+                    address += 1
+                    continue
+                if target is not None and target not in leaders:
+                    leaders.add(target)
+                    work.append(target)
+                if kind == CALL and target not in entries:
+                    entries.append(target) # type: ignore
+                if kind in (BRANCH, CALL):
+                    leaders.add(address + 1)
+                    if kind == CALL:
+                        work.append(address + 1)
+                        break
+                    address += 1
+                    continue
+                break
+
+        for leader in sorted(leaders):
+            if leader not in transfers: continue
+            address = leader
+            while True:
+                kind, target = transfers[address]
+                following = address + 1
+                if kind != FALL: break
+                if following in leaders or following not in transfers: break
+                address = following
+
+            successors: list[int] = []
+            call = None
+            if kind == FALL and following in transfers:
+                successors = [following]
+            elif kind == BRANCH:
+                successors = [following, target] # type: ignore
+            elif kind == JUMP:
+                successors = [target] # type: ignore
+            elif kind == CALL:
+                successors, call = [following], target
+            self._blocks[leader] = Block(
+                leader, following, kind, [
+                    successor for successor in successors
+                    if successor in transfers
+                ], call)
+
+        for entry in entries:
+            name = self._names.get(entry, "reset" if entry == 0 else "")
+            self._functions[entry] = Function(entry, name or hex(entry))
+
+    def _function(self, function: Function):
+        blocks = self._blocks
+        order: list[int] = []
+        back_edges: list[tuple[int, int]] = []
+        state: dict[int, int] = {}
+        stack = [(function.entry, iter(blocks[function.entry].successors))]
+        state[function.entry] = 1
+        while stack:
+            block, successors = stack[-1]
+            for successor in successors:
+                if state.get(successor) == 1:
+                    back_edges.append((block, successor))
+                elif successor not in state:
+                    state[successor] = 1
+                    stack.append(
+                        (successor, iter(blocks[successor].successors)))
+                    break
+            else:
+                state[block] = 2
+                order.append(block)
+                stack.pop()
+        function._blocks = sorted(order)
+
+        predecessors: dict[int, list[int]] = {block: [] for block in order}
+        for block in order:
+            for successor in blocks[block].successors:
+                predecessors[successor].append(block)
+        for latch, header in back_edges:
+            body = function._loops.setdefault(header, {header})
+            work = [latch]
+            while work:
+                block = work.pop()
+                if block in body: continue
+                body.add(block)
+                work += predecessors[block]
+
+        for block in order:
+            kind = blocks[block].kind
+            if kind == INDIRECT:
+                function._problems.append(
+                    f"Unresolved jump at {hex(blocks[block].end - 1)}")
+        for header in function._loops:
+            if header not in self._bounds:
+                function._problems.append(
+                    f"Unbounded loop at {self.name(header)}")
+
+    def _cost(self, block: int, stack: list[int]) -> int | None:
+        cost = self._blocks[block].cycles
+        call = self._blocks[block].call
+        if call is not None:
+            callee = self._wcet(call, stack)
+            if callee is None: return None
+            cost += callee
+        return cost
+
+    def _longest(
+        self,
+        function: Function,
+        start: int,
+        nodes: set[int],
+        ends: set[int] | None,
+        stack: list[int],
+    ) -> tuple[int, list[int]] | None:
+        blocks = self._blocks
+        loops = function.loops
+
+        def header_cost(block: int) -> int | None:
+            cost = self._cost(block, stack)
+            if cost is None: return None
+            if block in loops and block != start:
+                iteration = self._longest(
+                    function, block, loops[block], set(
+                        latch for latch in loops[block]
+                        if block in blocks[latch].successors
+                    ), stack)
+                if iteration is None: return None
+                cost += (self._bounds[block] - 1) * iteration[0]
+            return cost
+
+        def edges(block: int) -> list[int]:
+            return [
+                successor for successor in blocks[block].successors
+                if successor in nodes and not (
+                    successor in loops and block in loops[successor])
+            ]
+
+        order: list[int] = []
+        seen = {start}
+        pending = [(start, iter(edges(start)))]
+        while pending:
+            block, successors = pending[-1]
+            for successor in successors:
+                if successor not in seen:
+                    seen.add(successor)
+                    pending.append((successor, iter(edges(successor))))
+                    break
+            else:
+                order.append(block)
+                pending.pop()
+
+        memo: dict[int, tuple[int, list[int]]] = {}
+        for block in order:
+            best: tuple[int, list[int]] | None = None
+            # A whole function only ends where control leaves it, so a loop
+            # latch, whose one way on is back to its header, is not an end.
+            if block in ends if ends is not None else not any(
+                successor in nodes for successor in blocks[block].successors
+            ): best = (0, [])
+            for successor in edges(block):
+                result = memo.get(successor)
+                if result is not None and (
+                    best is None or result[0] > best[0]
+                ):
+                    best = result
+            if best is None: continue
+            cost = header_cost(block)
+            if cost is None: return None
+            memo[block] = (cost + best[0], [block] + best[1])
+        return memo.get(start)
+
+    def _wcet(self, entry: int, stack: list[int]) -> int | None:
+        function = self._functions[entry]
+        if function._wcet is not None: return function._wcet
+        if entry in stack or function.problems: return None
+        result = self._longest(
+            function, entry, set(function.blocks), None, stack + [entry])
+        if result is None: return None
+        function._wcet, function._path = result
+        return function._wcet
+
+    def report(self) -> str:
+        output = ""
+        for entry, function in self._functions.items():
+            output += f"Function {function.name} ({hex(entry)})\n"
+            for block in function.blocks:
+                b = self._blocks[block]
+                output += (
+                    f"    Block {hex(b.start)}-{hex(b.end - 1)} "
+                    f"{b.cycles:>5} cycles  {b.kind}"
+                )
+                if b.call is not None: output += f" {self.name(b.call)}"
+                if b.successors:
+                    output += " -> " + ", ".join(
+                        hex(successor) for successor in b.successors)
+                output += "\n"
+            for header, body in function.loops.items():
+                bound = self._bounds.get(header)
+                output += (
+                    f"    Loop {self.name(header)} {len(body)} blocks, "
+                    f"bound {bound if bound is not None else 'unknown'}\n"
+                )
+            for problem in function.problems:
+                output += f"    {problem}\n"
+            if function.wcet is None and not function.problems:
+                output += "    Calls a function without a bound\n"
+            if function.wcet is None:
+                output += "    WCET: unbounded\n"
+            else:
+                output += f"    WCET: {function.wcet} cycles\n"
+                output += "    Critical path: " + " -> ".join(
+                    self.name(block) + (
+                        f" x{self._bounds[block]}"
+                        if block in function.loops else ""
+                    )
+                    for block in function.path
+                ) + "\n"
+            output += "\n"
+        return output
+
+
+def parse_bound(s: str) -> tuple[str, int]:
+    location, _, bound = s.rpartition('=')
+    if not location or int(bound, base=0) < 1:
+        raise ValueError(f"Invalid loop bound: {s}")
+    return location, int(bound, base=0)
+
+def resolve_bounds(
+    bounds: list[tuple[str, int]],
+    labels: dict[int, list[str]] | None,
+) -> dict[int, int]:
+    addresses = {
+        name.upper(): address
+        for address, names in (labels or {}).items() for name in names
+    }
+    resolved: dict[int, int] = {}
+    for location, bound in bounds:
+        if location.upper() in addresses:
+            resolved[addresses[location.upper()]] = bound
+        else:
+            try: resolved[int(location, base=0)] = bound
+            except ValueError:
+                raise TimingError(f"Unknown loop label: {location}") from None
+    return resolved
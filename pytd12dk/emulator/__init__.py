@@ -2,8 +2,10 @@
 # Feb 2024
 
 from .emulator import Computer, Memory
+from .rom import RomImage
 
 __all__ = [
     'Computer',
     'Memory',
+    'RomImage',
 ]
@@ -0,0 +1,170 @@
+# Kyler Olsen
+# Oct 2026
+
+from .emulator import Computer, Memory, MAX_INT
+
+REGISTER_NAMES = ("ZR", "PC", "SP", "MP", "D0", "D1", "D2", "D3")
+
+WATCH_READ = 1
+WATCH_WRITE = 2
+
+
+class DebuggerError(Exception): pass
+
+
+class BreakpointSet:
+
+    _bits: bytearray
+
+    def __init__(self):
+        self._bits = bytearray(MAX_INT // 8)
+
+    def __contains__(self, address: int) -> bool:
+        return bool(self._bits[address >> 3] & (1 << (address & 0x7)))
+
+    def __len__(self) -> int:
+        return sum(byte.bit_count() for byte in self._bits)
+
+    def __iter__(self):
+        for address in range(MAX_INT):
+            if address in self:
+                yield address
+
+    def add(self, address: int):
+        address %= MAX_INT
+        self._bits[address >> 3] |= 1 << (address & 0x7)
+
+    def discard(self, address: int):
+        address %= MAX_INT
+        self._bits[address >> 3] &= ~(1 << (address & 0x7)) & 0xFF
+
+
+class _WatchedMemory:
+
+    _mem: Memory
+    _flags: bytearray
+    hits: list[tuple[int, int]]
+
+    def __init__(self, mem: Memory, flags: bytearray):
+        self._mem = mem
+        self._flags = flags
+        self.hits = []
+
+    def __getattr__(self, name: str):
+        return getattr(self._mem, name)
+
+    def __getitem__(self, index: int) -> int:
+        if self._flags[index] & WATCH_READ:
+            self.hits.append((WATCH_READ, index))
+        return self._mem[index]
+
+    def fetch(self, index: int) -> int:
+        return self._mem.fetch(index)
+
+    def __setitem__(self, index: int, value: int):
+        if self._flags[index] & WATCH_WRITE:
+            self.hits.append((WATCH_WRITE, index))
+        self._mem[index] = value
+
+
+class Debugger:
+
+    breakpoints: BreakpointSet
+    _watch_flags: bytearray
+    _watch_count: int
+    _conditions: list[tuple[int, int]]
+    _condition_state: list[bool]
+    _memory: _WatchedMemory | None
+    _resume: bool
+
+    def __init__(self):
+        self.breakpoints = BreakpointSet()
+        self._watch_flags = bytearray(MAX_INT)
+        self._watch_count = 0
+        self._conditions = []
+        self._condition_state = []
+        self._memory = None
+        self._resume = False
+
+    @property
+    def armed(self) -> bool:
+        return bool(
+            len(self.breakpoints) or self._watch_count or self._conditions)
+
+    def add_breakpoint(self, address: int):
+        self.breakpoints.add(address)
+
+    def add_watchpoint(
+        self,
+        start: int,
+        end: int | None = None,
+        *,
+        read: bool = False,
+        write: bool = True,
+    ):
+        if end is None: end = start
+        if not (0 <= start <= end < MAX_INT):
+            raise DebuggerError(
+                f"Invalid watchpoint range: {hex(start)}-{hex(end)}")
+        mode = (WATCH_READ if read else 0) | (WATCH_WRITE if write else 0)
+        for address in range(start, end + 1):
+            self._watch_flags[address] |= mode
+        self._watch_count += 1
+
+    def add_condition(self, register: int, value: int):
+        if not (0 <= register <= 7):
+            raise DebuggerError(f"Invalid register: {register}")
+        self._conditions.append((register, value % MAX_INT))
+        self._condition_state.append(False)
+
+    def attach(self, computer: Computer):
+        if self._watch_count and self._memory is None:
+            self._memory = _WatchedMemory(computer._mem, self._watch_flags)
+            computer._mem = self._memory # type: ignore
+
+    def step(self, computer: Computer, verbose: bool = False) -> str | None:
+        pc = computer.program_counter
+        if not self._resume and pc in self.breakpoints:
+            self._resume = True
+            return f"Breakpoint at {hex(pc)}"
+        self._resume = False
+
+        computer.step(verbose)
+
+        memory = self._memory
+        if memory is not None and memory.hits:
+            mode, address = memory.hits[0]
+            memory.hits.clear()
+            kind = "read" if mode == WATCH_READ else "write"
+            return f"Watchpoint {kind} of {hex(address)} at {hex(pc)}"
+
+        reason = None
+        for i, (register, value) in enumerate(self._conditions):
+            state = computer.get_reg(register) == value
+            if reason is None and state and not self._condition_state[i]:
+                reason = (
+                    f"Condition {REGISTER_NAMES[register]} == {hex(value)} "
+                    f"after {hex(pc)}"
+                )
+            self._condition_state[i] = state
+
+        return reason
+
+
+def parse_address(s: str) -> int:
+    return int(s, base=0)
+
+def parse_range(s: str) -> tuple[int, int]:
+    if ':' in s:
+        start, end = s.split(':', 1)
+        return int(start, base=0), int(end, base=0)
+    else:
+        return int(s, base=0), int(s, base=0)
+
+def parse_condition(s: str) -> tuple[int, int]:
+    register, _, value = s.partition('=')
+    if register.upper() in REGISTER_NAMES:
+        index = REGISTER_NAMES.index(register.upper())
+    else:
+        raise ValueError(f"Invalid register: {register}")
+    return index, int(value, base=0)
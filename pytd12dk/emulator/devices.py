@@ -1,7 +1,15 @@
 # Kyler Olsen
 # Feb 2024
 
-from .emulator import Device
+from array import array
+from collections import OrderedDict
+from mmap import mmap
+from time import monotonic
+from typing import BinaryIO, Callable
+import os
+import sys
+
+from .emulator import Device, ConfigurationError, MAX_INT
 
 
 try:
@@ -11,7 +19,6 @@ try:
         return msvcrt.getch()[0]
 except ImportError:
     # Unix
-    import sys
     import tty, termios
     def getch() -> int:
         fd = sys.stdin.fileno()
@@ -23,21 +30,326 @@ except ImportError:
             termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
 
+def _print(s: str):
+    print(s, end='')
+
+
 class tty(Device):
 
+    output_bytes: int
+    output_limit: int | None
+    read_char: Callable[[], int]
+    write_text: Callable[[str], None]
+
+    def __init__(self, start: int, end: int | None = None):
+        super().__init__(start, end)
+        self.output_bytes = 0
+        self.output_limit = None
+        self.read_char = getch
+        self.write_text = _print
+
     def __getitem__(self, index: int) -> int:
         if index & 0xf == 0xd: return 0
         elif index & 0xf == 0xe: return 0
-        elif index & 0xf == 0xf: return getch()
+        elif index & 0xf == 0xf: return self.read_char()
         else: return 0
 
     def __setitem__(self, index: int, value: int):
         if index & 0xf == 0xd:
             if value & 0x800:
-                print((((value & 0x7FF) ^ 0x7FF) + 1) * -1)
+                self._write(f"{(((value & 0x7FF) ^ 0x7FF) + 1) * -1}\n")
             else:
-                print(value)
+                self._write(f"{value}\n")
         elif index & 0xf == 0xe:
-            print(value)
+            self._write(f"{value}\n")
         elif index & 0xf == 0xf:
-            print(chr(value & 0x7f), end='')
+            self._write(chr(value & 0x7f))
+
+    def _write(self, s: str):
+        self.output_bytes += len(s)
+        if self.output_limit is None or self.output_bytes <= self.output_limit:
+            self.write_text(s)
+
+
+def _ppm(width: int, height: int, rgb: bytes) -> bytes:
+    return f"P6\n{width} {height}\n255\n".encode('ascii') + bytes(rgb)
+
+def _png(width: int, height: int, rgb: bytes) -> bytes:
+    import struct, zlib
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack('>I', len(data)) + tag + data +
+            struct.pack('>I', zlib.crc32(tag + data))
+        )
+
+    stride = width * 3
+    raw = b''.join(
+        b'\x00' + rgb[y * stride:(y + 1) * stride] for y in range(height))
+    return (
+        b'\x89PNG\r\n\x1a\n' +
+        chunk(
+            b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) +
+        chunk(b'IDAT', zlib.compress(raw)) +
+        chunk(b'IEND', b'')
+    )
+
+
+class framebuffer(Device):
+
+    BANK_SIZE = 0x80
+    BANK_REGISTER = 0x80
+    PRESENT_REGISTER = 0x81
+
+    width: int
+    height: int
+    frame_interval: float
+    output: str | None
+    frames: int
+    region: tuple[int, int, int, int] | None
+    rgb: bytearray
+    _pixels: list[int]
+    _bank: int
+    _dirty_rows: bytearray
+    _dirty_cols: bytearray
+    _dirty: bool
+    _last_frame: float
+
+    def __init__(
+        self,
+        start: int = 0x700,
+        width: int = 64,
+        height: int = 48,
+        frame_interval: float = 1 / 30,
+        output: str | None = None,
+    ):
+        end = start + self.PRESENT_REGISTER
+        if not (0x700 <= start and end <= 0x7FF):
+            raise ConfigurationError(
+                f"Framebuffer outside of I/O: {hex(start)}-{hex(end)}")
+        super().__init__(start, end)
+        self.width = width
+        self.height = height
+        self.frame_interval = frame_interval
+        self.output = output
+        self.frames = 0
+        self.region = None
+        self.rgb = bytearray(width * height * 3)
+        self._pixels = [0] * (width * height)
+        self._bank = 0
+        self._dirty_rows = bytearray(height)
+        self._dirty_cols = bytearray(width)
+        self._dirty = False
+        self._last_frame = monotonic()
+
+    @property
+    def banks(self) -> int:
+        return -(-(self.width * self.height) // self.BANK_SIZE)
+
+    def __getitem__(self, index: int) -> int:
+        offset = index - self._start
+        if offset < self.BANK_SIZE:
+            pixel = self._bank * self.BANK_SIZE + offset
+            if pixel < len(self._pixels): return self._pixels[pixel]
+            else: return 0
+        elif offset == self.BANK_REGISTER: return self._bank
+        else: return 0
+
+    def __setitem__(self, index: int, value: int):
+        offset = index - self._start
+        if offset < self.BANK_SIZE:
+            pixel = self._bank * self.BANK_SIZE + offset
+            if pixel < len(self._pixels) and self._pixels[pixel] != value:
+                self._pixels[pixel] = value
+                self._dirty_rows[pixel // self.width] = 1
+                self._dirty_cols[pixel % self.width] = 1
+                self._dirty = True
+                if monotonic() - self._last_frame >= self.frame_interval:
+                    self.present()
+        elif offset == self.BANK_REGISTER: self._bank = value % self.banks
+        elif offset == self.PRESENT_REGISTER: self.present()
+
+    def present(self):
+        self._last_frame = monotonic()
+        if not self._dirty: return
+
+        rows = [y for y in range(self.height) if self._dirty_rows[y]]
+        cols = [x for x in range(self.width) if self._dirty_cols[x]]
+        x0, x1 = cols[0], cols[-1] + 1
+        for y in rows:
+            base = y * self.width
+            for x in range(x0, x1):
+                value = self._pixels[base + x]
+                i = (base + x) * 3
+                self.rgb[i] = ((value >> 8) & 0xf) * 0x11
+                self.rgb[i + 1] = ((value >> 4) & 0xf) * 0x11
+                self.rgb[i + 2] = (value & 0xf) * 0x11
+            self._dirty_rows[y] = 0
+        for x in cols: self._dirty_cols[x] = 0
+        self._dirty = False
+
+        self.region = (x0, rows[0], x1 - x0, rows[-1] + 1 - rows[0])
+        if self.output is not None:
+            if self.output.lower().endswith('.png'):
+                data = _png(self.width, self.height, self.rgb)
+            else:
+                data = _ppm(self.width, self.height, self.rgb)
+            with open(self.output.format(self.frames), 'wb') as file:
+                file.write(data)
+        self.frames += 1
+
+
+class disk(Device):
+
+    SECTOR_SIZE = 0x100
+    SECTOR_BYTES = SECTOR_SIZE * 2
+    SECTOR_REGISTER = 0
+    DATA_REGISTER = 1
+    OFFSET_REGISTER = 2
+    CONTROL_REGISTER = 3
+
+    write_back: bool
+    cache_sectors: int
+    _file: BinaryIO | None
+    _map: mmap | None
+    _sectors: int
+    _sector: int
+    _offset: int
+    _buffer: array
+    _dirty: bool
+    _cache: OrderedDict[int, array]
+
+    def __init__(
+        self,
+        start: int = 0x7F0,
+        path: str | None = None,
+        sectors: int | None = None,
+        write_back: bool = False,
+        cache_sectors: int = 16,
+    ):
+        super().__init__(start, start + self.CONTROL_REGISTER)
+        self.write_back = write_back
+        self.cache_sectors = cache_sectors
+        self._file = None
+        self._map = None
+        self._sectors = 0
+        self._sector = 0
+        self._offset = 0
+        self._buffer = array('H', [0]) * self.SECTOR_SIZE
+        self._dirty = False
+        self._cache = OrderedDict()
+        if path is not None: self.open(path, sectors)
+
+    @property
+    def sectors(self) -> int: return self._sectors
+
+    def open(self, path: str, sectors: int | None = None):
+        self.close()
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        # An existing image is never resized; only a new or empty file is
+        if size:
+            if size % self.SECTOR_BYTES:
+                raise ConfigurationError(
+                    f"Disk image {path} is {size} bytes, not a whole number "
+                    f"of {self.SECTOR_BYTES} byte sectors"
+                )
+            elif sectors is not None and sectors != size // self.SECTOR_BYTES:
+                raise ConfigurationError(
+                    f"Disk image {path} has {size // self.SECTOR_BYTES} "
+                    f"sectors, not {sectors}"
+                )
+            sectors = size // self.SECTOR_BYTES
+        elif sectors is None: sectors = 1
+        if not (0 < sectors < MAX_INT):
+            raise ConfigurationError(
+                f"Invalid disk size: {sectors} sectors, at most {MAX_INT - 1}")
+
+        self._file = open(path, 'r+b' if size else 'w+b')
+        try:
+            if not size: self._file.truncate(sectors * self.SECTOR_BYTES)
+            self._map = mmap(self._file.fileno(), 0)
+        except OSError:
+            self._file.close()
+            self._file = None
+            raise
+        self._sectors = sectors
+        self._sector = 0
+        self._offset = 0
+        self._load(0)
+
+    def close(self):
+        if self._map is None: return
+        self.flush()
+        self._map.close()
+        self._file.close() # type: ignore
+        self._map = None
+        self._file = None
+
+    def flush(self):
+        if self._map is None: return
+        self._store()
+        while self._cache:
+            self._write(*self._cache.popitem(last=False))
+        self._map.flush()
+
+    def _read(self, sector: int) -> array:
+        start = sector * self.SECTOR_BYTES
+        buffer = array('H')
+        buffer.frombytes(
+            self._map[start:start + self.SECTOR_BYTES]) # type: ignore
+        if sys.byteorder == 'big': buffer.byteswap()
+        return buffer
+
+    def _write(self, sector: int, buffer: array):
+        if sys.byteorder == 'big':
+            buffer = array('H', buffer)
+            buffer.byteswap()
+        start = sector * self.SECTOR_BYTES
+        end = start + self.SECTOR_BYTES
+        self._map[start:end] = buffer.tobytes() # type: ignore
+
+    def _load(self, sector: int):
+        if sector in self._cache:
+            self._buffer = self._cache.pop(sector)
+            self._dirty = True
+        else:
+            self._buffer = self._read(sector)
+            self._dirty = False
+        self._sector = sector
+
+    def _store(self):
+        if not self._dirty: return
+        if self.write_back:
+            self._cache[self._sector] = self._buffer
+            if len(self._cache) > self.cache_sectors:
+                self._write(*self._cache.popitem(last=False))
+            self._buffer = array('H', self._buffer)
+        else:
+            self._write(self._sector, self._buffer)
+        self._dirty = False
+
+    def __getitem__(self, index: int) -> int:
+        if self._map is None: return 0
+        register = index - self._start
+        if register == self.SECTOR_REGISTER: return self._sector
+        elif register == self.DATA_REGISTER:
+            value = self._buffer[self._offset]
+            self._offset = (self._offset + 1) % self.SECTOR_SIZE
+            return value
+        elif register == self.OFFSET_REGISTER: return self._offset
+        else: return self._sectors
+
+    def __setitem__(self, index: int, value: int):
+        if self._map is None: return
+        register = index - self._start
+        if register == self.SECTOR_REGISTER:
+            self._store()
+            self._load(value % self._sectors)
+            self._offset = 0
+        elif register == self.DATA_REGISTER:
+            self._buffer[self._offset] = value
+            self._offset = (self._offset + 1) % self.SECTOR_SIZE
+            self._dirty = True
+        elif register == self.OFFSET_REGISTER:
+            self._offset = value % self.SECTOR_SIZE
+        else: self.flush()
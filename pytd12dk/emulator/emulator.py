@@ -1,9 +1,10 @@
 # Kyler Olsen
 # Feb 2024
 
-from typing import BinaryIO
+from typing import BinaryIO, Callable, ClassVar
 
 ROM_SIZE = 0x700
+RAM_SIZE = 0x800
 MAX_INT = 0x1000
 MAX_IMMEDIATE = 0x40
 
@@ -34,23 +35,33 @@ class Memory:
     _rom: list[int]
     _devices: list[Device]
     _ram: list[int]
+    _ram_end: int
 
 
     def __init__(
         self,
         rom: list[int],
         devices: list[Device] | None = None,
+        rom_size: int = ROM_SIZE,
+        ram_size: int = RAM_SIZE,
     ) -> None:
-        self._rom = [0] * ROM_SIZE
-        self._devices = (devices or list())[:]
-        self._ram = [0] * 0x1000
-
-        if len(rom) > ROM_SIZE:
+        if not (0 <= rom_size <= ROM_SIZE):
+            raise ConfigurationError(f"Invalid ROM size: {hex(rom_size)}")
+        if not (0 <= ram_size <= RAM_SIZE):
+            raise ConfigurationError(f"Invalid RAM size: {hex(ram_size)}")
+        if len(rom) > rom_size:
             raise ConfigurationError(
-                f"ROM too long: {hex(len(rom))} > {hex(ROM_SIZE)}")
+                f"ROM too long: {hex(len(rom))} > {hex(rom_size)}")
 
-        for i, data in enumerate(rom):
-            self._rom[i] = data % MAX_INT
+        self._rom = [data % MAX_INT for data in rom]
+        self._rom += [0] * (ROM_SIZE - len(rom))
+        self._devices = (devices or list())[:]
+        self._ram = [0] * RAM_SIZE
+        self._ram_end = 0x800 + ram_size - 1
+
+    @property
+    def devices(self) -> list[Device]:
+        return self._devices[:]
 
     def _get_device(self, index: int) -> Device | None:
         for device in self._devices:
@@ -68,10 +79,12 @@ class Memory:
             else:
                 return 0
         elif 0x800 <= index <= 0xFFF:
-            return self._ram[index - 0x1000]
+            return self._ram[index - 0x800]
         else:
             raise IndexError
 
+    fetch = __getitem__
+
     def __setitem__(self, index: int, value: int):
         if 0 <= index <= 0x6FF:
             pass
@@ -80,16 +93,21 @@ class Memory:
             if device is not None:
                 device[index] = value % MAX_INT
         elif 0x800 <= index <= 0xFFF:
-            self._ram[index - 0x1000] = value % MAX_INT
+            if index <= self._ram_end:
+                self._ram[index - 0x800] = value % MAX_INT
         else:
             raise IndexError
 
     @staticmethod
     def load_rom_file(file: str | BinaryIO) -> list[int]:
+        from .rom import RomImage, is_rom
+        if is_rom(file):
+            with RomImage.open(file) as image: return image.words()
+
         rom: list[int] = []
 
         if isinstance(file, str):
-            with open(file, 'b') as f:
+            with open(file, 'rb') as f:
                 while f:
                     incoming = f.read(3)
                     if len(incoming) == 3:
@@ -156,6 +174,9 @@ class Computer:
         self._d2 = 0
         self._d3 = 0
 
+    @property
+    def memory(self) -> Memory: return self._mem
+
     @property
     def running(self) -> bool: return self._running
     @property
@@ -247,7 +268,7 @@ class Computer:
         self._negative_flag = (value & 0x800) == 1
 
     def step(self, verbose: bool = False):
-        instruction = self._mem[self.program_counter]
+        instruction = self._mem.fetch(self.program_counter)
         if verbose:
             print(
                 f"; {hex(self.program_counter)} : {oct(instruction)} "
@@ -525,3 +546,71 @@ class Computer:
         self.set_reg(REG_D, result)
         self.program_counter += 1
 
+
+
+def _decode(instruction: int) -> tuple[Callable[..., None], tuple[int, ...]]:
+    reg_d = instruction & 0x7
+    reg_a = (instruction & 0x38) >> 3
+    reg_b = (instruction & 0x1C0) >> 6
+
+    if instruction == 0: return Computer.NOP, ()
+    elif instruction == 1: return Computer.HLT, ()
+    elif instruction == 2: return Computer.BNZ, ()
+    elif instruction == 3: return Computer.BNA, ()
+    elif instruction == 4: return Computer.BNP, ()
+    elif instruction == 5: return Computer.BNN, ()
+    elif instruction & 0xFF8 == 0x20: return Computer.LOD, (reg_d,)
+    elif instruction & 0xFF8 == 0x28: return Computer.STR, (reg_d,)
+    elif instruction & 0xFF8 == 0x30: return Computer.POP, (reg_d,)
+    elif instruction & 0xFF8 == 0x38: return Computer.PSH, (reg_d,)
+    elif instruction & 0xFC0 == 0x40:
+        return Computer.LIU, (instruction & 0x3F,)
+    elif instruction & 0xFC0 == 0x80:
+        return Computer.LDI, (instruction & 0x3F,)
+    elif instruction & 0xFC0 == 0xC0:
+        return Computer.LIL, (instruction & 0x3F,)
+    elif instruction & 0xFC0 == 0x100: return Computer.LSH, (reg_d, reg_a)
+    elif instruction & 0xFC0 == 0x140: return Computer.RSH, (reg_d, reg_a)
+    elif instruction & 0xFC0 == 0x180: return Computer.INC, (reg_d, reg_a)
+    elif instruction & 0xFC0 == 0x1C0: return Computer.DEC, (reg_d, reg_a)
+    elif instruction & 0xE00 == 0x200:
+        return Computer.AND, (reg_d, reg_a, reg_b)
+    elif instruction & 0xE00 == 0x400:
+        return Computer.OR, (reg_d, reg_a, reg_b)
+    elif instruction & 0xE00 == 0x600:
+        return Computer.SUB, (reg_d, reg_a, reg_b)
+    elif instruction & 0xE00 == 0x800:
+        return Computer.XOR, (reg_d, reg_a, reg_b)
+    elif instruction & 0xE00 == 0xA00:
+        return Computer.NOR, (reg_d, reg_a, reg_b)
+    elif instruction & 0xE00 == 0xC00:
+        return Computer.NAD, (reg_d, reg_a, reg_b)
+    elif instruction & 0xE00 == 0xE00:
+        return Computer.ADD, (reg_d, reg_a, reg_b)
+    else: return PredecodedComputer._invalid, (instruction,)
+
+
+class PredecodedComputer(Computer):
+
+    _table: ClassVar[
+        list[tuple[Callable[..., None], tuple[int, ...]]] | None] = None
+
+    def __init__(self, mem: Memory):
+        super().__init__(mem)
+        if PredecodedComputer._table is None:
+            PredecodedComputer._table = [
+                _decode(instruction) for instruction in range(MAX_INT)]
+
+    def step(self, verbose: bool = False):
+        if verbose:
+            super().step(verbose)
+        else:
+            function, arguments = self._table[ # type: ignore
+                self._mem.fetch(self._pc)]
+            function(self, *arguments)
+
+    def _invalid(self, instruction: int):
+        raise LookupError(
+            f"Cannot find instruction "
+            f"{hex(self.program_counter)}: {oct(instruction)}"
+        )
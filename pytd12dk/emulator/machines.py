@@ -0,0 +1,199 @@
+# Kyler Olsen
+# Oct 2026
+
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from .emulator import (
+    Computer,
+    PredecodedComputer,
+    Memory,
+    Device,
+    ConfigurationError,
+    ROM_SIZE,
+    RAM_SIZE,
+)
+from .devices import tty, framebuffer, disk
+
+IO = (0x700, 0x7FF)
+
+ENGINES: dict[str, type[Computer]] = {
+    'interpreter': Computer,
+    'predecoded': PredecodedComputer,
+}
+
+PLANNED_ENGINES = ('jit', 'vectorized')
+
+DEVICES: dict[str, type[Device]] = {
+    'tty': tty,
+    'framebuffer': framebuffer,
+    'disk': disk,
+}
+
+_MACHINE_KEYS = ('engine', 'clock', 'rom_size', 'ram_size', 'devices')
+
+
+def _int(value: Any, name: str) -> int:
+    if isinstance(value, bool):
+        raise ConfigurationError(f"Invalid value for {name}: {value}")
+    if isinstance(value, str):
+        try: return int(value, base=0)
+        except ValueError: pass
+    elif isinstance(value, int):
+        return value
+    raise ConfigurationError(f"Invalid value for {name}: {value}")
+
+
+class MachineTemplate:
+
+    __slots__ = (
+        '_name',
+        '_engine',
+        '_clock',
+        '_rom_size',
+        '_ram_size',
+        '_devices',
+    )
+
+    _name: str
+    _engine: type[Computer]
+    _clock: int
+    _rom_size: int
+    _ram_size: int
+    _devices: tuple[Callable[[], Device], ...]
+
+    def __init__(
+        self,
+        name: str,
+        engine: str = 'interpreter',
+        clock: int = 100,
+        rom_size: int = ROM_SIZE,
+        ram_size: int = RAM_SIZE,
+        devices: list[dict[str, Any]] | None = None,
+    ):
+        if engine in PLANNED_ENGINES:
+            raise ConfigurationError(
+                f"Engine not yet implemented in machine {name}: {engine}")
+        if engine not in ENGINES:
+            raise ConfigurationError(
+                f"Unknown engine in machine {name}: {engine}")
+        rom_size = _int(rom_size, 'rom_size')
+        ram_size = _int(ram_size, 'ram_size')
+        if not (0 <= rom_size <= ROM_SIZE):
+            raise ConfigurationError(f"Invalid ROM size: {hex(rom_size)}")
+        if not (0 <= ram_size <= RAM_SIZE):
+            raise ConfigurationError(f"Invalid RAM size: {hex(ram_size)}")
+
+        constructors: list[Callable[[], Device]] = []
+        ranges: list[tuple[int, int, str]] = []
+        for spec in devices or []:
+            spec = dict(spec)
+            kind = spec.pop('type', None)
+            if kind not in DEVICES:
+                raise ConfigurationError(
+                    f"Unknown device in machine {name}: {kind}")
+            for key in ('start', 'end'):
+                if key in spec: spec[key] = _int(spec[key], key)
+            constructor = partial(DEVICES[kind], **spec)
+            try: probe = DEVICES[kind](**{
+                k: v for k, v in spec.items() if k != 'path'})
+            except TypeError as e:
+                raise ConfigurationError(
+                    f"Invalid {kind} device in machine {name}: {e}") from e
+            if not (IO[0] <= probe._start <= probe._end <= IO[1]):
+                raise ConfigurationError(
+                    f"Device {kind} outside of I/O in machine {name}: "
+                    f"{hex(probe._start)}-{hex(probe._end)}"
+                )
+            constructors.append(constructor)
+            ranges.append((probe._start, probe._end, kind))
+
+        ranges.sort()
+        for (_, end, kind_a), (start, _, kind_b) in zip(ranges, ranges[1:]):
+            if start <= end:
+                raise ConfigurationError(
+                    f"Devices {kind_a} and {kind_b} overlap at {hex(start)} "
+                    f"in machine {name}"
+                )
+
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_engine', ENGINES[engine])
+        object.__setattr__(self, '_clock', _int(clock, 'clock'))
+        object.__setattr__(self, '_rom_size', rom_size)
+        object.__setattr__(self, '_ram_size', ram_size)
+        object.__setattr__(self, '_devices', tuple(constructors))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is frozen")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}('{self._name}')"
+
+    def __call__(self, rom: list[int]) -> Computer:
+        return self._engine(Memory(
+            rom,
+            [device() for device in self._devices],
+            self._rom_size,
+            self._ram_size,
+        ))
+
+    @property
+    def name(self) -> str: return self._name
+    @property
+    def engine(self) -> type[Computer]: return self._engine
+    @property
+    def clock(self) -> int: return self._clock
+    @property
+    def rom_size(self) -> int: return self._rom_size
+    @property
+    def ram_size(self) -> int: return self._ram_size
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict[str, Any]) -> "MachineTemplate":
+        for key in data:
+            if key not in _MACHINE_KEYS:
+                raise ConfigurationError(
+                    f"Unknown key in machine {name}: {key}")
+        return cls(name, **data)
+
+    @classmethod
+    def load(cls, path: str) -> "MachineTemplate":
+        file = Path(path)
+        if file.suffix.lower() == '.toml':
+            import tomllib
+            with open(file, 'rb') as f:
+                data = tomllib.load(f)
+        elif file.suffix.lower() == '.json':
+            import json
+            with open(file, 'r') as f:
+                data = json.load(f)
+        else:
+            raise ConfigurationError(f"Unknown machine file type: {path}")
+        return cls.from_dict(file.stem, data)
+
+
+MACHINES = {
+    'tty': MachineTemplate.from_dict('tty', {
+        'devices': [{'type': 'tty', 'start': 0x7FD, 'end': 0x7FF}],
+    }),
+    'fb': MachineTemplate.from_dict('fb', {
+        'devices': [
+            {'type': 'framebuffer', 'start': 0x700},
+            {'type': 'tty', 'start': 0x7FD, 'end': 0x7FF},
+        ],
+    }),
+    'disk': MachineTemplate.from_dict('disk', {
+        'devices': [
+            {'type': 'disk', 'start': 0x7F0},
+            {'type': 'tty', 'start': 0x7FD, 'end': 0x7FF},
+        ],
+    }),
+}
+
+def machine(name: str) -> MachineTemplate:
+    if name in MACHINES: return MACHINES[name]
+    elif Path(name).suffix.lower() in ('.toml', '.json'):
+        return MachineTemplate.load(name)
+    else:
+        raise ConfigurationError(f"Unknown machine: {name}")
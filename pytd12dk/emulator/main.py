@@ -4,48 +4,214 @@
 from typing import Sequence
 import argparse
 
-from .emulator import Computer, Memory
-from .devices import tty
+from .emulator import Computer, Memory, ConfigurationError
+from .rom import RomError
+from .devices import framebuffer, disk
+from .machines import MACHINES, machine
+from .debugger import Debugger, parse_address, parse_range, parse_condition
+from .watchdog import Watchdog, StopReason
 
-MACHINES = {
-    'tty': lambda rom: Computer(Memory(rom, [tty(0x7FD, 0x7FF)]))
-}
+def print_state(computer: Computer):
+    print(
+        f"ZR: {hex(0)} \t"
+        f"PC: {hex(computer.program_counter)} \t"
+        f"SP: {hex(computer.stack_pointer)} \t"
+        f"MP: {hex(computer.pointer)}"
+    )
+    print(
+        f"D0: {hex(computer.data_0)} \t"
+        f"D1: {hex(computer.data_1)} \t"
+        f"D2: {hex(computer.data_2)} \t"
+        f"D3: {hex(computer.data_3)}"
+    )
 
-def emulate(args: argparse.Namespace):
+def _debugger(args: argparse.Namespace) -> Debugger:
+    debugger = Debugger()
+    for address in args.breakpoint or []:
+        debugger.add_breakpoint(address)
+    for start, end in args.watch_read or []:
+        debugger.add_watchpoint(start, end, read=True, write=False)
+    for start, end in args.watch_write or []:
+        debugger.add_watchpoint(start, end, read=False, write=True)
+    for register, value in args.break_reg or []:
+        debugger.add_condition(register, value)
+    return debugger
+
+def _cycle(computer: Computer, args: argparse.Namespace):
+    if args.verbose:
+        print_state(computer)
+    if args.step:
+        command = input(
+            "Press enter to step to next instruction, or c to continue...")
+        if command.strip().lower() == 'c': args.step = False
+
+def _run(
+    computer: Computer,
+    watchdog: Watchdog,
+    args: argparse.Namespace,
+) -> StopReason:
     from time import sleep
 
-    computer = MACHINES[args.machine](Memory.load_rom_file(args.rom_file))
+    delay = args.clock/1000
+    while computer.active:
+        batch = watchdog.batch(bool(delay) or args.step)
+        for cycles in range(batch):
+            if not computer.active: break
+            _cycle(computer, args)
+            computer.step(args.verbose)
+            if not args.step and delay:
+                sleep(delay)
+        else: cycles = batch
+        reason = watchdog.check(cycles, not computer.active)
+        if reason is not None: return reason
+    return StopReason.Halted
+
+def _run_checked(
+    computer: Computer,
+    debugger: Debugger,
+    watchdog: Watchdog,
+    args: argparse.Namespace,
+) -> StopReason:
+    from time import sleep
+
+    debugger.attach(computer)
+    delay = args.clock/1000
+    while computer.active:
+        batch = watchdog.batch(bool(delay) or args.step)
+        for cycles in range(batch):
+            if not computer.active: break
+            _cycle(computer, args)
+            reason = debugger.step(computer, args.verbose)
+            if reason is not None:
+                print(f"\n{reason}")
+                print_state(computer)
+                args.step = True
+            elif not args.step and delay:
+                sleep(delay)
+        else: cycles = batch
+        reason = watchdog.check(cycles, not computer.active)
+        if reason is not None: return reason
+    return StopReason.Halted
+
+def emulate(args: argparse.Namespace):
+    try: template = machine(args.machine)
+    except (ConfigurationError, OSError, ValueError) as e:
+        print(f"Error:\n\t{e}")
+        exit(1)
+    if args.clock is None: args.clock = template.clock
+    try: rom = Memory.load_rom_file(args.rom_file)
+    except RomError as e:
+        print(f"Error:\n\t{e}")
+        exit(1)
+
+    if args.serve:
+        import asyncio
+        from .session import serve
+        try:
+            asyncio.run(serve(
+                template,
+                rom,
+                args.serve,
+                max_cycles=args.max_cycles,
+                max_time=args.max_time,
+                max_output=args.max_output,
+            ))
+        except KeyboardInterrupt:
+            print("Keyboard Interrupt: Server Exiting...")
+        return
+
+    try: computer = template(rom)
+    except (ConfigurationError, OSError) as e:
+        print(f"Error:\n\t{e}")
+        exit(1)
+    debugger = _debugger(args)
+    watchdog = Watchdog(
+        args.max_cycles,
+        args.max_time,
+        args.max_output,
+        computer.memory.devices,
+    )
+
+    framebuffers = [
+        device for device in computer.memory.devices
+        if isinstance(device, framebuffer)
+    ]
+    for device in framebuffers:
+        device.output = args.frame_output
+        device.frame_interval = args.frame_interval
+    disks = [
+        device for device in computer.memory.devices
+        if isinstance(device, disk)
+    ]
+    for device in disks:
+        device.write_back = args.disk_write_back
+        if not args.disk_file: continue
+        try: device.open(args.disk_file)
+        except (ConfigurationError, OSError) as e:
+            print(f"Error:\n\t{e}")
+            exit(1)
 
+    profile = None
+    if args.profile_file or args.profile_json:
+        from .profiler import MemoryProfile
+        profile = MemoryProfile(computer)
+
+    reason = None
     try:
-        while computer.active:
-            if args.verbose:
-                print(
-                    f"ZR: {hex(0)} \t"
-                    f"PC: {hex(computer.program_counter)} \t"
-                    f"SP: {hex(computer.stack_pointer)} \t"
-                    f"MP: {hex(computer.pointer)}"
-                )
-                print(
-                    f"D0: {hex(computer.data_0)} \t"
-                    f"D1: {hex(computer.data_1)} \t"
-                    f"D2: {hex(computer.data_2)} \t"
-                    f"D3: {hex(computer.data_3)}"
-                )
-            if args.step:
-                input("Press enter to step to next instruction...")
-            computer.step(args.verbose)
-            if not args.step:
-                sleep(int(args.clock)/1000)
+        if debugger.armed: reason = _run_checked(
+            computer, debugger, watchdog, args)
+        else: reason = _run(computer, watchdog, args)
     except KeyboardInterrupt:
         print("Keyboard Interrupt: Program Exiting...")
+    finally:
+        for device in framebuffers:
+            device.present()
+        for device in disks:
+            device.close()
+        if profile is not None:
+            if args.profile_file:
+                args.profile_file.write(profile.report())
+            if args.profile_json:
+                import json
+                json.dump(profile.to_dict(), args.profile_json)
 
-def parser(parser: argparse.ArgumentParser):
+    if reason is not None and reason is not StopReason.Halted:
+        print(
+            f"\n{reason.value}: Program Stopped after "
+            f"{watchdog.cycles} cycles ({watchdog.elapsed:.3f} s)"
+        )
+        print_state(computer)
+        exit(reason.exit_code)
+
+def _arguments(parser: argparse.ArgumentParser):
     parser.add_argument('rom_file', type=argparse.FileType('rb'))
     parser.add_argument(
-        '-m', '--machine', choices=MACHINES.keys(), default='tty')
+        '-m', '--machine', default='tty',
+        help=f"{{{','.join(MACHINES)}}} or a .toml or .json file")
     parser.add_argument('-v', '--verbose', action='store_true')
     parser.add_argument('-s', '--step', action='store_true')
-    parser.add_argument('-c', '--clock', default='100')
+    parser.add_argument('-c', '--clock', type=int)
+    parser.add_argument(
+        '-b', '--breakpoint', type=parse_address, action='append')
+    parser.add_argument(
+        '-r', '--watch_read', type=parse_range, action='append')
+    parser.add_argument(
+        '-w', '--watch_write', type=parse_range, action='append')
+    parser.add_argument(
+        '-k', '--break_reg', type=parse_condition, action='append')
+    parser.add_argument('--max_cycles', type=int)
+    parser.add_argument('--max_time', type=float)
+    parser.add_argument('--max_output', type=int)
+    parser.add_argument('-p', '--profile_file', type=argparse.FileType('w'))
+    parser.add_argument('--profile_json', type=argparse.FileType('w'))
+    parser.add_argument('-f', '--frame_output')
+    parser.add_argument('--frame_interval', type=float, default=1/30)
+    parser.add_argument('-d', '--disk_file')
+    parser.add_argument('--disk_write_back', action='store_true')
+    parser.add_argument('--serve')
+
+def parser(parser: argparse.ArgumentParser):
+    _arguments(parser)
     parser.set_defaults(func=emulate)
 
 def main(argv: Sequence[str] | None = None):
@@ -54,12 +220,8 @@ def main(argv: Sequence[str] | None = None):
         description='ytd 12-bit Computer Emulator',
         epilog='https://github.com/KylerOlsen/ytd_12-bit_computer',
     )
-    parser.add_argument('rom_file', type=argparse.FileType('rb'))
-    parser.add_argument(
-        '-m', '--machine', choices=MACHINES.keys(), default='tty')
-    parser.add_argument('-v', '--verbose', action='store_true')
-    parser.add_argument('-s', '--step', action='store_true')
-    parser.add_argument('-c', '--clock', default='100')
+    _arguments(parser)
+    parser.set_defaults(func=emulate)
 
     args = parser.parse_args(argv)
     args.func(args)
@@ -0,0 +1,147 @@
+# Kyler Olsen
+# Oct 2026
+
+from array import array
+from math import log2
+
+from .emulator import Computer, Memory, MAX_INT
+
+ROM = (0x000, 0x6FF)
+IO = (0x700, 0x7FF)
+RAM = (0x800, 0xFFF)
+
+HEATMAP_WIDTH = 0x40
+HEATMAP_SHADES = " .:-=+*#%@"
+
+
+class _ProfiledMemory:
+
+    _mem: Memory
+    _computer: Computer
+    reads: array
+    writes: array
+    fetches: array
+    min_sp: int
+
+    def __init__(self, mem: Memory, computer: Computer):
+        self._mem = mem
+        self._computer = computer
+        self.reads = array('L', [0]) * MAX_INT
+        self.writes = array('L', [0]) * MAX_INT
+        self.fetches = array('L', [0]) * MAX_INT
+        self.min_sp = RAM[1] + 1
+
+    def __getattr__(self, name: str):
+        return getattr(self._mem, name)
+
+    def __getitem__(self, index: int) -> int:
+        self.reads[index] += 1
+        return self._mem[index]
+
+    def __setitem__(self, index: int, value: int):
+        self.writes[index] += 1
+        self._mem[index] = value
+
+    def fetch(self, index: int) -> int:
+        self.fetches[index] += 1
+        sp = self._computer._sp
+        if RAM[0] <= sp < self.min_sp:
+            self.min_sp = sp
+        return self._mem.fetch(index)
+
+
+class MemoryProfile:
+
+    _memory: _ProfiledMemory
+
+    def __init__(self, computer: Computer):
+        self._memory = _ProfiledMemory(computer._mem, computer)
+        computer._mem = self._memory # type: ignore
+
+    @property
+    def reads(self) -> array: return self._memory.reads
+    @property
+    def writes(self) -> array: return self._memory.writes
+    @property
+    def fetches(self) -> array: return self._memory.fetches
+
+    @property
+    def min_sp(self) -> int | None:
+        if self._memory.min_sp > RAM[1]: return None
+        return self._memory.min_sp
+
+    @property
+    def stack_words(self) -> int:
+        min_sp = self.min_sp
+        if min_sp is None: return 0
+        return RAM[1] - min_sp + 1
+
+    def heatmap(self, counts: array, start: int, end: int) -> str:
+        peak = max(counts[start:end + 1], default=0)
+        scale = (len(HEATMAP_SHADES) - 1) / log2(peak + 1) if peak else 0
+        output = ""
+        for row in range(start, end + 1, HEATMAP_WIDTH):
+            output += f"{row:03x} |"
+            for count in counts[row:min(row + HEATMAP_WIDTH, end + 1)]:
+                shade = 0
+                if count: shade = max(round(log2(count + 1) * scale), 1)
+                output += HEATMAP_SHADES[shade]
+            output += "|\n"
+        return output
+
+    def report(self) -> str:
+        reads, writes = self.reads, self.writes
+
+        ram_used = [
+            i for i in range(RAM[0], RAM[1] + 1) if reads[i] or writes[i]]
+        min_sp = self.min_sp
+        below_stack = [
+            i for i in ram_used if min_sp is None or i < min_sp]
+
+        output = "; Memory Profile\n\n"
+        for name, (start, end) in (('ROM', ROM), ('I/O', IO), ('RAM', RAM)):
+            output += (
+                f"{name}: {sum(self.fetches[start:end + 1])} fetches, "
+                f"{sum(reads[start:end + 1])} reads, "
+                f"{sum(writes[start:end + 1])} writes\n"
+            )
+
+        output += "\n; Stack\n"
+        if min_sp is None:
+            output += "Stack pointer never entered RAM\n"
+        else:
+            output += f"Lowest stack pointer: {hex(min_sp)}\n"
+            output += (
+                f"Stack high-water mark: {self.stack_words} words\n")
+
+        output += "\n; RAM\n"
+        output += (
+            f"RAM words accessed: {len(ram_used)}/{RAM[1] - RAM[0] + 1}\n")
+        if below_stack:
+            output += (
+                f"Highest address below the stack: {hex(below_stack[-1])} "
+                f"({below_stack[-1] - RAM[0] + 1} words from {hex(RAM[0])})\n"
+            )
+        else:
+            output += "No RAM accessed below the stack\n"
+
+        for title, counts, (start, end) in (
+            ('ROM Fetches', self.fetches, ROM),
+            ('ROM Reads', reads, ROM),
+            ('I/O Reads', reads, IO),
+            ('I/O Writes', writes, IO),
+            ('RAM Reads', reads, RAM),
+            ('RAM Writes', writes, RAM),
+        ):
+            output += f"\n; {title}\n{self.heatmap(counts, start, end)}"
+
+        return output
+
+    def to_dict(self) -> dict:
+        return {
+            'reads': self.reads.tolist(),
+            'writes': self.writes.tolist(),
+            'fetches': self.fetches.tolist(),
+            'min_sp': self.min_sp,
+            'stack_words': self.stack_words,
+        }
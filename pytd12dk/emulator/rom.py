@@ -0,0 +1,195 @@
+# Kyler Olsen
+# Oct 2026
+
+from hashlib import sha256
+from typing import BinaryIO
+import mmap
+import struct
+
+from .emulator import ROM_SIZE, MAX_INT
+
+ROM_MAGIC = b"YTDR"
+ROM_VERSION = 1
+ROM_SUFFIX = ".rom"
+
+HEADER = struct.Struct(">4sHHHH32s")
+RANGE = struct.Struct(">HHI")
+SYMBOL = struct.Struct(">HB")
+LINE = struct.Struct(">HI")
+
+# A new range costs about as much as this many words of padding
+RANGE_GAP = 5
+
+
+class RomError(Exception): pass
+
+
+def pack_words(words: list[int]) -> bytes:
+    output = bytearray()
+    for i in range(0, len(words) - 1, 2):
+        first, second = words[i] % MAX_INT, words[i + 1] % MAX_INT
+        output += bytes((
+            first >> 4,
+            ((first & 0xf) << 4) | (second >> 8),
+            second & 0xff,
+        ))
+    if len(words) % 2:
+        last = words[-1] % MAX_INT
+        output += bytes((last >> 4, (last & 0xf) << 4))
+    return bytes(output)
+
+def unpack_words(data: bytes | memoryview, count: int) -> list[int]:
+    words: list[int] = []
+    for i in range(0, count // 2 * 3, 3):
+        words.append(data[i] << 4 | data[i + 1] >> 4)
+        words.append((data[i + 1] & 0xf) << 8 | data[i + 2])
+    if count % 2:
+        i = count // 2 * 3
+        words.append(data[i] << 4 | data[i + 1] >> 4)
+    return words
+
+def content_hash(words: list[int]) -> bytes:
+    words = (words + [0] * ROM_SIZE)[:ROM_SIZE]
+    return sha256(pack_words(words)).digest()
+
+def used_ranges(words: list[int]) -> list[tuple[int, int]]:
+    ranges: list[tuple[int, int]] = []
+    for address, word in enumerate(words[:ROM_SIZE]):
+        if not word: continue
+        if ranges and address - ranges[-1][1] <= RANGE_GAP:
+            ranges[-1] = (ranges[-1][0], address + 1)
+        else: ranges.append((address, address + 1))
+    return ranges
+
+def pack(
+    words: list[int],
+    labels: dict[str, int] | None = None,
+    lines: list[int] | None = None,
+) -> bytes:
+    ranges = used_ranges(words)
+    symbols = b""
+    for name, address in (labels or {}).items():
+        encoded = name.encode('utf-8')
+        if len(encoded) > 0xFF: raise RomError(f"Label too long: {name}")
+        symbols += SYMBOL.pack(address % MAX_INT, len(encoded)) + encoded
+    debug = [
+        (address, lines[address])
+        for start, end in ranges for address in range(start, end)
+        if lines and address < len(lines) and lines[address]
+    ]
+
+    offset = (
+        HEADER.size + RANGE.size * len(ranges) + len(symbols) +
+        LINE.size * len(debug)
+    )
+    table = b""
+    image = b""
+    for start, end in ranges:
+        table += RANGE.pack(start, end - start, offset + len(image))
+        image += pack_words(words[start:end])
+
+    return (
+        HEADER.pack(
+            ROM_MAGIC,
+            ROM_VERSION,
+            len(ranges),
+            len(labels or {}),
+            len(debug),
+            content_hash(words),
+        ) +
+        table +
+        symbols +
+        b"".join(LINE.pack(address, line) for address, line in debug) +
+        image
+    )
+
+def is_rom(file: str | BinaryIO) -> bool:
+    if isinstance(file, str):
+        with open(file, 'rb') as f: return f.read(len(ROM_MAGIC)) == ROM_MAGIC
+    peek = getattr(file, 'peek', None)
+    if peek is None: return False
+    return peek(len(ROM_MAGIC))[:len(ROM_MAGIC)] == ROM_MAGIC
+
+
+class RomImage:
+
+    _data: bytes | mmap.mmap
+    _ranges: list[tuple[int, int, int]]
+    _symbol_count: int
+    _line_count: int
+    _symbols_offset: int
+    _hash: bytes
+
+    def __init__(self, data: bytes | mmap.mmap):
+        if len(data) < HEADER.size:
+            raise RomError("Not a ROM image")
+        magic, version, ranges, symbols, lines, digest = HEADER.unpack_from(
+            data)
+        if magic != ROM_MAGIC: raise RomError("Not a ROM image")
+        elif version != ROM_VERSION:
+            raise RomError(f"Unsupported ROM image version: {version}")
+        self._data = data
+        self._ranges = [
+            RANGE.unpack_from(data, HEADER.size + RANGE.size * index)
+            for index in range(ranges)
+        ]
+        self._symbol_count = symbols
+        self._line_count = lines
+        self._symbols_offset = HEADER.size + RANGE.size * ranges
+        self._hash = digest
+        for start, count, offset in self._ranges:
+            if start + count > ROM_SIZE or offset + (count * 3 + 1) // 2 > len(
+                data
+            ): raise RomError(f"Invalid ROM range: {hex(start)}")
+
+    @classmethod
+    def open(cls, file: str | BinaryIO) -> "RomImage":
+        if isinstance(file, str):
+            with open(file, 'rb') as f: return cls.open(f)
+        try: data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError): data = file.read()
+        return cls(data)
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap): self._data.close()
+
+    def __enter__(self) -> "RomImage": return self
+    def __exit__(self, *_): self.close()
+
+    @property
+    def hash(self) -> str: return self._hash.hex()
+    @property
+    def ranges(self) -> list[tuple[int, int]]:
+        return [(start, start + count) for start, count, _ in self._ranges]
+
+    def words(self) -> list[int]:
+        rom = [0] * ROM_SIZE
+        view = memoryview(self._data)
+        for start, count, offset in self._ranges:
+            rom[start:start + count] = unpack_words(
+                view[offset:offset + (count * 3 + 1) // 2], count)
+        view.release()
+        return rom
+
+    def symbols(self) -> dict[str, int]:
+        symbols: dict[str, int] = {}
+        offset = self._symbols_offset
+        for _ in range(self._symbol_count):
+            address, length = SYMBOL.unpack_from(self._data, offset)
+            offset += SYMBOL.size
+            name = bytes(self._data[offset:offset + length]).decode('utf-8')
+            symbols[name] = address
+            offset += length
+        return symbols
+
+    def lines(self) -> dict[int, int]:
+        offset = self._symbols_offset
+        for _ in range(self._symbol_count):
+            offset += SYMBOL.size + SYMBOL.unpack_from(self._data, offset)[1]
+        return dict(
+            LINE.unpack_from(self._data, offset + LINE.size * index)
+            for index in range(self._line_count)
+        )
+
+    def verify(self) -> bool:
+        return content_hash(self.words()) == self._hash
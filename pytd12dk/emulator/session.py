@@ -0,0 +1,173 @@
+# Kyler Olsen
+# Oct 2026
+
+from typing import Any, TextIO
+import asyncio
+import sys
+
+from .emulator import Computer
+from .devices import tty
+from .machines import MachineTemplate
+from .watchdog import Watchdog, StopReason
+
+
+class InputPending(Exception): pass
+
+
+class Session:
+
+    _computer: Computer
+    _reader: asyncio.StreamReader
+    _writer: asyncio.StreamWriter
+    _watchdog: Watchdog
+    _input: bytearray
+    _eof: bool
+
+    def __init__(
+        self,
+        computer: Computer,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        watchdog: Watchdog | None = None,
+    ):
+        self._computer = computer
+        self._reader = reader
+        self._writer = writer
+        self._input = bytearray()
+        self._eof = False
+
+        devices = computer.memory.devices
+        for device in devices:
+            if isinstance(device, tty):
+                device.read_char = self._read_char
+                device.write_text = self._write_text
+
+        if watchdog is None: watchdog = Watchdog(devices=devices)
+        self._watchdog = watchdog
+
+    @property
+    def computer(self) -> Computer: return self._computer
+    @property
+    def watchdog(self) -> Watchdog: return self._watchdog
+
+    def _read_char(self) -> int:
+        if self._input: return self._input.pop(0)
+        elif self._eof: return 0
+        else: raise InputPending
+
+    def _write_text(self, s: str):
+        if not self._writer.is_closing():
+            self._writer.write(s.encode('utf-8'))
+
+    async def _wait_input(self) -> bool:
+        await self._writer.drain()
+        try:
+            data = await asyncio.wait_for(
+                self._reader.read(0x100), self._watchdog.remaining_time)
+        except TimeoutError:
+            return False
+        if data: self._input += data
+        else: self._eof = True
+        return True
+
+    async def run(self) -> StopReason:
+        try: return await self._run()
+        except ConnectionError: return StopReason.Disconnected
+
+    async def _run(self) -> StopReason:
+        computer = self._computer
+        watchdog = self._watchdog
+        watchdog.start()
+
+        while computer.active:
+            step = computer.step
+            batch = watchdog.batch()
+            cycles = 0
+            waiting = False
+            try:
+                for cycles in range(batch):
+                    if not computer.active: break
+                    step()
+                else: cycles = batch
+            except InputPending:
+                waiting = True
+
+            reason = watchdog.check(cycles, not computer.active)
+            if reason is not None: break
+            if self._writer.is_closing():
+                reason = StopReason.Disconnected
+                break
+            if waiting:
+                if not await self._wait_input():
+                    reason = StopReason.TimeLimit
+                    break
+            else:
+                await self._writer.drain()
+                await asyncio.sleep(0)
+        else:
+            reason = StopReason.Halted
+
+        await self._writer.drain()
+        return reason
+
+
+async def _session(
+    template: MachineTemplate,
+    rom: list[int],
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    limits: dict[str, Any],
+) -> StopReason | None:
+    computer = template(rom)
+    watchdog = Watchdog(devices=computer.memory.devices, **limits)
+    try:
+        return await Session(computer, reader, writer, watchdog).run()
+    except LookupError as e:
+        print(f"Error:\n\t{e}")
+        return None
+
+async def serve(
+    template: MachineTemplate,
+    rom: list[int],
+    path: str,
+    backlog: int = 0x400,
+    **limits: Any,
+):
+    count = 0
+
+    async def handle(
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        nonlocal count
+        count += 1
+        number = count
+        try:
+            reason = await _session(template, rom, reader, writer, limits)
+            if reason is not None:
+                print(f"Session {number}: {reason.value}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(handle, path, backlog=backlog)
+    async with server:
+        await server.serve_forever()
+
+async def run_pipe(
+    template: MachineTemplate,
+    rom: list[int],
+    read_pipe: TextIO = sys.stdin,
+    write_pipe: TextIO = sys.stdout,
+    **limits: Any,
+) -> StopReason | None:
+    loop = asyncio.get_running_loop()
+
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), read_pipe)
+    transport, protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin, write_pipe)
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+
+    try: return await _session(template, rom, reader, writer, limits)
+    finally: writer.close()
@@ -0,0 +1,97 @@
+# Kyler Olsen
+# Oct 2026
+
+from enum import Enum
+from time import monotonic
+
+from .emulator import Device
+
+CHECK_INTERVAL = 0x400
+
+
+class StopReason(Enum):
+    Halted = 'Halted'
+    CycleLimit = 'Cycle Limit'
+    TimeLimit = 'Time Limit'
+    OutputLimit = 'Output Limit'
+    Disconnected = 'Disconnected'
+
+    @property
+    def exit_code(self) -> int:
+        return _EXIT_CODES[self]
+
+
+_EXIT_CODES = {
+    StopReason.Halted: 0,
+    StopReason.CycleLimit: 2,
+    StopReason.TimeLimit: 3,
+    StopReason.OutputLimit: 4,
+    StopReason.Disconnected: 5,
+}
+
+
+class Watchdog:
+
+    _max_cycles: int | None
+    _max_time: float | None
+    _max_output: int | None
+    _devices: list[Device]
+    _interval: int
+    _start: float
+    cycles: int
+
+    def __init__(
+        self,
+        max_cycles: int | None = None,
+        max_time: float | None = None,
+        max_output: int | None = None,
+        devices: list[Device] | None = None,
+        interval: int = CHECK_INTERVAL,
+    ):
+        self._interval = interval
+        self._max_cycles = max_cycles
+        self._max_time = max_time
+        self._max_output = max_output
+        self._devices = [
+            device for device in (devices or [])
+            if hasattr(device, 'output_bytes')
+        ]
+        self._start = monotonic()
+        self.cycles = 0
+
+        if max_output is not None:
+            for device in self._devices:
+                device.output_limit = max_output # type: ignore
+
+    @property
+    def elapsed(self) -> float:
+        return monotonic() - self._start
+
+    @property
+    def remaining_time(self) -> float | None:
+        if self._max_time is None: return None
+        return max(self._max_time - self.elapsed, 0)
+
+    def start(self):
+        self._start = monotonic()
+        self.cycles = 0
+
+    def batch(self, paced: bool = False) -> int:
+        # A clock delay or single stepping makes each cycle slow, so the
+        # limits are checked after every cycle instead of amortised.
+        interval = 1 if paced else self._interval
+        if self._max_cycles is None: return interval
+        return max(min(interval, self._max_cycles - self.cycles), 0)
+
+    def check(self, cycles: int, halted: bool = False) -> StopReason | None:
+        self.cycles += cycles
+        if halted: return None
+        if self._max_cycles is not None and self.cycles >= self._max_cycles:
+            return StopReason.CycleLimit
+        if self._max_time is not None and self.elapsed >= self._max_time:
+            return StopReason.TimeLimit
+        if self._max_output is not None:
+            for device in self._devices:
+                if device.output_bytes > self._max_output: # type: ignore
+                    return StopReason.OutputLimit
+        return None
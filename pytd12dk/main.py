@@ -1,14 +1,40 @@
 # Kyler Olsen
 # Feb 2024
 
+from importlib import import_module
 from typing import Sequence
 import argparse
-
-from .emulator.main import parser as emulator_parser
-from .compiler.main import parser as compiler_parser
-from .assembler.main import parser as assembler_parser
+import sys
+
+COMMANDS = {
+    'em': (
+        '.emulator.main', 'ytd 12-bit Computer Emulator', 'Emulator help'),
+    'cm': (
+        '.compiler.main', 'ytd 12-bit Computer Compiler', 'Compiler help'),
+    'am': (
+        '.assembler.main',
+        'ytd 12-bit Computer Linker and Assembler',
+        'Assembler help',
+    ),
+    'dm': (
+        '.disassembler.main',
+        'ytd 12-bit Computer Disassembler',
+        'Disassembler help',
+    ),
+    'bm': (
+        '.benchmark.main',
+        'ytd 12-bit Computer Emulator Benchmark',
+        'Benchmark help',
+    ),
+    'so': (
+        '.superoptimizer.main',
+        'ytd 12-bit Computer Superoptimizer',
+        'Superoptimizer help',
+    ),
+}
 
 def main(argv: Sequence[str] | None = None):
+    if argv is None: argv = sys.argv[1:]
 
     parser = argparse.ArgumentParser(
         description='ytd 12-bit Development Kit',
@@ -17,29 +43,16 @@ def main(argv: Sequence[str] | None = None):
 
     subparsers = parser.add_subparsers(required=True)
 
-    parser_emulator = subparsers.add_parser(
-        'em',
-        description='ytd 12-bit Computer Emulator',
-        help='Emulator help',
-        epilog='https://github.com/KylerOlsen/ytd_12-bit_computer',
-    )
-    emulator_parser(parser_emulator)
-
-    parser_compiler = subparsers.add_parser(
-        'cm',
-        description='ytd 12-bit Computer Compiler',
-        help='Compiler help',
-        epilog='https://github.com/KylerOlsen/ytd_12-bit_computer',
-    )
-    compiler_parser(parser_compiler)
-
-    parser_assembler = subparsers.add_parser(
-        'am',
-        description='ytd 12-bit Computer Linker and Assembler',
-        help='Assembler help',
-        epilog='https://github.com/KylerOlsen/ytd_12-bit_computer',
-    )
-    assembler_parser(parser_assembler)
+    selected = next((arg for arg in argv if not arg.startswith('-')), None)
+    for command, (module, description, help) in COMMANDS.items():
+        subparser = subparsers.add_parser(
+            command,
+            description=description,
+            help=help,
+            epilog='https://github.com/KylerOlsen/ytd_12-bit_computer',
+        )
+        if command == selected:
+            import_module(module, __package__).parser(subparser)
 
     args = parser.parse_args(argv)
     args.func(args)
@@ -0,0 +1,135 @@
+# Kyler Olsen
+# Oct 2026
+
+from .assembler import Program, listing, strip
+from .assembler.assembler import Instruction, Directive
+from .emulator import Computer
+from .emulator.devices import tty
+from .emulator.machines import MachineTemplate, machine
+from .emulator.watchdog import Watchdog, StopReason
+
+ASSEMBLY_SUFFIXES = ('.s', '.asm')
+
+
+class RunResult:
+
+    _computer: Computer
+    _reason: StopReason
+    _cycles: int
+    _output: str
+
+    def __init__(
+        self,
+        computer: Computer,
+        reason: StopReason,
+        cycles: int,
+        output: str,
+    ):
+        self._computer = computer
+        self._reason = reason
+        self._cycles = cycles
+        self._output = output
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self._reason.value}, "
+            f"{self._cycles} cycles, {len(self._output)} characters)"
+        )
+
+    @property
+    def computer(self) -> Computer: return self._computer
+    @property
+    def reason(self) -> StopReason: return self._reason
+    @property
+    def cycles(self) -> int: return self._cycles
+    @property
+    def output(self) -> str: return self._output
+    @property
+    def halted(self) -> bool: return self._reason is StopReason.Halted
+
+
+def generate(
+    source: str,
+    filename: str = '<source>',
+    optimize: bool = True,
+    stripped: bool = True,
+) -> list[Instruction | Directive]:
+    from .compiler.lexer import lexer
+    from .compiler.syntactical_analyzer import syntactical_analyzer
+    from .compiler.semantical_analyzer import semantical_analyzer
+    from .compiler.code_generator import code_generator
+    from .compiler.optimizer import optimizer
+
+    syntax_tree = syntactical_analyzer(lexer(source, filename))
+    code = code_generator(semantical_analyzer(syntax_tree))
+    if stripped: code = strip(code)
+    return optimizer(code) if optimize else code
+
+def compile(
+    source: str,
+    filename: str = '<source>',
+    optimize: bool = True,
+    stripped: bool = True,
+) -> str:
+    return listing(generate(source, filename, optimize, stripped))
+
+def assemble(source: str | list[Instruction | Directive]) -> list[int]:
+    return Program(source).words()
+
+def build(
+    source: str,
+    filename: str = '<source>',
+    assembly: bool | None = None,
+) -> list[int]:
+    if assembly is None:
+        assembly = filename.lower().endswith(ASSEMBLY_SUFFIXES)
+    if assembly: return assemble(source)
+    else: return assemble(generate(source, filename))
+
+def load(
+    source: str,
+    filename: str = '<source>',
+    template: str | MachineTemplate = 'tty',
+    assembly: bool | None = None,
+) -> Computer:
+    if isinstance(template, str): template = machine(template)
+    return template(build(source, filename, assembly))
+
+def run(
+    source: str | Computer,
+    filename: str = '<source>',
+    template: str | MachineTemplate = 'tty',
+    assembly: bool | None = None,
+    input: str = '',
+    max_cycles: int | None = None,
+    max_time: float | None = None,
+    max_output: int | None = None,
+) -> RunResult:
+    if isinstance(source, Computer): computer = source
+    else: computer = load(source, filename, template, assembly)
+
+    output: list[str] = []
+    pending = [ord(c) for c in reversed(input)]
+    devices = computer.memory.devices
+    for device in devices:
+        if isinstance(device, tty):
+            device.read_char = lambda: pending.pop() if pending else 0
+            device.write_text = output.append
+
+    watchdog = Watchdog(max_cycles, max_time, max_output, devices)
+    watchdog.start()
+    step = computer.step
+    reason = StopReason.Halted
+    while computer.active:
+        batch = watchdog.batch()
+        cycles = 0
+        for cycles in range(batch):
+            if not computer.active: break
+            step()
+        else: cycles = batch
+        stop = watchdog.check(cycles, not computer.active)
+        if stop is not None:
+            reason = stop
+            break
+
+    return RunResult(computer, reason, watchdog.cycles, ''.join(output))
@@ -0,0 +1,17 @@
+# Kyler Olsen
+# Oct 2026
+
+from .rules import Rule, rules, read_rules, write_rules
+from .superoptimizer import Target, search, superoptimize
+from .targets import TARGETS
+
+__all__ = [
+    'Rule',
+    'rules',
+    'read_rules',
+    'write_rules',
+    'Target',
+    'search',
+    'superoptimize',
+    'TARGETS',
+]
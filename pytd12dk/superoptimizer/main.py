@@ -0,0 +1,64 @@
+# Kyler Olsen
+# Oct 2026
+
+from pathlib import Path
+from time import perf_counter
+from typing import Sequence
+import argparse
+
+from .rules import RULES_FILE, RuleError, read_rules, write_rules
+from .superoptimizer import superoptimize
+from .targets import TARGETS, target
+
+def superoptimizer(args: argparse.Namespace):
+    try: targets = [target(name) for name in args.target or []] or TARGETS
+    except KeyError as e:
+        print(f"Error:\n\tUnknown target: {e.args[0]}")
+        exit(1)
+
+    rules = {}
+    if args.output_file and Path(args.output_file).exists():
+        try: rules = read_rules(args.output_file)
+        except (ValueError, KeyError, RuleError) as e:
+            print(f"Error:\n\t{e}")
+            exit(1)
+
+    for item in targets:
+        start = perf_counter()
+        rule = superoptimize(item, args.max_length)
+        elapsed = perf_counter() - start
+        if rule is None:
+            print(f"{item.name:<16} not found {elapsed:>10.2f} s")
+            continue
+        rules[rule.name] = rule
+        print(
+            f"{rule.name:<16} {rule.cycles:>2} cycles {elapsed:>8.2f} s  "
+            f"{'; '.join(rule.code)}"
+        )
+
+    if args.output_file:
+        write_rules(rules.values(), args.output_file)
+
+def _arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('-t', '--target', action='append')
+    parser.add_argument('-l', '--max_length', type=int)
+    parser.add_argument('-o', '--output_file', nargs='?', const=RULES_FILE)
+
+def parser(parser: argparse.ArgumentParser):
+    _arguments(parser)
+    parser.set_defaults(func=superoptimizer)
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description='ytd 12-bit Computer Superoptimizer',
+        epilog='https://github.com/KylerOlsen/ytd_12-bit_computer',
+    )
+    _arguments(parser)
+    parser.set_defaults(func=superoptimizer)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
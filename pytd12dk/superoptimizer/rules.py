@@ -0,0 +1,169 @@
+# Kyler Olsen
+# Oct 2026
+
+from pathlib import Path
+from typing import Any, Iterable
+import json
+
+from ..assembler.assembler import Instruction, encode, REGISTERS
+
+RULES_FORMAT = "ytd12-rules"
+RULES_VERSION = 1
+RULES_FILE = Path(__file__).with_name("rules.json")
+
+ROLES = ("A", "B", "R")
+
+_rules: dict[str, "Rule"] | None = None
+
+
+class RuleError(Exception): pass
+
+
+def assemble(
+    lines: Iterable[str],
+    registers: dict[str, str],
+) -> list[Instruction]:
+    code: list[Instruction] = []
+    for line in lines:
+        mnemonic, *operands = line.split()
+        item = encode(mnemonic, *(
+            registers.get(operand, operand) for operand in operands))
+        if not isinstance(item, Instruction):
+            raise RuleError(f"Invalid rule instruction: {line}")
+        code.append(item)
+    return code
+
+def text(item: Instruction, roles: dict[str, str]) -> str:
+    return " ".join(roles.get(token, token) for token in str(item).split())
+
+
+class Rule:
+
+    _name: str
+    _inputs: tuple[str, ...]
+    _flag: bool
+    _code: list[str]
+    _pattern: list[str] | None
+    _in_place: bool
+    _flags: bool
+
+    def __init__(
+        self,
+        name: str,
+        inputs: tuple[str, ...],
+        flag: bool,
+        code: list[str],
+        pattern: list[str] | None = None,
+        in_place: bool = False,
+        flags: bool = False,
+    ):
+        self._name = name
+        self._inputs = inputs
+        self._flag = flag
+        self._code = code
+        self._pattern = pattern
+        self._in_place = in_place
+        self._flags = flags
+
+    @property
+    def name(self) -> str: return self._name
+    @property
+    def inputs(self) -> tuple[str, ...]: return self._inputs
+    @property
+    def flag(self) -> bool: return self._flag
+    @property
+    def code(self) -> list[str]: return self._code
+    @property
+    def pattern(self) -> list[str] | None: return self._pattern
+    @property
+    def in_place(self) -> bool: return self._in_place
+    @property
+    def flags(self) -> bool: return self._flags
+    @property
+    def cycles(self) -> int: return len(self._code)
+
+    @property
+    def clobbers_mp(self) -> bool:
+        return any(
+            line.split()[0] in ("ldi", "liu", "lil") or
+            line.split()[1:2] == ["MP"]
+            for line in self._code + (self._pattern or [])
+        )
+
+    def instructions(self, **registers: str) -> list[Instruction]:
+        return assemble(self._code, registers)
+
+    def match(self, code: list[Instruction]) -> dict[str, str] | None:
+        if self._pattern is None or len(code) != len(self._pattern):
+            return None
+        registers: dict[str, str] = {}
+        for line, item in zip(self._pattern, code):
+            expected, actual = line.split(), str(item).split()
+            if len(expected) != len(actual) or expected[0] != actual[0]:
+                return None
+            for token, register in zip(expected[1:], actual[1:]):
+                if token not in ROLES:
+                    if token != register: return None
+                elif registers.setdefault(token, register) != register:
+                    return None
+        used = list(registers.values())
+        if any(register in REGISTERS[:2] + ("MP",) for register in used):
+            return None
+        elif len(set(used)) != len(used) and not (
+            self._in_place and len(set(used)) == len(used) - 1 and
+            registers.get("R") == registers.get("A")
+        ): return None
+        return registers
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self._name,
+            "inputs": list(self._inputs),
+            "flag": self._flag,
+            "code": self._code,
+            "pattern": self._pattern,
+            "in_place": self._in_place,
+            "flags": self._flags,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Rule":
+        return cls(
+            data["name"],
+            tuple(data["inputs"]),
+            data["flag"],
+            data["code"],
+            data.get("pattern"),
+            data.get("in_place", False),
+            data.get("flags", False),
+        )
+
+
+def read_rules(path: str | Path = RULES_FILE) -> dict[str, Rule]:
+    data = json.loads(Path(path).read_text())
+    if data.get("format") != RULES_FORMAT:
+        raise RuleError(f"Not a rule database: {path}")
+    elif data.get("version") != RULES_VERSION:
+        raise RuleError(
+            f"Unsupported rule database version: {data.get('version')}")
+    return {rule["name"]: Rule.from_dict(rule) for rule in data["rules"]}
+
+def write_rules(rules: Iterable[Rule], path: str | Path = RULES_FILE):
+    Path(path).write_text(json.dumps({
+        "format": RULES_FORMAT,
+        "version": RULES_VERSION,
+        "rules": [rule.to_dict() for rule in rules],
+    }, indent=4) + "\n")
+
+def rules() -> dict[str, Rule]:
+    global _rules
+    if _rules is None:
+        try: _rules = read_rules()
+        except (OSError, ValueError, KeyError, RuleError): _rules = {}
+    return _rules
+
+def peephole_rules() -> list[Rule]:
+    return [
+        rule for rule in rules().values()
+        if rule.pattern is not None and rule.cycles < len(rule.pattern)
+    ]
@@ -0,0 +1,311 @@
+# Kyler Olsen
+# Oct 2026
+
+from random import Random
+from typing import Callable
+
+from ..assembler.assembler import Instruction
+from .rules import Rule, assemble, text
+
+MAX_INT = 0x1000
+MASK = 0xFFF
+LANE = 16
+SAMPLES = 64
+MAX_LENGTH = 4
+
+ZR = 0
+MP = 3
+FLAGS = 8
+
+REGISTERS = {"A": "D0", "B": "D1", "R": "D2"}
+ROLES = {register: role for role, register in REGISTERS.items()}
+A, B, R = 4, 5, 6
+
+
+class SuperoptimizerError(Exception): pass
+
+
+class Target:
+
+    _name: str
+    _inputs: tuple[str, ...]
+    _function: Callable[..., int] | None
+    _pattern: list[str] | None
+    _flag: bool
+    _domain: int
+    _constants: tuple[int, ...]
+    _max_length: int
+
+    def __init__(
+        self,
+        name: str,
+        inputs: tuple[str, ...] = ("A",),
+        function: Callable[..., int] | None = None,
+        pattern: list[str] | None = None,
+        flag: bool = False,
+        domain: int = MAX_INT,
+        constants: tuple[int, ...] = (1,),
+        max_length: int = MAX_LENGTH,
+    ):
+        if (function is None) == (pattern is None):
+            raise SuperoptimizerError(
+                f"Target {name} needs either a function or a pattern")
+        self._name = name
+        self._inputs = inputs
+        self._function = function
+        self._pattern = pattern
+        self._flag = flag
+        self._domain = domain
+        self._constants = constants
+        self._max_length = max_length
+
+    @property
+    def name(self) -> str: return self._name
+    @property
+    def inputs(self) -> tuple[str, ...]: return self._inputs
+    @property
+    def function(self) -> Callable[..., int] | None: return self._function
+    @property
+    def pattern(self) -> list[str] | None: return self._pattern
+    @property
+    def flag(self) -> bool: return self._flag
+    @property
+    def domain(self) -> int: return self._domain
+    @property
+    def constants(self) -> tuple[int, ...]: return self._constants
+    @property
+    def max_length(self) -> int: return self._max_length
+
+
+class Lanes:
+
+    _count: int
+    _ones: int
+    _mask: int
+
+    def __init__(self, count: int):
+        self._count = count
+        self._ones = int.from_bytes(b"\x01\x00" * count, 'little')
+        self._mask = self._ones * MASK
+
+    @property
+    def count(self) -> int: return self._count
+
+    def pack(self, values: list[int]) -> int:
+        return int.from_bytes(b"".join(
+            (value % MAX_INT).to_bytes(2, 'little') for value in values
+        ), 'little')
+
+    def unpack(self, value: int) -> list[int]:
+        data = value.to_bytes(self._count * 2, 'little')
+        return [
+            int.from_bytes(data[i:i + 2], 'little')
+            for i in range(0, len(data), 2)
+        ]
+
+    def broadcast(self, value: int) -> int:
+        return (value % MAX_INT) * self._ones
+
+    def zero(self, value: int) -> int:
+        return (((value + self._mask) >> 12) & self._ones) ^ self._ones
+
+    def execute(
+        self,
+        item: Instruction,
+        state: tuple[int, ...],
+    ) -> tuple[int, ...]:
+        bb, bl, lb, ll = item
+        ones, mask = self._ones, self._mask
+        if bb:
+            a, b = state[lb], state[bl]
+            if bb == 1: value = a & b
+            elif bb == 2: value = a | b
+            elif bb == 3: value = (a + (b ^ mask) + ones) & mask
+            elif bb == 4: value = a ^ b
+            elif bb == 5: value = (a | b) ^ mask
+            elif bb == 6: value = (a & b) ^ mask
+            else: value = (a + b) & mask
+        elif bl >= 4:
+            a = state[lb]
+            if bl == 4: value = (a << 1) & mask
+            elif bl == 5: value = (a >> 1) & mask
+            elif bl == 6: value = (a + ones) & mask
+            else: value = (a + mask) & mask
+        else:
+            immediate = (lb << 3) | ll
+            if bl == 1: value = (immediate << 6) * ones
+            elif bl == 2: value = immediate * ones
+            else: value = state[MP] | immediate * ones
+            return state[:MP] + (value,) + state[MP + 1:]
+
+        registers = list(state)
+        if ll != ZR: registers[ll] = value
+        registers[FLAGS] = self.zero(value)
+        return tuple(registers)
+
+    def run(
+        self,
+        code: list[Instruction],
+        state: tuple[int, ...],
+    ) -> tuple[int, ...]:
+        for item in code: state = self.execute(item, state)
+        return state
+
+
+def _samples(target: Target, count: int, seed: int) -> list[tuple[int, ...]]:
+    domain = target.domain
+    edges = sorted({0, 1, 2, domain // 2 - 1, domain // 2, domain - 1} & set(
+        range(domain)))
+    if len(target.inputs) == 1: samples = [(value,) for value in edges]
+    else: samples = [(a, b) for a in edges for b in edges]
+    random = Random(seed)
+    while len(samples) < count:
+        values = tuple(random.randrange(domain) for _ in target.inputs)
+        if len(values) > 1 and random.random() < 0.25:
+            values = (values[0],) * len(values)
+        samples.append(values)
+    return samples
+
+def _state(
+    lanes: Lanes,
+    samples: list[tuple[int, ...]],
+    seed: int,
+) -> list[int]:
+    random = Random(seed)
+    state = [
+        lanes.pack([random.randrange(MAX_INT) for _ in range(lanes.count)])
+        for _ in range(FLAGS)
+    ] + [0]
+    state[ZR] = 0
+    for index in range(len(samples[0])):
+        state[A + index] = lanes.pack([sample[index] for sample in samples])
+    return state
+
+def _reference(
+    lanes: Lanes,
+    target: Target,
+    samples: list[tuple[int, ...]],
+    state: tuple[int, ...],
+    alias: bool = False,
+) -> tuple[int, int]:
+    if target.function is None:
+        registers = REGISTERS | ({"R": REGISTERS["A"]} if alias else {})
+        after = lanes.run(assemble(target.pattern or [], registers), state)
+        if target.flag: return after[FLAGS], after[FLAGS]
+        return after[A if alias else R], after[FLAGS]
+    elif target.flag:
+        output = lanes.pack([
+            int(bool(target.function(*sample))) for sample in samples])
+        return output, output
+    output = lanes.pack([target.function(*sample) for sample in samples])
+    return output, lanes.zero(output)
+
+def _check(
+    target: Target,
+    code: list[Instruction],
+    alias: bool = False,
+) -> tuple[bool, bool]:
+    if alias:
+        code = assemble(
+            [text(item, ROLES) for item in code],
+            REGISTERS | {"R": REGISTERS["A"]},
+        )
+    output = FLAGS if target.flag else (A if alias else R)
+    domain = range(target.domain)
+    lanes = Lanes(len(domain))
+    flags = True
+    for seed in (1, 2):
+        if len(target.inputs) == 1:
+            samples = [(value,) for value in domain]
+            chunks = [(_state(lanes, samples, seed), samples)]
+        else:
+            base = _state(lanes, [(0, value) for value in domain], seed)
+            chunks = (
+                (base[:A] + [lanes.broadcast(a)] + base[A + 1:], [
+                    (a, b) for b in domain])
+                for a in domain
+            )
+        for state, samples in chunks:
+            after = lanes.run(code, tuple(state))
+            expected, zero = _reference(
+                lanes, target, samples, tuple(state), alias)
+            if after[output] != expected: return False, False
+            flags = flags and after[FLAGS] == zero
+    return True, flags
+
+def candidates(target: Target) -> list[Instruction]:
+    readable = [ZR, MP, R] + [A + index for index in range(len(target.inputs))]
+    writable = ([ZR] if target.flag else []) + [R, MP]
+    code: list[Instruction] = []
+    for constant in target.constants:
+        upper, lower = constant >> 6, constant & 0x3F
+        if not upper: code.append(Instruction(0, 2, lower >> 3, lower & 7))
+        else:
+            code.append(Instruction(0, 1, upper >> 3, upper & 7))
+            if lower: code.append(Instruction(0, 3, lower >> 3, lower & 7))
+    for destination in writable:
+        for bl in range(4, 8):
+            for source in readable:
+                code.append(Instruction(0, bl, source, destination))
+        for bb in range(1, 8):
+            for x in readable:
+                for y in readable:
+                    if bb != 3 and x > y: continue
+                    code.append(Instruction(bb, x, y, destination))
+    return code
+
+def search(
+    target: Target,
+    max_length: int | None = None,
+    samples: int = SAMPLES,
+    seed: int = 0,
+) -> list[Instruction] | None:
+    if max_length is None: max_length = target.max_length
+    inputs = _samples(target, samples, seed)
+    lanes = Lanes(len(inputs))
+    initial = tuple(_state(lanes, inputs, seed))
+    goal = _reference(lanes, target, inputs, initial)[0]
+    output = FLAGS if target.flag else R
+    items = candidates(target)
+    keys = (MP, R, FLAGS) if target.flag else (MP, R)
+
+    seen = {tuple(initial[key] for key in keys)}
+    frontier: list[tuple[tuple[int, ...], tuple[Instruction, ...]]] = [
+        (initial, ())]
+    for length in range(1, max_length + 1):
+        following: list[tuple[tuple[int, ...], tuple[Instruction, ...]]] = []
+        found: list[Instruction] | None = None
+        for state, code in frontier:
+            for item in items:
+                after = lanes.execute(item, state)
+                if after[output] == goal and _check(target, [*code, item])[0]:
+                    if _check(target, [*code, item], alias=True)[0]:
+                        return [*code, item]
+                    elif found is None: found = [*code, item]
+                key = tuple(after[k] for k in keys)
+                if key in seen: continue
+                seen.add(key)
+                if length < max_length:
+                    following.append((after, (*code, item)))
+        if found is not None: return found
+        frontier = following
+    return None
+
+def superoptimize(
+    target: Target,
+    max_length: int | None = None,
+) -> Rule | None:
+    code = search(target, max_length)
+    if code is None: return None
+    correct, flags = _check(target, code)
+    if not correct: return None
+    in_place = _check(target, code, alias=True)[0]
+    return Rule(
+        target.name,
+        target.inputs,
+        target.flag,
+        [text(item, ROLES) for item in code],
+        target.pattern,
+        in_place,
+        flags,
+    )
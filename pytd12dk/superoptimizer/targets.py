@@ -0,0 +1,50 @@
+# Kyler Olsen
+# Oct 2026
+
+from .superoptimizer import Target
+
+MULTIPLIERS = range(2, 17)
+
+
+def _multiply(k: int) -> Target:
+    return Target(f"mul{k}", function=lambda a: a * k)
+
+def _sign_extend(bits: int) -> Target:
+    sign = 1 << (bits - 1)
+    return Target(
+        f"sext{bits}",
+        function=lambda a: a - (sign << 1) if a & sign else a,
+        domain=sign << 1,
+        constants=(sign,),
+    )
+
+
+TARGETS: list[Target] = [
+    Target("neg", function=lambda a: -a),
+    Target("not", function=lambda a: ~a),
+    *(_multiply(k) for k in MULTIPLIERS),
+    _sign_extend(6),
+    _sign_extend(8),
+    Target("eq", ("A", "B"), lambda a, b: a == b, flag=True),
+    Target(
+        "positive",
+        function=lambda a: a < 0x800,
+        flag=True,
+        constants=(0x800,),
+    ),
+    Target("even", function=lambda a: a % 2 == 0, flag=True),
+    Target("neg_not_inc", pattern=["nor R A ZR", "inc R R"]),
+    Target("sub_neg_add", ("A", "B"), pattern=[
+        "nor R B ZR",
+        "inc R R",
+        "add R R A",
+    ]),
+    Target("clear_add", pattern=["xor R R R", "add R R A"]),
+    Target("mul4_add", pattern=["add R A A", "add R R A", "add R R A"]),
+]
+
+
+def target(name: str) -> Target:
+    for item in TARGETS:
+        if item.name == name: return item
+    raise KeyError(name)
@@ -0,0 +1,44 @@
+# Kyler Olsen
+# Oct 2026
+
+import unittest
+
+from pytd12dk.assembler import Program, listing
+from pytd12dk.assembler.assembler import Label, encode
+from pytd12dk.compiler.optimizer import optimizer
+from pytd12dk.emulator.machines import machine
+from pytd12dk.pipeline import run
+
+
+def _code(*lines: str) -> list:
+    code = []
+    for line in lines:
+        if line.endswith(':'): code.append(Label(line[:-1]))
+        else: code.append(encode(*line.split()))
+    return code
+
+def _ram(code: list, address: int) -> int:
+    computer = machine('tty')(Program(code).words())
+    run(computer, max_cycles=1000)
+    return computer.memory[address]
+
+
+class TestOptimizer(unittest.TestCase):
+
+    def test_store_between_aliasing_pushes_is_kept(self):
+        code = _code(
+            "liu 60", "or SP MP ZR",
+            "start:",
+            "ldi 7", "or D1 MP ZR",
+            "liu 32", "lil 1",
+            "psh D2", "str D1", "psh D2",
+            "hlt",
+        )
+        optimized = optimizer(code)
+        self.assertIn("str D1", listing(optimized))
+        self.assertEqual(_ram(code, 0x801), 7)
+        self.assertEqual(_ram(optimized, 0x801), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()